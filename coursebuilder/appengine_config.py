@@ -17,6 +17,7 @@
 __author__ = 'psimakov@google.com (Pavel Simakov)'
 
 import datetime
+import functools
 import importlib
 import logging
 import os
@@ -191,11 +192,27 @@ def time_delta_to_millis(delta):
 
 
 def timeandlog(name, duration_only=False):
-    """Times and logs execution of decorated method."""
+    """Times and logs execution of decorated method.
+
+    Durations are always recorded into a models.counters.PerfTimer named
+    'gcb-timeandlog-<name>'; logging and appstats events are only emitted
+    when appstats is enabled.
+    """
+    # Imported here so that loading appengine_config does not pull in models.
+    from models import counters  # pylint: disable=g-import-not-at-top
+
+    timer = counters.PerfTimer(
+        'gcb-timeandlog-%s' % name,
+        'Duration in milliseconds of %s calls.' % name)
 
     def timed_1(func):
 
+        @functools.wraps(func)
         def timed_2(*args, **kwargs):
+            if not gcb_appstats_enabled():
+                with timer.timed():
+                    return func(*args, **kwargs)
+
             _name = name
             if args and isinstance(args[0], type):
                 _name += '.' + str(args[0].__name__)
@@ -208,6 +225,7 @@ def timeandlog(name, duration_only=False):
 
             after = datetime.datetime.utcnow()
             millis = time_delta_to_millis(after - before)
+            timer.record(millis)
             if duration_only:
                 logging.info(_name + ': duration=%sms' % millis)
                 log_appstats_event(_name, {'millis': millis})
@@ -216,10 +234,7 @@ def timeandlog(name, duration_only=False):
                 log_appstats_event(_name + '.leave', {'millis': millis})
             return result
 
-        if gcb_appstats_enabled():
-            return timed_2
-        else:
-            return func
+        return timed_2
 
     return timed_1
 
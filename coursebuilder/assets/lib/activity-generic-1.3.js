@@ -38,6 +38,12 @@ var gcbCanRecordStudentEvents = false;
 var eventXsrfToken = '';
 var assessmentXsrfToken = '';
 
+// asynchronous events are queued and posted to the server together
+var GCB_AUDIT_FLUSH_DELAY_MS = 1000;
+var GCB_AUDIT_MAX_BATCH_SIZE = 100;  // See MAX_EVENTS_PER_REQUEST on server.
+var gcbAuditQueue = [];
+var gcbAuditFlushTimer = null;
+
 function gcbTagEventAudit(data_dict, name) {
   gcbAudit(gcbCanRecordStudentEvents, data_dict, 'tag-' + name, true);
 }
@@ -58,6 +64,27 @@ function gcbAssessmentAudit(data_dict) {
   gcbAudit(gcbCanRecordStudentEvents, data_dict, 'attempt-assessment', true);
 }
 
+function gcbFlushAuditQueue(is_async) {
+  if (gcbAuditFlushTimer !== null) {
+    clearTimeout(gcbAuditFlushTimer);
+    gcbAuditFlushTimer = null;
+  }
+  if (gcbAuditQueue.length == 0) {
+    return;
+  }
+  var request = gcbAuditQueue.length == 1 ?
+      gcbAuditQueue[0] : {'events': gcbAuditQueue};
+  gcbAuditQueue = [];
+  $.ajax({
+      url: 'rest/events',
+      type: 'POST',
+      async: is_async,
+      data: {'request': JSON.stringify(request)},
+      success: function(){},
+      error: function(){}
+  });
+}
+
 function gcbAudit(can_post, data_dict, source, is_async) {
   // There may be a course-specific config to save $$ by preventing us
   // from emitting too much volume to AppEngine; respect that setting.
@@ -65,18 +92,19 @@ function gcbAudit(can_post, data_dict, source, is_async) {
     data_dict['location'] = '' + window.location;
     data_dict['loc'] = {}
     data_dict['loc']['page_locale'] = $('body').data('gcb-page-locale')
-    var request = {
+    gcbAuditQueue.push({
         'source': source,
         'payload': JSON.stringify(data_dict),
-        'xsrf_token': eventXsrfToken};
-    $.ajax({
-        url: 'rest/events',
-        type: 'POST',
-        async: is_async,
-        data: {'request': JSON.stringify(request)},
-        success: function(){},
-        error: function(){}
-    });
+        'xsrf_token': eventXsrfToken});
+    if (!is_async) {
+      gcbFlushAuditQueue(false);
+    } else if (gcbAuditQueue.length >= GCB_AUDIT_MAX_BATCH_SIZE) {
+      gcbFlushAuditQueue(true);
+    } else if (gcbAuditFlushTimer === null) {
+      gcbAuditFlushTimer = setTimeout(function() {
+        gcbFlushAuditQueue(true);
+      }, GCB_AUDIT_FLUSH_DELAY_MS);
+    }
   }
 
   // ----------------------------------------------------------------------
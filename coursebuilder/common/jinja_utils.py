@@ -36,6 +36,9 @@ from models.counters import PerfCounter
 # max size for in-process jinja template cache
 MAX_GLOBAL_CACHE_SIZE_BYTES = 8 * 1024 * 1024
 
+# max number of configured jinja environments kept for reuse in-process
+MAX_POOLED_ENVIRONMENTS = 64
+
 # this cache used to be memcache based; now it's in-process
 CAN_USE_JINJA2_TEMPLATE_CACHE = config.ConfigProperty(
     'gcb_can_use_jinja2_template_cache', bool,
@@ -70,16 +73,20 @@ def js_string(data):
     return jinja2.utils.Markup(js_string_raw(data))
 
 
+@appengine_config.timeandlog('get_gcb_tags_filter')
+def _apply_gcb_tags(data, handler):
+    """Apply GCB custom tags, if enabled. Otherwise pass as if by 'safe'."""
+    data = unicode(data)
+    if tags.CAN_USE_DYNAMIC_TAGS.value:
+        return jinja2.utils.Markup(tags.html_to_safe_dom(data, handler))
+    else:
+        return jinja2.utils.Markup(data)
+
+
 def get_gcb_tags_filter(handler):
 
-    @appengine_config.timeandlog('get_gcb_tags_filter')
     def gcb_tags(data):
-        """Apply GCB custom tags, if enabled. Otherwise pass as if by 'safe'."""
-        data = unicode(data)
-        if tags.CAN_USE_DYNAMIC_TAGS.value:
-            return jinja2.utils.Markup(tags.html_to_safe_dom(data, handler))
-        else:
-            return jinja2.utils.Markup(data)
+        return _apply_gcb_tags(data, handler)
     return gcb_tags
 
 
@@ -132,7 +139,83 @@ JINJA_CACHE_LEN.poll_value = ProcessScopedJinjaCache.get_cache_len
 JINJA_CACHE_SIZE_BYTES.poll_value = ProcessScopedJinjaCache.get_cache_size
 
 
+class ProcessScopedJinjaEnvironmentPool(caching.ProcessScopedSingleton):
+    """This class holds in-process pool of configured Jinja environments.
+
+    A Jinja environment keeps loaded templates in its own in-memory cache, so
+    a reused environment neither fetches template sources nor loads their
+    bytecode again; it only checks that templates are up to date. Pooled
+    environments are handed out as is. This is safe because the application
+    runs with 'threadsafe: false': callers can still set request-specific
+    filters and globals on an environment right before rendering with it.
+    """
+
+    @classmethod
+    def get_pool_len(cls):
+        return len(ProcessScopedJinjaEnvironmentPool.instance().cache.items)
+
+    def __init__(self):
+        self.cache = caching.LRUCache(max_item_count=MAX_POOLED_ENVIRONMENTS)
+
+
+JINJA_ENVIRONMENT_POOL_LEN = PerfCounter(
+    'gcb-models-JinjaEnvironmentPool-len',
+    'A total number of Jinja environments in the pool.')
+JINJA_ENVIRONMENT_POOL_HIT = PerfCounter(
+    'gcb-models-JinjaEnvironmentPool-hit',
+    'A number of times a Jinja environment was reused from the pool.')
+JINJA_ENVIRONMENT_POOL_MISS = PerfCounter(
+    'gcb-models-JinjaEnvironmentPool-miss',
+    'A number of times a Jinja environment was created and pooled.')
+
+JINJA_ENVIRONMENT_POOL_LEN.poll_value = (
+    ProcessScopedJinjaEnvironmentPool.get_pool_len)
+
+
+def _get_environment_pool_key(loader, locale, autoescape):
+    """Makes a pool key for an environment; None if it can't be pooled.
+
+    Loaders other than jinja2.FileSystemLoader take part in pooling by
+    providing a get_environment_pool_key() method; the key it returns must
+    identify the templates the loader serves. Such loaders must also return
+    a proper 'uptodate' callable from get_source(), so that pooled
+    environments pick up changed templates.
+    """
+    if isinstance(loader, jinja2.FileSystemLoader):
+        loader_key = (loader.__class__.__name__, tuple(loader.searchpath))
+    elif hasattr(loader, 'get_environment_pool_key'):
+        loader_key = loader.get_environment_pool_key()
+    else:
+        return None
+    return (
+        models.MemcacheManager.get_namespace(), loader_key, locale, autoescape)
+
+
 def create_jinja_environment(loader, locale=None, autoescape=True):
+    """Get proper jinja environment; reuse a pooled one if possible."""
+
+    key = None
+    if CAN_USE_JINJA2_TEMPLATE_CACHE.value:
+        key = _get_environment_pool_key(loader, locale, autoescape)
+    if key:
+        found, jinja_environment = (
+            ProcessScopedJinjaEnvironmentPool.instance().cache.get(key))
+        if found:
+            JINJA_ENVIRONMENT_POOL_HIT.inc()
+            if locale:
+                i18n.get_i18n().set_locale(locale)
+            return jinja_environment
+
+    jinja_environment = _create_jinja_environment(
+        loader, locale=locale, autoescape=autoescape)
+    if key:
+        JINJA_ENVIRONMENT_POOL_MISS.inc()
+        ProcessScopedJinjaEnvironmentPool.instance().cache.put(
+            key, jinja_environment)
+    return jinja_environment
+
+
+def _create_jinja_environment(loader, locale=None, autoescape=True):
     """Create proper jinja environment."""
 
     cache = None
@@ -16,6 +16,7 @@
 
 __author__ = 'Mike Gainer (mgainer@google.com)'
 
+import copy
 import cStringIO
 import datetime
 import logging
@@ -275,3 +276,66 @@ class ValidateTimedelta(object):
                 'the following are equivalent: "3w1d7h", '
                 '"3 weeks, 1 day, 7 hours"')
         return datetime.timedelta(**kwargs).total_seconds()
+
+
+def _raise_read_only(*unused_args, **unused_kwargs):
+    raise TypeError('This object is read-only; make a copy to modify it.')
+
+
+class ReadOnlyDict(dict):
+    """A dict that can not be modified in place.
+
+    Being a dict subclass, it reads, compares and serializes just like a dict.
+    Copying it with copy.copy() or copy.deepcopy() returns a plain, mutable
+    dict (and, for deepcopy, plain mutable values).
+    """
+
+    __setitem__ = __delitem__ = _raise_read_only
+    clear = pop = popitem = setdefault = update = _raise_read_only
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return dict(
+            (copy.deepcopy(key, memo), copy.deepcopy(value, memo))
+            for key, value in self.iteritems())
+
+    def __reduce__(self):
+        return (dict, (dict(self),))
+
+
+class ReadOnlyList(list):
+    """A list that can not be modified in place; see ReadOnlyDict."""
+
+    __setitem__ = __delitem__ = __setslice__ = __delslice__ = _raise_read_only
+    __iadd__ = __imul__ = _raise_read_only
+    append = extend = insert = pop = remove = reverse = sort = _raise_read_only
+
+    def __copy__(self):
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        return [copy.deepcopy(item, memo) for item in self]
+
+    def __reduce__(self):
+        return (list, (list(self),))
+
+
+def make_read_only(value):
+    """Returns a deep, read-only copy of a tree of dicts and lists.
+
+    Dicts and lists are replaced by ReadOnlyDict and ReadOnlyList; all other
+    values are shared with the original.
+
+    Args:
+        value: the root of the tree to copy.
+    Returns:
+        The read-only copy.
+    """
+    if isinstance(value, dict):
+        return ReadOnlyDict(
+            (key, make_read_only(item)) for key, item in value.iteritems())
+    if isinstance(value, list):
+        return ReadOnlyList(make_read_only(item) for item in value)
+    return value
@@ -104,6 +104,7 @@ not hosting multiple courses, your course will run in a default namespace
 Good luck!
 """
 
+import calendar
 import logging
 import mimetypes
 import os
@@ -506,6 +507,42 @@ class AssetHandler(utils.BaseHandler):
         public = not fs.is_draft(stream)
         return public or Roles.is_course_admin(self.app_context)
 
+    @classmethod
+    def _get_etag(cls, metadata):
+        """Makes a strong entity tag out of VFS file metadata.
+
+        Any put() of a file, including a metadata-only one, sets a new
+        'updated_on' timestamp, so the pair (size, updated_on) changes
+        whenever the bytes we would serve may have changed.
+        """
+        updated_on_usec = (
+            calendar.timegm(metadata.updated_on.utctimetuple()) * 1000000 +
+            metadata.updated_on.microsecond)
+        return '%x-%x' % (metadata.size or 0, updated_on_usec)
+
+    def _set_validators(self, stream):
+        """Sets ETag and Last-Modified; returns True if client copy is fresh.
+
+        Only files stored in the datastore carry metadata; files served from
+        the local file system get neither validators nor 304 responses.
+        """
+        metadata = getattr(stream, 'metadata', None)
+        if not metadata or not metadata.updated_on:
+            return False
+
+        etag = self._get_etag(metadata)
+        last_modified = metadata.updated_on.replace(microsecond=0)
+        self.response.etag = etag
+        self.response.last_modified = last_modified
+
+        # If-None-Match takes precedence over If-Modified-Since; RFC 7232.
+        if 'If-None-Match' in self.request.headers:
+            return etag in self.request.if_none_match
+        if_modified_since = self.request.if_modified_since
+        if if_modified_since:
+            return last_modified <= if_modified_since.replace(tzinfo=None)
+        return False
+
     def get(self):
         """Handles GET requests."""
         models.MemcacheManager.begin_readonly()
@@ -518,6 +555,9 @@ class AssetHandler(utils.BaseHandler):
                 self.error(403)
                 return
             set_static_resource_cache_control(self)
+            if self._set_validators(stream):
+                self.response.status = 304
+                return
             self.response.headers['Content-Type'] = self.get_mime_type(
                self.filename)
             self.response.write(stream.read())
@@ -750,14 +790,14 @@ class ApplicationContext(object):
 
     @property
     def default_locale(self):
-        course_settings = self.get_environ().get('course')
+        course_settings = self.get_environ_readonly().get('course')
         if not course_settings:
             return None
         return course_settings.get('locale')
 
     def get_title(self):
         try:
-            return self.get_environ()['course']['title']
+            return self.get_environ_readonly()['course']['title']
         except KeyError:
             return 'UNTITLED'
 
@@ -779,6 +819,9 @@ class ApplicationContext(object):
     def get_environ(self):
         return Course.get_environ(self)
 
+    def get_environ_readonly(self):
+        return Course.get_environ_readonly(self)
+
     def get_home(self):
         """Returns absolute location of a course folder."""
         path = abspath(self.get_home_folder(), '')
@@ -833,7 +876,7 @@ class ApplicationContext(object):
         return custom_modules.can_pick_all_locales(self)
 
     def get_allowed_locales(self):
-        environ = self.get_environ()
+        environ = self.get_environ_readonly()
         default_locale = environ['course'].get('locale')
         extra_locales = environ.get('extra_locales', [])
         return [default_locale] + [
@@ -846,7 +889,7 @@ class ApplicationContext(object):
     def get_all_locales(self):
         """Returns _all_ locales, whether enabled or not.  Dashboard only."""
 
-        environ = self.get_environ()
+        environ = self.get_environ_readonly()
         default_locale = self.default_locale
         extra_locales = environ.get('extra_locales', [])
         return [default_locale] + [loc['locale'] for loc in extra_locales]
@@ -1566,15 +1609,23 @@ class WSGIRouter(webapp2.Router):
         super(WSGIRouter, self).__init__(routes)
 
     def dispatch(self, request, response):
-        result = super(WSGIRouter, self).dispatch(request, response)
-        if result:
-            response = result
+        # Requests to global routes never set path info, which is what
+        # otherwise starts a fresh request scope; start one for every request
+        # here, and end it so nothing leaks to work done later on the thread.
+        caching.RequestScopedSingleton.clear_all()
+        try:
+            result = super(WSGIRouter, self).dispatch(request, response)
+            if result:
+                response = result
 
-        # pylint: disable=protected-access
-        ApplicationRequestHandler.finalize_response(
-            request, response, response.status_code)
+            # pylint: disable=protected-access
+            ApplicationRequestHandler.finalize_response(
+                request, response, response.status_code)
 
-        return response
+            return response
+        finally:
+            models.flush_counter_global_values()
+            caching.RequestScopedSingleton.clear_all()
 
 
 def assert_mapped(src, dest):
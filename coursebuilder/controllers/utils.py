@@ -348,7 +348,7 @@ class HtmlHooks(object):
 
     @classmethod
     def get_content(cls, course, name):
-        environ = course.app_context.get_environ()
+        environ = course.app_context.get_environ_readonly()
 
         # Prefer getting hook content from html_hooks sub-dict within
         # course settings.
@@ -643,7 +643,7 @@ class _ExtensionSwitcher(ApplicationHandler):
         super(_ExtensionSwitcher, self).__init__(*args, **kwargs)
 
     def _get_handler(self):
-        env = self.app_context.get_environ()
+        env = self.app_context.get_environ_readonly()
         if env.get('course', {}).get(self._switch_on_course_schema_key):
             handler = self._new_handler_factory()
         else:
@@ -920,7 +920,7 @@ class CourseHandler(ApplicationHandler):
     def get_template(self, template_file, additional_dirs=None, prefs=None):
         """Computes location of template files for the current namespace."""
 
-        _p = self.app_context.get_environ()
+        _p = self.app_context.get_environ_readonly()
         self.init_template_values(_p, prefs=prefs)
         template_environ = self.app_context.get_template_environ(
             self.app_context.get_current_locale(), additional_dirs)
@@ -941,7 +941,7 @@ class CourseHandler(ApplicationHandler):
         return template_environ.get_template(template_file)
 
     def can_record_student_events(self):
-        settings = self.app_context.get_environ().get('course')
+        settings = self.app_context.get_environ_readonly().get('course')
         return settings and settings.get('can_record_student_events')
 
 
@@ -968,8 +968,9 @@ class BaseHandler(CourseHandler):
         PageInitializerService.get().initialize(self.template_value)
 
         if hasattr(self, 'app_context'):
-            self.template_value['can_register'] = self.app_context.get_environ(
-                )['reg_form']['can_register']
+            self.template_value['can_register'] = (
+                self.app_context.get_environ_readonly(
+                    )['reg_form']['can_register'])
 
         if user:
             student = Student.get_enrolled_student_by_user(user)
@@ -1138,7 +1139,7 @@ class RegisterHandler(BaseHandler):
             self.redirect('/course')
             return
 
-        can_register = self.app_context.get_environ(
+        can_register = self.app_context.get_environ_readonly(
             )['reg_form']['can_register']
         if not can_register:
             self.redirect('/course#registration_closed')
@@ -1173,7 +1174,7 @@ class RegisterHandler(BaseHandler):
         if not self.assert_xsrf_token_or_fail(self.request, 'register-post'):
             return
 
-        can_register = self.app_context.get_environ(
+        can_register = self.app_context.get_environ_readonly(
             )['reg_form']['can_register']
         if not can_register:
             self.redirect('/course#registration_closed')
@@ -1207,7 +1208,7 @@ class ForumHandler(BaseHandler):
         if not student:
             return
 
-        environ = self.app_context.get_environ()
+        environ = self.app_context.get_environ_readonly()
         forum_email = environ.get('course', {}).get('forum_email', None)
 
         if not forum_email:
@@ -16,6 +16,11 @@
 
 __author__ = 'Pavel Simakov (psimakov@google.com)'
 
+import bisect
+import contextlib
+import threading
+import time
+
 
 def incr_counter_global_value(unused_name, unused_delta):
     """Hook method for global aggregation."""
@@ -73,6 +78,108 @@ class PerfCounter(object):
         return get_counter_global_value(self.name)
 
 
+class PerfTimer(PerfCounter):
+    """An in-process counter of durations, kept as a bucketed histogram.
+
+    Each recorded duration increments the counter, so value and global_value
+    keep counting events like a plain PerfCounter. Additionally the timer
+    keeps the sum and a histogram of the durations seen by this process, from
+    which percentiles are estimated.
+    """
+
+    # Upper bounds, in milliseconds, of the histogram buckets; durations above
+    # the last bound fall into an extra overflow bucket.
+    DEFAULT_BUCKET_BOUNDS_MILLIS = (
+        1, 2, 5, 10, 20, 50, 100, 200, 500,
+        1000, 2000, 5000, 10000, 20000, 60000)
+
+    def __init__(self, name, doc_string, bucket_bounds_millis=None):
+        self._bucket_bounds = tuple(
+            bucket_bounds_millis or self.DEFAULT_BUCKET_BOUNDS_MILLIS)
+        assert list(self._bucket_bounds) == sorted(set(self._bucket_bounds))
+        self._lock = threading.Lock()
+        super(PerfTimer, self).__init__(name, doc_string)
+        self._clear()
+
+    def _clear(self):
+        """Resets value and histogram for tests."""
+        super(PerfTimer, self)._clear()
+        self._sum_millis = 0
+        self._max_millis = 0
+        self._bucket_counts = [0] * (len(self._bucket_bounds) + 1)
+
+    def record(self, millis):
+        """Records one duration, in milliseconds."""
+        index = bisect.bisect_left(self._bucket_bounds, millis)
+        with self._lock:
+            self._sum_millis += millis
+            self._max_millis = max(self._max_millis, millis)
+            self._bucket_counts[index] += 1
+        self.inc()
+
+    @contextlib.contextmanager
+    def timed(self):
+        """Records the duration of the enclosed block, even if it raises."""
+        start = time.time()
+        try:
+            yield
+        finally:
+            self.record((time.time() - start) * 1000)
+
+    @property
+    def count(self):
+        """Number of durations recorded by this process."""
+        return sum(self._bucket_counts)
+
+    @property
+    def sum_millis(self):
+        return self._sum_millis
+
+    @property
+    def max_millis(self):
+        return self._max_millis
+
+    @property
+    def buckets(self):
+        """List of (upper bound in millis, count); the last bound is None."""
+        bounds = list(self._bucket_bounds) + [None]
+        return zip(bounds, list(self._bucket_counts))
+
+    def percentile(self, percent):
+        """Estimates the given percentile of the recorded durations.
+
+        Args:
+            percent: number in [0, 100].
+        Returns:
+            The upper bound of the bucket holding the percentile, capped at
+            the largest duration seen; None if nothing was recorded.
+        """
+        assert 0 <= percent <= 100
+        bucket_counts = list(self._bucket_counts)
+        total = sum(bucket_counts)
+        if not total:
+            return None
+        rank = max(1, percent * total / 100.0)
+        seen = 0
+        for bound, count in zip(self._bucket_bounds, bucket_counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self._max_millis)
+        return self._max_millis
+
+    @property
+    def summary(self):
+        """Human-readable digest of the distribution for this process."""
+        if not self.count:
+            return 'count=0'
+        return (
+            'count=%s mean=%.1fms p50=%.1fms p90=%.1fms p99=%.1fms '
+            'max=%.1fms' % (
+                self.count, float(self._sum_millis) / self.count,
+                self.percentile(50), self.percentile(90),
+                self.percentile(99), self._max_millis))
+
+
 class Registry(object):
     """Holds all registered counters."""
     registered = {}
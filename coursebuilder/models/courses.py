@@ -19,6 +19,7 @@ __author__ = 'Pavel Simakov (psimakov@google.com)'
 import collections
 import copy
 from datetime import datetime
+import hashlib
 import logging
 import os
 import pickle
@@ -26,6 +27,7 @@ import re
 import sys
 import threading
 import config
+import counters
 import custom_units
 
 import messages
@@ -38,6 +40,7 @@ import vfs
 import yaml
 
 import appengine_config
+from common import caching
 from common import locales
 from common import safe_dom
 from common import schema_fields
@@ -86,6 +89,9 @@ COURSES_CAN_USE_GOOGLE_APIS = config.ConfigProperty(
     'gcb_courses_can_use_google_apis', bool, messages.SITE_SETTINGS_GOOGLE_APIS,
     default_value=False, label='Google APIs')
 
+# Max size of in-process cache of components found in lesson bodies.
+MAX_COMPONENTS_CACHE_SIZE_BYTES = 4 * 1024 * 1024
+
 # The config key part under which course info lives.
 _CONFIG_KEY_PART_COURSE = 'course'
 # The config key part under which google info lives.
@@ -103,6 +109,32 @@ CONFIG_KEY_GOOGLE_CLIENT_ID = '%s:%s:%s' % (
     _CONFIG_KEY_PART_CLIENT_ID)
 
 
+class ProcessScopedComponentsCache(caching.ProcessScopedSingleton):
+    """This class holds in-process cache of components found in lessons.
+
+    Entries are keyed by lesson and by a digest of the lesson body, so saving
+    a lesson with a new body makes its old entry unreachable; it then ages
+    out of the LRU cache.
+    """
+
+    def __init__(self):
+        self.cache = caching.LRUCache(
+            max_size_bytes=MAX_COMPONENTS_CACHE_SIZE_BYTES)
+        self.cache.get_entry_size = self._get_entry_size
+
+    def _get_entry_size(self, key, value):
+        return sys.getsizeof(key) + sum(
+            sys.getsizeof(component) for component in value)
+
+    @classmethod
+    def make_key(cls, lesson_id, html, use_lxml):
+        if isinstance(html, unicode):
+            html = html.encode('utf-8')
+        return '%s:%s:%s:%s' % (
+            namespace_manager.get_namespace(), lesson_id,
+            hashlib.sha1(html).hexdigest(), use_lxml)
+
+
 def deep_dict_merge(*args):
     """Merges default and real value dictionaries recursively."""
     if len(args) > 2:
@@ -1034,6 +1066,11 @@ class Lesson13(object):
             self.availability = AVAILABILITY_COURSE
 
 
+COURSE_JSON_LOAD_TIMER = counters.PerfTimer(
+    'gcb-course-json-load',
+    'Duration in milliseconds of reading and parsing a course.json file.')
+
+
 class PersistentCourse13(object):
     """A representation of a Course13 optimized for persistence."""
 
@@ -1102,14 +1139,15 @@ class PersistentCourse13(object):
         """Loads course from datastore."""
         fs = app_context.fs.impl
         filename = fs.physical_to_logical(cls.COURSES_FILENAME)
-        stream = app_context.fs.open(filename)
-        if stream:
+        with COURSE_JSON_LOAD_TIMER.timed():
+            stream = app_context.fs.open(filename)
+            if not stream:
+                return None
             persistent = PersistentCourse13()
             persistent.deserialize(stream.read())
-            return CourseModel13(
-                app_context, next_id=persistent.next_id,
-                units=persistent.units, lessons=persistent.lessons)
-        return None
+        return CourseModel13(
+            app_context, next_id=persistent.next_id,
+            units=persistent.units, lessons=persistent.lessons)
 
     def serialize(self):
         """Saves instance to a JSON representation."""
@@ -1209,6 +1247,11 @@ class CourseModel13(object):
         self._lessons = []
         self._unit_id_to_lesson_ids = {}
 
+        # Lookup maps, keyed by str() of ids; rebuilt by _index_lookups().
+        self._unit_id_to_unit = {}
+        self._lesson_id_to_lesson = {}
+        self._assessment_id_to_parent_unit = {}
+
         # These array keep dirty object in current transaction.
         self._dirty_units = []
         self._dirty_lessons = []
@@ -1224,6 +1267,7 @@ class CourseModel13(object):
             self._lessons = lessons
         if unit_id_to_lesson_ids:
             self._unit_id_to_lesson_ids = unit_id_to_lesson_ids
+            self._index_lookups()
         else:
             self._index()
 
@@ -1257,8 +1301,27 @@ class CourseModel13(object):
         """Indexes units and lessons."""
         self._unit_id_to_lesson_ids = self._make_unit_id_to_lessons_lookup_dict(
             self._lessons)
+        self._index_lookups()
         index_units_and_lessons(self)
 
+    def _index_lookups(self):
+        """Builds the maps used by find_unit_by_id() and friends.
+
+        Ids are compared as strings, and when several objects share an id the
+        first one in the course order wins, just as in a linear search.
+        """
+        self._unit_id_to_unit = {}
+        self._assessment_id_to_parent_unit = {}
+        for unit in self._units:
+            self._unit_id_to_unit.setdefault(str(unit.unit_id), unit)
+            for assessment_id in (unit.pre_assessment, unit.post_assessment):
+                self._assessment_id_to_parent_unit.setdefault(
+                    str(assessment_id), unit)
+
+        self._lesson_id_to_lesson = {}
+        for lesson in self._lessons:
+            self._lesson_id_to_lesson.setdefault(str(lesson.lesson_id), lesson)
+
     def get_file_content(self, filename):
         fs = self.app_context.fs
         path = fs.impl.physical_to_logical(filename)
@@ -1324,6 +1387,7 @@ class CourseModel13(object):
             self._units = self._deleted_units
             self._lessons = self._deleted_lessons
             self._unit_id_to_lesson_ids = None
+            self._index_lookups()
 
             # Delete owned assessments.
             for unit in self._deleted_units:
@@ -1343,6 +1407,7 @@ class CourseModel13(object):
             self._units = units
             self._lessons = lessons
             self._unit_id_to_lesson_ids = unit_id_to_lesson_ids
+            self._index_lookups()
 
     def _validate_settings_content(self, content):
         yaml.safe_load(content)
@@ -1451,28 +1516,16 @@ class CourseModel13(object):
 
     def find_unit_by_id(self, unit_id):
         """Finds a unit given its id."""
-        for unit in self._units:
-            if str(unit.unit_id) == str(unit_id):
-                return unit
-        return None
+        return self._unit_id_to_unit.get(str(unit_id))
 
     def find_lesson_by_id(self, unused_unit, lesson_id):
         """Finds a lesson given its id."""
-        for lesson in self._lessons:
-            if str(lesson.lesson_id) == str(lesson_id):
-                return lesson
-        return None
+        return self._lesson_id_to_lesson.get(str(lesson_id))
 
     def get_parent_unit(self, unit_id):
         # See if the unit is an assessment being used as a pre/post
-        # unit lesson.
-        for unit in self.get_units():
-            if (str(unit.pre_assessment) == str(unit_id) or
-                str(unit.post_assessment) == str(unit_id)):
-                return unit
-
-        # Nope, no other kinds of parentage; no parent.
-        return None
+        # unit lesson. If not, there are no other kinds of parentage.
+        return self._assessment_id_to_parent_unit.get(str(unit_id))
 
     def add_unit(self, unit_type, title, custom_unit_type=None):
         """Adds a brand new unit."""
@@ -1624,6 +1677,9 @@ class CourseModel13(object):
             existing_unit.html_review_form = unit.html_review_form
             existing_unit.workflow_yaml = unit.workflow_yaml
 
+        # Pre/post assessments may have changed.
+        self._index_lookups()
+
         self._dirty_units.append(existing_unit)
         return existing_unit
 
@@ -2285,6 +2341,17 @@ class Workflow(object):
             return False
 
 
+class _ReadOnlyEnvironCache(caching.RequestScopedSingleton):
+    """Read-only course settings shared by all readers within a request.
+
+    Switching the locale of a course, or invalidating its cached settings,
+    clears all request-scoped singletons and hence this cache too.
+    """
+
+    def __init__(self):
+        self.environs = {}
+
+
 class Course(object):
     """Manages a course and all of its components."""
 
@@ -2367,7 +2434,11 @@ class Course(object):
 
     @classmethod
     def get_environ(cls, app_context):
-        """Returns currently defined course settings as a dictionary."""
+        """Returns currently defined course settings as a dictionary.
+
+        Every call returns a new deep copy, which the caller may modify; code
+        that only reads settings should use get_environ_readonly() instead.
+        """
         # pylint: disable=protected-access
 
         # get from local cache
@@ -2391,7 +2462,9 @@ class Course(object):
             # Monkey patch to defend against infinite recursion. Downstream
             # calls do not reload the env but just return the copy we have here.
             old_get_environ = cls.get_environ
+            old_get_environ_readonly = cls.get_environ_readonly
             cls.get_environ = classmethod(lambda cl, ac: env)
+            cls.get_environ_readonly = classmethod(lambda cl, ac: env)
             try:
                 # run hooks
                 for hook in cls.COURSE_ENV_POST_LOAD_HOOKS:
@@ -2402,13 +2475,37 @@ class Course(object):
                 models.MemcacheManager.set(
                     _key, env, namespace=app_context.get_namespace_name())
             finally:
-                # Restore the original method from monkey-patch
+                # Restore the original methods from monkey-patch
                 cls.get_environ = old_get_environ
+                cls.get_environ_readonly = old_get_environ_readonly
         finally:
             models.MemcacheManager.end_readonly()
 
         return copy.deepcopy(env)
 
+    @classmethod
+    def get_environ_readonly(cls, app_context):
+        """Returns course settings as a shared, read-only dictionary.
+
+        The settings are copied once per request into a tree of
+        common.utils.ReadOnlyDict and ReadOnlyList, and that same tree is
+        returned to every later caller in the request. Attempts to modify it
+        raise TypeError; callers that need a modifiable dictionary should call
+        get_environ() or copy.deepcopy() the result.
+
+        Args:
+            app_context: sites.ApplicationContext of the course.
+        Returns:
+            A common.utils.ReadOnlyDict of the course settings.
+        """
+        environs = _ReadOnlyEnvironCache.instance().environs
+        namespace = app_context.get_namespace_name()
+        env = environs.get(namespace)
+        if env is None:
+            env = common_utils.make_read_only(app_context.get_environ())
+            environs[namespace] = env
+        return env
+
     @classmethod
     def _load_environ(cls, app_context):
         course_data_filename = app_context.get_config_filename()
@@ -2754,7 +2851,8 @@ class Course(object):
         return reg
 
     def get_course_setting(self, name):
-        course_settings = self.get_environ(self._app_context).get('course')
+        course_settings = self.get_environ_readonly(
+            self._app_context).get('course')
         if not course_settings:
             return None
         return course_settings.get(name)
@@ -3193,8 +3291,17 @@ class Course(object):
         if not lesson.objectives:
             return []
 
-        return common.tags.get_components_from_html(
-            lesson.objectives, use_lxml)
+        cache = ProcessScopedComponentsCache.instance().cache
+        key = ProcessScopedComponentsCache.make_key(
+            lesson.lesson_id, lesson.objectives, use_lxml)
+        found, components = cache.get(key)
+        if not found:
+            components = common.tags.get_components_from_html(
+                lesson.objectives, use_lxml)
+            cache.put(key, components)
+
+        # Callers own the result; don't let them change the cached copy.
+        return [dict(component) for component in components]
 
     def get_content_as_dict_safe(self, unit, errors, kind='assessment'):
         """Validate the assessment or review script and return as a dict."""
@@ -3555,15 +3662,17 @@ course:
 
     @classmethod
     def is_course_browsable(cls, app_context):
-        return app_context.get_environ()['course'].get('browsable', False)
+        return cls.get_environ_readonly(app_context)['course'].get(
+            'browsable', False)
 
     @classmethod
     def is_course_available(cls, app_context):
-        return app_context.get_environ()['course'].get('now_available', False)
+        return cls.get_environ_readonly(app_context)['course'].get(
+            'now_available', False)
 
     @classmethod
     def get_whitelist(cls, app_context):
-        settings = app_context.get_environ()
+        settings = cls.get_environ_readonly(app_context)
         reg_form_whitelist = settings['reg_form'].get('whitelist', '')
         if reg_form_whitelist:
             return reg_form_whitelist
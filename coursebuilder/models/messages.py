@@ -402,6 +402,13 @@ only see counter values for the one frontend instance you are connected to right
 now.
 """
 
+SITE_SETTINGS_ASSIGN_REVIEWS_FROM_POOL = """
+If "True", new peer reviews are assigned from a larger pool of candidates, so
+that many reviewers who request work at the same time do not compete for the
+same few submissions. Otherwise, reviews are assigned from the first few
+candidates only.
+"""
+
 SITE_SETTINGS_CACHE_CONTENT = """
 If "True", course content is cached. During course development you should turn
 this setting to "False" so you can see your changes instantaneously. Otherwise,
@@ -22,6 +22,7 @@ import datetime
 import logging
 import os
 import sys
+import threading
 import time
 import webapp2
 
@@ -354,6 +355,19 @@ class MemcacheManager(object):
                 key, delta,
                 namespace=cls._get_namespace(namespace), initial_value=0)
 
+    @classmethod
+    def offset_multi(cls, mapping, namespace=None):
+        """Incr a dict of items in memcache, in one RPC, if memcache is enabled.
+
+        Args:
+            mapping: dict mapping memcache keys to integer deltas.
+            namespace: optional namespace; the current one if not given.
+        """
+        if CAN_USE_MEMCACHE.value and mapping:
+            memcache.offset_multi(
+                mapping, namespace=cls._get_namespace(namespace),
+                initial_value=0)
+
 
 CAN_AGGREGATE_COUNTERS = config.ConfigProperty(
     'gcb_can_aggregate_counters', bool,
@@ -361,15 +375,69 @@ CAN_AGGREGATE_COUNTERS = config.ConfigProperty(
     label='Aggregate Counters')
 
 
+# Increments of globally aggregated counters are buffered in process, and are
+# written to memcache in a single batch at the end of every routed request, or
+# by the first increment made once this many seconds passed since the last
+# write.
+GLOBAL_COUNTER_FLUSH_INTERVAL_SEC = 5
+
+
+class GlobalCounterBuffer(object):
+    """Increments of globally aggregated counters not yet sent to memcache."""
+
+    _LOCK = threading.Lock()
+    _DELTAS = collections.defaultdict(int)
+    _LAST_FLUSH_TIME = time.time()
+
+    @classmethod
+    def add(cls, name, delta):
+        """Buffers an increment; flushes if the flush interval has passed."""
+        with cls._LOCK:
+            cls._DELTAS['counter:' + name] += delta
+            due = (time.time() - cls._LAST_FLUSH_TIME >=
+                   GLOBAL_COUNTER_FLUSH_INTERVAL_SEC)
+        if due:
+            cls.flush()
+
+    @classmethod
+    def flush(cls):
+        """Writes all buffered increments to memcache in one batch."""
+        with cls._LOCK:
+            deltas = dict(
+                (key, delta) for key, delta in cls._DELTAS.iteritems()
+                if delta)
+            cls._DELTAS.clear()
+            cls._LAST_FLUSH_TIME = time.time()
+        if not deltas:
+            return
+        try:
+            MemcacheManager.offset_multi(
+                deltas, namespace=appengine_config.DEFAULT_NAMESPACE_NAME)
+        except:  # pylint: disable=bare-except
+            logging.exception('Failed to flush global counters: %s', deltas)
+
+    @classmethod
+    def _clear(cls):
+        """Drops buffered increments for tests."""
+        with cls._LOCK:
+            cls._DELTAS.clear()
+            cls._LAST_FLUSH_TIME = time.time()
+
+
 def incr_counter_global_value(name, delta):
     if CAN_AGGREGATE_COUNTERS.value:
-        MemcacheManager.incr(
-            'counter:' + name, delta,
-            namespace=appengine_config.DEFAULT_NAMESPACE_NAME)
+        GlobalCounterBuffer.add(name, delta)
+
+
+def flush_counter_global_values():
+    """Sends increments buffered by incr_counter_global_value() to memcache."""
+    if CAN_AGGREGATE_COUNTERS.value:
+        GlobalCounterBuffer.flush()
 
 
 def get_counter_global_value(name):
     if CAN_AGGREGATE_COUNTERS.value:
+        GlobalCounterBuffer.flush()
         return MemcacheManager.get(
             'counter:' + name,
             namespace=appengine_config.DEFAULT_NAMESPACE_NAME)
@@ -1663,6 +1731,24 @@ class EventEntity(BaseEntity):
         event.data = data
         event.put()
 
+    @classmethod
+    def record_all(cls, user, events):
+        """Records several events of one user with a single datastore put.
+
+        Args:
+          user: the user who triggered the events
+          events: a list of (source, data) tuples
+        """
+        entities = []
+        for source, data in events:
+            cls._run_record_hooks(source, user, data)
+            event = cls()
+            event.source = source
+            event.user_id = user.user_id()
+            event.data = data
+            entities.append(event)
+        db.put(entities)
+
     def for_export(self, transform_fn):
         model = super(EventEntity, self).for_export(transform_fn)
         model.user_id = transform_fn(self.user_id)
@@ -1979,12 +2065,28 @@ class BaseJsonDao(object):
         cls._maybe_apply_post_save_hooks(zip(id_or_name_list, dtos))
         return id_or_name_list
 
+    @classmethod
+    def _maybe_apply_post_delete_hooks(cls, dto_list):
+        """Run any post-delete processing hooks.
+
+        Modules may insert hooks (e.g. to invalidate caches derived from the
+        DTOs) into the list POST_DELETE_HOOKS defined on the DAO class. If
+        the class has this list and any hook functions are present, they
+        are passed the list of deleted DTO's.
+
+        Args:
+            dto_list: list of DTO objects
+        """
+        if hasattr(cls, 'POST_DELETE_HOOKS'):
+            common_utils.run_hooks(cls.POST_DELETE_HOOKS, dto_list)
+
     @classmethod
     def delete(cls, dto):
         entity = cls._load_entity(dto.id)
         entity.delete()
         MemcacheManager.delete(cls._memcache_all_key())
         MemcacheManager.delete(cls._memcache_key(entity.key().id_or_name()))
+        cls._maybe_apply_post_delete_hooks([dto])
 
     @classmethod
     def clone(cls, dto):
@@ -2057,6 +2159,8 @@ class QuestionDAO(LastModfiedJsonDao):
     POST_LOAD_HOOKS = []
     # Enable other modules to add post-save transformations
     POST_SAVE_HOOKS = []
+    # Enable other modules to act on deletions
+    POST_DELETE_HOOKS = []
 
     @classmethod
     def used_by(cls, question_id):
@@ -21,6 +21,7 @@ import logging
 import os
 from collections import defaultdict
 
+import counters
 import transforms
 
 from common import utils
@@ -36,6 +37,10 @@ TRACKABLE_COMPONENTS = [
     'question-group',
 ]
 
+PROGRESS_SAVE_TIMER = counters.PerfTimer(
+    'gcb-progress-save',
+    'Duration in milliseconds of saving a student progress entity.')
+
 
 class UnitLessonCompletionTracker(object):
     """Tracks student completion for a unit/lesson-based linear course."""
@@ -100,14 +105,60 @@ class UnitLessonCompletionTracker(object):
         EVENT_CODE_MAPPING['custom_unit']
     ]
 
+    # Callbacks run after each step of an update cascade, before the progress
+    # entity is saved. Hooks must read progress through the accessors of this
+    # class: pending changes are encoded into progress.value only at save.
     POST_UPDATE_PROGRESS_HOOK = []
 
     def __init__(self, course):
         self._course = course
+        self._batched_progress = None
+        self._batched_modified_user_ids = None
 
     def _get_course(self):
         return self._course
 
+    def begin_batch(self):
+        """Starts coalescing progress updates until end_batch() is called.
+
+        While a batch is open, each student's progress entity is loaded once
+        and all updates are applied to that copy; the entity is saved once
+        per student by end_batch().
+        """
+        assert self._batched_progress is None
+        self._batched_progress = {}
+        self._batched_modified_user_ids = set()
+
+    def end_batch(self):
+        """Saves the progress entities updated since begin_batch()."""
+        batched_progress = self._batched_progress
+        modified_user_ids = self._batched_modified_user_ids
+        self._batched_progress = None
+        self._batched_modified_user_ids = None
+        for user_id in modified_user_ids:
+            self._put_progress(batched_progress[user_id])
+
+    def _get_progress_for_update(self, student):
+        if self._batched_progress is None:
+            return self.get_or_create_progress(student)
+        progress = self._batched_progress.get(student.user_id)
+        if progress is None:
+            progress = self.get_or_create_progress(student)
+            self._batched_progress[student.user_id] = progress
+        return progress
+
+    def _save_progress(self, student, progress):
+        if self._batched_progress is None:
+            self._put_progress(progress)
+        else:
+            self._batched_modified_user_ids.add(student.user_id)
+
+    def _put_progress(self, progress):
+        with PROGRESS_SAVE_TIMER.timed():
+            self._flush_progress(progress)
+            progress.updated_on = datetime.datetime.now()
+            progress.put()
+
     def get_activity_as_python(self, unit_id, lesson_id):
         """Gets the corresponding activity as a Python object."""
         root_name = 'activity'
@@ -649,13 +700,12 @@ class UnitLessonCompletionTracker(object):
         """Update custom unit."""
         if student.is_transient:
             return
-        progress = self.get_or_create_progress(student)
+        progress = self._get_progress_for_update(student)
         current_state = self._get_entity_value(progress, event_key)
         if current_state == state or current_state == self.COMPLETED_STATE:
             return
         self._set_entity_value(progress, event_key, state)
-        progress.updated_on = datetime.datetime.now()
-        progress.put()
+        self._save_progress(student, progress)
 
     UPDATER_MAPPING = {
         'activity': _update_activity,
@@ -812,13 +862,12 @@ class UnitLessonCompletionTracker(object):
         if student.is_transient or event_entity not in self.EVENT_CODE_MAPPING:
             return
 
-        progress = self.get_or_create_progress(student)
+        progress = self._get_progress_for_update(student)
 
         self._update_event(
             student, progress, event_entity, event_key, direct_update=True)
 
-        progress.updated_on = datetime.datetime.now()
-        progress.put()
+        self._save_progress(student, progress)
 
     def _update_event(self, student, progress, event_entity, event_key,
                       direct_update=False):
@@ -1028,51 +1077,93 @@ class UnitLessonCompletionTracker(object):
         return self.is_component_completed(
             progress, unit_id, lesson_id, cpt_id) or 0
 
+    @classmethod
+    def _get_progress_dict(cls, progress):
+        """Returns the decoded value of a progress entity.
+
+        The JSON text in progress.value is decoded at most once; the decoded
+        dict is kept on the entity instance and all reads and writes made via
+        this class go to it. Changes are encoded back into progress.value only
+        by _flush_progress(), right before the entity is saved. If
+        progress.value is replaced in the meantime, it is decoded again.
+
+        Args:
+          progress: the StudentPropertyEntity
+
+        Returns:
+          A dict mapping progress keys to their values.
+        """
+        # pylint: disable=protected-access
+        decoded = getattr(progress, '_decoded_progress', None)
+        if decoded and decoded['source'] is progress.value:
+            return decoded['data']
+        if progress.value:
+            progress_dict = transforms.loads(progress.value)
+        else:
+            progress_dict = {}
+        progress._decoded_progress = {
+            'source': progress.value, 'data': progress_dict, 'dirty': False}
+        return progress_dict
+
+    @classmethod
+    def _mark_progress_dirty(cls, progress):
+        # pylint: disable=protected-access
+        progress._decoded_progress['dirty'] = True
+
+    @classmethod
+    def _flush_progress(cls, progress):
+        """Encodes pending changes into progress.value, if there are any.
+
+        The decoded dict is dropped from the entity, so that it is neither
+        pickled into memcache nor used after the entity is saved.
+
+        Args:
+          progress: the StudentPropertyEntity
+        """
+        # pylint: disable=protected-access
+        decoded = getattr(progress, '_decoded_progress', None)
+        if not decoded:
+            return
+        del progress._decoded_progress
+        if (decoded['dirty'] and
+            decoded['source'] is progress.value):
+            progress.value = transforms.dumps(decoded['data'])
+
     def _get_entity_value(self, progress, event_key):
-        if not progress.value:
-            return None
-        return transforms.loads(progress.value).get(event_key)
+        return self._get_progress_dict(progress).get(event_key)
 
     def _set_entity_value(self, student_property, key, value):
         """Sets the integer value of a student property.
 
         Note: this method does not commit the change. The calling method should
-        call put() on the StudentPropertyEntity.
+        call _flush_progress() and put() on the StudentPropertyEntity.
 
         Args:
           student_property: the StudentPropertyEntity
           key: the student property whose value should be incremented
           value: the value to increment this property by
         """
-        try:
-            progress_dict = transforms.loads(student_property.value)
-        except (AttributeError, TypeError):
-            progress_dict = {}
-
+        progress_dict = self._get_progress_dict(student_property)
         progress_dict[key] = value
-        student_property.value = transforms.dumps(progress_dict)
+        self._mark_progress_dirty(student_property)
 
     def _inc(self, student_property, key, value=1):
         """Increments the integer value of a student property.
 
         Note: this method does not commit the change. The calling method should
-        call put() on the StudentPropertyEntity.
+        call _flush_progress() and put() on the StudentPropertyEntity.
 
         Args:
           student_property: the StudentPropertyEntity
           key: the student property whose value should be incremented
           value: the value to increment this property by
         """
-        try:
-            progress_dict = transforms.loads(student_property.value)
-        except (AttributeError, TypeError):
-            progress_dict = {}
-
+        progress_dict = self._get_progress_dict(student_property)
         if key not in progress_dict:
             progress_dict[key] = 0
 
         progress_dict[key] += value
-        student_property.value = transforms.dumps(progress_dict)
+        self._mark_progress_dirty(student_property)
 
     @classmethod
     def get_elements_from_key(cls, key):
@@ -18,7 +18,9 @@ __author__ = [
     'sll@google.com (Sean Lip)',
 ]
 
+import config
 import entities
+import messages
 import progress
 import student_work
 import transforms
@@ -31,6 +33,11 @@ PEER_MATCHER = 'peer'
 # Allowed matchers.
 ALLOWED_MATCHERS = [PEER_MATCHER]
 
+CAN_ASSIGN_REVIEWS_FROM_POOL = config.ConfigProperty(
+    'gcb_can_assign_reviews_from_pool', bool,
+    messages.SITE_SETTINGS_ASSIGN_REVIEWS_FROM_POOL, default_value=False,
+    label='Assign Peer Reviews From Pool')
+
 
 class ReviewsProcessor(object):
     """A class that processes review arrangements."""
@@ -74,6 +81,8 @@ class ReviewsProcessor(object):
 
     def get_new_review(self, unit_id, reviewer_key):
         impl = self._get_impl(unit_id)
+        if CAN_ASSIGN_REVIEWS_FROM_POOL.value:
+            return impl.get_new_review_from_pool(str(unit_id), reviewer_key)
         return impl.get_new_review(str(unit_id), reviewer_key)
 
     def get_review_steps_by(self, unit_id, reviewer_key):
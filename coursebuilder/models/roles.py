@@ -20,6 +20,7 @@ import collections
 import config
 import messages
 
+from common import caching
 from common import utils
 from common import users
 from models import MemcacheManager
@@ -39,6 +40,22 @@ GCB_WHITELISTED_USERS = config.ConfigProperty(
 Permission = collections.namedtuple('Permission', ['name', 'description'])
 
 
+class _RolesRequestCache(caching.RequestScopedSingleton):
+    """Memoizes inputs of role checks for the duration of one request.
+
+    Nothing here depends on the current user, so checks made for different
+    users within the same request share the cached values.
+    """
+
+    def __init__(self):
+        # Maps email list text to a frozenset of lowercase emails in it.
+        self.email_sets = {}
+        # Maps a course namespace to its admin_user_emails setting.
+        self.course_admin_emails = {}
+        # The users to permissions map; None until loaded.
+        self.permissions_map = None
+
+
 class Roles(object):
     """A class that provides information about user roles."""
 
@@ -62,25 +79,52 @@ class Roles(object):
                                   GCB_ADMIN_LIST.value)
 
     @classmethod
-    def is_course_admin(cls, app_context):
-        """Checks if a user is a course admin, possibly via delegation."""
+    def is_course_admin(cls, app_context, admin_emails=None):
+        """Checks if a user is a course admin, possibly via delegation.
+
+        Args:
+            app_context: sites.ApplicationContext of the course.
+            admin_emails: The admin emails setting of the course, if the
+                caller already has it; read from the course settings if None.
+        Returns:
+            True if the current user administers the course.
+        """
         if cls.is_super_admin():
             return True
 
-        if KEY_COURSE in app_context.get_environ():
-            environ = app_context.get_environ()[KEY_COURSE]
-            if KEY_ADMIN_USER_EMAILS in environ:
-                allowed = environ[KEY_ADMIN_USER_EMAILS]
-                user = users.get_current_user()
-                if allowed and cls._user_email_in(user, allowed):
-                    return True
+        allowed = admin_emails
+        if allowed is None:
+            allowed = cls._get_course_admin_emails(app_context)
+        if allowed and cls._user_email_in(users.get_current_user(), allowed):
+            return True
         return False
 
     @classmethod
-    def is_user_whitelisted(cls, app_context):
+    def _get_course_admin_emails(cls, app_context):
+        """Gets the course's admin emails setting, reading it once a request."""
+        cache = _RolesRequestCache.instance().course_admin_emails
+        namespace = app_context.get_namespace_name()
+        if namespace not in cache:
+            environ = app_context.get_environ().get(KEY_COURSE, {})
+            cache[namespace] = environ.get(KEY_ADMIN_USER_EMAILS)
+        return cache[namespace]
+
+    @classmethod
+    def is_user_whitelisted(cls, app_context, whitelist=None):
+        """Checks if the current user may see the course.
+
+        Args:
+            app_context: sites.ApplicationContext of the course.
+            whitelist: The whitelist setting of the course, if the caller
+                already has it; read from the course settings if None.
+        Returns:
+            True if the course or global whitelist admits the current user.
+        """
         user = users.get_current_user()
         global_whitelist = GCB_WHITELISTED_USERS.value.strip()
-        course_whitelist = app_context.whitelist.strip()
+        if whitelist is None:
+            whitelist = app_context.whitelist
+        course_whitelist = whitelist.strip()
 
         # Most-specific whitelist used if present.
         if course_whitelist:
@@ -96,9 +140,15 @@ class Roles(object):
 
     @classmethod
     def _user_email_in(cls, user, text):
-        email_list = [email.lower() for email in utils.text_to_list(
-            text, utils.BACKWARD_COMPATIBLE_SPLITTER)]
-        return bool(user and user.email().lower() in email_list)
+        if not user:
+            return False
+        email_sets = _RolesRequestCache.instance().email_sets
+        email_set = email_sets.get(text)
+        if email_set is None:
+            email_set = frozenset(email.lower() for email in utils.text_to_list(
+                text, utils.BACKWARD_COMPATIBLE_SPLITTER))
+            email_sets[text] = email_set
+        return user.email().lower() in email_set
 
     @classmethod
     def update_permissions_map(cls):
@@ -121,15 +171,24 @@ class Roles(object):
                     module_permissions.update(permissions)
 
         MemcacheManager.set(cls.memcache_key, permissions_map)
+        _RolesRequestCache.instance().permissions_map = permissions_map
         return permissions_map
 
     @classmethod
     def _load_permissions_map(cls):
-        """Loads the permissions map from Memcache or creates it if needed."""
-        permissions_map = MemcacheManager.get(cls.memcache_key)
-        if permissions_map is None:  # As opposed to {}, which is valid.
-            permissions_map = cls.update_permissions_map()
-        return permissions_map
+        """Loads the permissions map once a request, creating it if needed.
+
+        The map is read from memcache, or built from the datastore, on the
+        first call in a request; later calls return the same dict, which
+        callers must not modify.
+        """
+        cache = _RolesRequestCache.instance()
+        if cache.permissions_map is None:
+            permissions_map = MemcacheManager.get(cls.memcache_key)
+            if permissions_map is None:  # As opposed to {}, which is valid.
+                permissions_map = cls.update_permissions_map()
+            cache.permissions_map = permissions_map
+        return cache.permissions_map
 
     @classmethod
     def is_user_allowed(cls, app_context, module, permission):
@@ -122,6 +122,38 @@ class Notifications(Service):
         """
         raise NotImplementedError()
 
+    def send_bulk_async(
+        self, to, sender, intent, body, subject, audit_trail=None, html=None,
+        retention_policy=None):
+        """Asyncronously sends the same notification to many recipients.
+
+        Cheaper than calling send_async() for each recipient, but otherwise
+        equivalent: each recipient is sent, audited and retried separately.
+
+        Args:
+          to: list of string. Recipient email addresses. Each must have a valid
+              form; duplicates are only sent one notification.
+          sender: string. Email address of the sender; see send_async().
+          intent: string. Short string identifier of the intent of the
+              notification; see send_async().
+          body: string. The data payload of the notification.
+          subject: string. Subject line for the notification.
+          audit_trail: JSON-serializable object. An optional audit trail kept
+              for each recipient; see send_async().
+          html: optional string. The data payload of the notification as html.
+          retention_policy: RetentionPolicy. See send_async().
+
+        Returns:
+          List of (notification_key, payload_key) 2-tuples, one per distinct
+          recipient, in the order given by to.
+
+        Raises:
+          Exception: if values delegated to model initializers are invalid.
+          ValueError: if any of to or sender are malformed according to App
+              Engine (note that well-formed values do not guarantee success).
+        """
+        raise NotImplementedError()
+
 
 class Unsubscribe(Service):
 
@@ -18,7 +18,7 @@ __author__ = 'Pavel Simakov (psimakov@google.com)'
 
 
 import json
-from StringIO import StringIO
+import re
 from xml.etree import ElementTree
 
 import yaml
@@ -86,6 +86,35 @@ def dict_to_json(source_dict, schema=None, recurse=False):
         recurse=recurse)
 
 
+def _set_encoder(obj):
+    if isinstance(obj, set):
+        return list(obj)
+    return None
+
+
+class _CustomJSONEncoder(json.JSONEncoder):
+
+    def default(self, obj):
+        for f in CUSTOM_JSON_ENCODERS + [_set_encoder]:
+            value = f(obj)
+            if value is not None:
+                return value
+        return super(_CustomJSONEncoder, self).default(obj)
+
+
+# Shared by calls to dumps() that do not customize the encoding, the same way
+# json.dumps() shares its own default encoder.
+_DEFAULT_ENCODER = _CustomJSONEncoder()
+
+# Characters escaped by dumps() to defend against XSS. Non-ASCII characters
+# are only present in json.dumps() output when ensure_ascii=False is used.
+_HTML_UNSAFE_CHARS_RE = re.compile(u'[<>]|[^\x00-\x7f]')
+
+
+def _escape_char(match):
+    return u'\\u%04X' % ord(match.group(0))
+
+
 def dumps(*args, **kwargs):
     """Wrapper around json.dumps.
 
@@ -100,36 +129,15 @@ def dumps(*args, **kwargs):
     Returns:
         string. The converted JSON.
     """
+    if len(args) == 1 and not kwargs:
+        out_str = _DEFAULT_ENCODER.encode(args[0])
+    else:
+        if 'cls' not in kwargs:
+            kwargs['cls'] = _CustomJSONEncoder
+        out_str = json.dumps(*args, **kwargs)
 
-    def set_encoder(obj):
-        if isinstance(obj, set):
-            return list(obj)
-        return None
-
-    def string_escape(in_str):
-        # Defend against XSS by escaping <, > and non-ASCII chars
-        out = StringIO()
-        for c in in_str.decode('utf8'):
-            char_val = ord(c)
-            if char_val > 0x7f or c == '<' or c == '>':
-                out.write('\\u%04X' % char_val)
-            else:
-                out.write(c)
-        return out.getvalue()
-
-    class CustomJSONEncoder(json.JSONEncoder):
-
-        def default(self, obj):
-            for f in CUSTOM_JSON_ENCODERS + [set_encoder]:
-                value = f(obj)
-                if value is not None:
-                    return value
-            return super(CustomJSONEncoder, self).default(obj)
-
-    if 'cls' not in kwargs:
-        kwargs['cls'] = CustomJSONEncoder
-
-    return string_escape(json.dumps(*args, **kwargs))
+    # Defend against XSS by escaping <, > and non-ASCII chars
+    return _HTML_UNSAFE_CHARS_RE.sub(_escape_char, out_str.decode('utf8'))
 
 
 def loads(s, prefix=JSON_XSSI_PREFIX, strict=True, **kwargs):
@@ -284,17 +292,51 @@ class JsonFile(object):
         assert self._file
         return self._file.name
 
+    @classmethod
+    def concatenate(cls, paths, path):
+        """Writes the rows of the closed files at paths, in order, to path.
+
+        Rows are copied as serialized, so the result is byte for byte the
+        file that writing all of the rows to a single JsonFile would give.
+
+        Args:
+            paths: list of string. Paths of JsonFiles written and closed.
+            path: string. Path of the new JsonFile to write.
+        """
+        writer = cls(path)
+        writer.open(cls._MODE_WRITE)
+        try:
+            for part_path in paths:
+                with open(part_path, cls._MODE_READ) as part:
+                    line = cls._read_line(part)
+                    while line is not None:
+                        # Same class. pylint: disable=protected-access
+                        writer._write_line(line)
+                        line = cls._read_line(part)
+        finally:
+            writer.close()
+
+    @classmethod
+    def _read_line(cls, f):
+        """Returns the next serialized row in f, or None past the last one."""
+        line = f.readline()
+        if line.startswith(cls._PREFIX):
+            line = f.readline()
+        if not line:
+            raise ValueError('Unexpected end of JSON file %s' % f.name)
+        if line == cls._SUFFIX:
+            return None
+        line = line.strip()
+        if line.endswith(','):
+            line = line[:-1]
+        return line
+
     def next(self):
         """Retrieves the next line and deserializes it into a Python object."""
         assert self._file
-        line = self._file.readline()
-        if line.startswith(self._PREFIX):
-            line = self._file.readline()
-        if line.endswith(self._SUFFIX):
+        line = self._read_line(self._file)
+        if line is None:
             raise StopIteration()
-        line = line.strip()
-        if line.endswith(','):
-            line = line[:-1]
         return loads(line)
 
     def open(self, mode):
@@ -330,11 +372,14 @@ class JsonFile(object):
             ValueError: if python_object cannot be JSON-serialized.
         """
         assert self._file
+        self._write_line(dumps(python_object))
+
+    def _write_line(self, line):
         template = self._LINE_TEMPLATE
         if self._first:
             template = template[1:]
             self._first = False
-        self._file.write(template % dumps(python_object))
+        self._file.write(template % line)
 
 
 def convert_dict_to_xml(element, python_object):
@@ -49,6 +49,9 @@ _MAX_VFS_SHARD_SIZE = 1000 * 1000
 # Max number of shards for a single VFS cached file.
 _MAX_VFS_NUM_SHARDS = 4
 
+# Number of keys fetched per datastore round trip when listing a directory.
+_LIST_BATCH_SIZE = 1000
+
 # Global memcache controls.
 CAN_USE_VFS_IN_PROCESS_CACHE = ConfigProperty(
     'gcb_can_use_vfs_in_process_cache', bool,
@@ -284,14 +287,46 @@ class VirtualFileSystemTemplateLoader(jinja2.BaseLoader):
             for dir_name in dir_names:
                 self._dir_names.append(AbstractFileSystem.normpath(dir_name))
 
-    def get_source(self, unused_environment, template):
+    def get_environment_pool_key(self):
+        """Returns a key identifying the templates this loader serves."""
+        return (
+            self.__class__.__name__, self._fs.ns, self._logical_home_folder,
+            tuple(self._dir_names))
+
+    def _find(self, template):
         for dir_name in self._dir_names:
             filename = AbstractFileSystem.normpath(
                 os.path.join(dir_name, template))
             stream = self._fs.open(filename)
             if stream:
-                return stream.read().decode('utf-8'), filename, True
-        raise jinja2.TemplateNotFound(template)
+                return filename, stream
+        return None, None
+
+    @classmethod
+    def _get_version(cls, stream):
+        metadata = getattr(stream, 'metadata', None)
+        if not metadata:
+            return None
+        return metadata.updated_on
+
+    def get_source(self, unused_environment, template):
+        filename, stream = self._find(template)
+        if not stream:
+            raise jinja2.TemplateNotFound(template)
+        version = self._get_version(stream)
+
+        def uptodate():
+            # Environments are pooled across requests, so a loaded template
+            # must be reloaded as soon as the file it came from changes, or
+            # another file starts to shadow it. VFS lookups are served from
+            # the in-process VFS cache, which follows updates made by other
+            # instances.
+            current_filename, current_stream = self._find(template)
+            return (
+                current_filename == filename and
+                self._get_version(current_stream) == version)
+
+        return stream.read().decode('utf-8'), filename, uptodate
 
     def list_templates(self):
         all_templates = []
@@ -752,6 +787,33 @@ class DatastoreBackedFileSystem(object):
             result = self._inherits_from.isfile(afilename)
         return result
 
+    @classmethod
+    def _list_keys(cls, dir_name):
+        """Iterates over keys of all metadata entities named with a prefix.
+
+        File names are the key names of FileMetadataEntity, and the datastore
+        keeps keys of a kind sorted by name in its built-in per-namespace key
+        index. All files under a directory thus form one contiguous key range
+        [dir_name, next_name), where next_name is dir_name with its last
+        character incremented. Scanning only that range makes the cost of a
+        listing proportional to the size of the directory rather than to the
+        number of files in the whole course, and needs no extra bookkeeping
+        in put() or delete().
+
+        Args:
+            dir_name: string. Physical name prefix of the files to list.
+
+        Returns:
+            An iterator over db.Key objects, in key name order.
+        """
+        query = FileMetadataEntity.all(keys_only=True)
+        if dir_name:
+            next_name = dir_name[:-1] + unichr(ord(dir_name[-1]) + 1)
+            kind = FileMetadataEntity.kind()
+            query.filter('__key__ >=', db.Key.from_path(kind, dir_name))
+            query.filter('__key__ <', db.Key.from_path(kind, next_name))
+        return query.run(batch_size=_LIST_BATCH_SIZE)
+
     def list(self, dir_name, include_inherited=False):
         """Lists all files in a directory by using datastore query.
 
@@ -766,11 +828,8 @@ class DatastoreBackedFileSystem(object):
         """
         dir_name = self._logical_to_physical(dir_name)
         result = set()
-        keys = FileMetadataEntity.all(keys_only=True)
-        for key in keys.fetch(1000):
-            filename = key.name()
-            if filename.startswith(dir_name):
-                result.add(self._physical_to_logical(filename))
+        for key in self._list_keys(dir_name):
+            result.add(self._physical_to_logical(key.name()))
         if include_inherited and self._inherits_from:
             for inheritable_folder in self._inheritable_folders:
                 logical_folder = self._physical_to_logical(inheritable_folder)
@@ -394,6 +394,8 @@ class BaseAdminHandler(ConfigPropertyEditor):
                 global_value = 'NA'
             perf_counters[name] = '%s / %s' % (
                 all_counters[name].value, global_value)
+            if isinstance(all_counters[name], counters.PerfTimer):
+                perf_counters[name] += ' (%s)' % all_counters[name].summary
         return self.render_dict(
             perf_counters, 'In-process Performance Counters (local/global)')
 
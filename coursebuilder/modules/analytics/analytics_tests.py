@@ -21,7 +21,9 @@ import datetime
 import json
 import os
 import pprint
+import random
 import tempfile
+import unittest
 import urllib
 import zlib
 
@@ -137,8 +139,9 @@ class AbstractModulesAnalyticsTest(actions.TestBase):
             data = fs.read()
             return transforms.loads(data)
 
-    def run_aggregator_job(self):
-        job = student_aggregate.StudentAggregateGenerator(self.app_context)
+    def run_aggregator_job(self, incremental=True):
+        job = student_aggregate.StudentAggregateGenerator(
+            self.app_context, incremental=incremental)
         job.submit()
         self.execute_all_deferred_tasks()
 
@@ -295,6 +298,115 @@ class StudentAggregateTest(AbstractModulesAnalyticsTest):
         # No sorting - items should be presented in order by time, video, etc.
         self.assertEqual(expected, actual['youtube'])
 
+    def _get_all_aggregates(self):
+        def normalize(value):
+            if isinstance(value, dict):
+                return {k: normalize(v) for k, v in value.iteritems()}
+            if isinstance(value, list):
+                return sorted(
+                    [normalize(item) for item in value],
+                    key=lambda item: transforms.dumps(item, sort_keys=True))
+            return value
+
+        with common_utils.Namespace('ns_' + self.COURSE_NAME):
+            return {
+                entity.key().name(): normalize(transforms.loads(
+                    zlib.decompress(entity.data)))
+                for entity in student_aggregate.StudentAggregateEntity.all()}
+
+    def test_incremental_run_matches_full_run(self):
+        self.load_course('simple_questions')
+        self.load_datastore('multiple')
+
+        # Add a second Student with a copy of the events of the first one.
+        with common_utils.Namespace('ns_' + self.COURSE_NAME):
+            models.Student(
+                key_name='2', user_id='2', is_enrolled=True).put()
+            events = models.EventEntity.all().fetch(1000)
+            for event in events:
+                models.EventEntity(
+                    source=event.source, user_id='2', data=event.data,
+                    recorded_on=event.recorded_on).put()
+        self.run_aggregator_job()
+        initial = self._get_all_aggregates()
+        self.assertEqual(
+            [events[0].user_id, '2'], sorted(initial.keys()))
+
+        # Record one more event for the first Student only.
+        with common_utils.Namespace('ns_' + self.COURSE_NAME):
+            models.EventEntity(
+                source=events[0].source, user_id=events[0].user_id,
+                data=events[0].data).put()
+        job = student_aggregate.StudentAggregateGenerator(self.app_context)
+        self.assertIsNotNone(
+            job.build_additional_mapper_params(
+                self.app_context)['events_since'])
+        self.run_aggregator_job()
+        incremental = self._get_all_aggregates()
+        self.assertNotEqual(
+            initial[events[0].user_id], incremental[events[0].user_id])
+        self.assertEqual(initial['2'], incremental['2'])
+
+        self.run_aggregator_job(incremental=False)
+        self.assertEqual(self._get_all_aggregates(), incremental)
+
+    def test_full_run_after_course_change_or_old_full_run(self):
+        self.load_course('simple_questions')
+        self.load_datastore('multiple')
+        self.run_aggregator_job()
+
+        def get_events_since():
+            job = student_aggregate.StudentAggregateGenerator(
+                self.app_context)
+            return job.build_additional_mapper_params(
+                self.app_context)['events_since']
+
+        self.assertIsNotNone(get_events_since())
+
+        # Changing the course makes the next run a full one.
+        course = courses.Course(None, app_context=self.app_context)
+        course.add_unit()
+        course.save()
+        self.assertIsNone(get_events_since())
+        self.run_aggregator_job()
+        self.assertIsNotNone(get_events_since())
+
+        # So does the last full run being too old.
+        run_entity_class = student_aggregate.StudentAggregateRunEntity
+        with common_utils.Namespace('ns_' + self.COURSE_NAME):
+            last_run = run_entity_class.get_by_key_name(
+                run_entity_class.KEY_NAME)
+            last_run.last_full_run_started_on -= datetime.timedelta(
+                days=student_aggregate.StudentAggregateGenerator.
+                MAX_DAYS_BETWEEN_FULL_RUNS + 1)
+            last_run.put()
+        self.assertIsNone(get_events_since())
+
+    def test_events_since_is_start_of_last_run(self):
+        self.load_course('simple_questions')
+        self.load_datastore('multiple')
+        self.run_aggregator_job()
+
+        run_entity_class = student_aggregate.StudentAggregateRunEntity
+        with common_utils.Namespace('ns_' + self.COURSE_NAME):
+            last_run = run_entity_class.get_by_key_name(
+                run_entity_class.KEY_NAME)
+            run_started_on = last_run.last_run_started_on
+        self.assertIsNotNone(run_started_on)
+
+        # Make the job record disagree with when the run really started.
+        job = student_aggregate.StudentAggregateGenerator(self.app_context)
+        with common_utils.Namespace('ns_' + self.COURSE_NAME):
+            job_entity = job.load()
+            job_entity.updated_on += datetime.timedelta(days=1)
+            job_entity.execution_time_sec = 0
+            job_entity.put()
+
+        self.assertEquals(
+            run_started_on.strftime(transforms.ISO_8601_DATETIME_FORMAT),
+            job.build_additional_mapper_params(
+                self.app_context)['events_since'])
+
 
 class ClusteringTabTests(actions.TestBase):
     """Test for the clustering subtab of analytics tab."""
@@ -1623,6 +1735,112 @@ class ClusteringGeneratorTests(actions.TestBase):
         ]
         self._check_hamming(cluster_vector, [], 1)
 
+    def _get_far_vectors(self):
+        cluster_vector = [
+            {clustering.DIM_TYPE: clustering.DIM_TYPE_UNIT,
+             clustering.DIM_ID: str(dim_id),
+             clustering.DIM_HIGH: 10,
+             clustering.DIM_LOW: 5}
+            for dim_id in range(5)]
+        student_vector = [
+            {clustering.DIM_TYPE: clustering.DIM_TYPE_UNIT,
+             clustering.DIM_ID: dim_id,
+             clustering.DIM_VALUE: 20}
+            for dim_id in range(5)]
+        return cluster_vector, student_vector
+
+    def test_hamming_max_distance(self):
+        """The calculation stops once the maximum distance is exceeded."""
+        cluster_vector, student_vector = self._get_far_vectors()
+        self._check_hamming(cluster_vector, student_vector, 5)
+        self.assertEqual(3, clustering.hamming_distance(
+            cluster_vector, student_vector, max_distance=2))
+        self.assertEqual(5, clustering.hamming_distance(
+            cluster_vector, student_vector, max_distance=5))
+
+    def test_hamming_indexed_student_vector(self):
+        """A pre-built index gives the same distance as the raw vector."""
+        cluster_vector, student_vector = self._get_far_vectors()
+        student_vector[0][clustering.DIM_VALUE] = 7
+        student_vector.append(
+            {clustering.DIM_TYPE: clustering.DIM_TYPE_UNIT,
+             clustering.DIM_ID: '1',
+             clustering.DIM_VALUE: 7})  # Ignored, repeated dimension.
+        index = clustering.index_student_vector(student_vector)
+        self.assertEqual(7, index[('0', clustering.DIM_TYPE_UNIT)])
+        self.assertEqual(20, index[('1', clustering.DIM_TYPE_UNIT)])
+        self._check_hamming(cluster_vector, student_vector, 4)
+        self._check_hamming(cluster_vector, index, 4)
+
+
+class ClusteringHammingTests(unittest.TestCase):
+    """Compares hamming_distance with a linear scan of the student vector."""
+
+    STUDENTS = 200
+    CLUSTERS = 10
+    STUDENT_DIMS = 10
+    CLUSTER_DIMS = 4
+    MAX_DISTANCE = 2
+
+    @staticmethod
+    def _reference_hamming_distance(vector, student_vector):
+        distance = 0
+        for dim in vector:
+            value = clustering.StudentVector.get_dimension_value(
+                student_vector, dim[clustering.DIM_ID],
+                dim[clustering.DIM_TYPE])
+            if not value:
+                value = 0
+            if ((dim[clustering.DIM_LOW] is not None and
+                 dim[clustering.DIM_LOW] > value) or
+                (dim[clustering.DIM_HIGH] is not None and
+                 dim[clustering.DIM_HIGH] < value)):
+                distance += 1
+        return distance
+
+    def _make_vectors(self):
+        rand = random.Random(0)
+        clusters = []
+        for _ in range(self.CLUSTERS):
+            vector = []
+            for dim_id in rand.sample(range(self.STUDENT_DIMS),
+                                      self.CLUSTER_DIMS):
+                low = rand.randint(0, 80)
+                vector.append({
+                    clustering.DIM_TYPE: clustering.DIM_TYPE_UNIT,
+                    clustering.DIM_ID: str(dim_id),
+                    clustering.DIM_LOW: low,
+                    clustering.DIM_HIGH: low + 20})
+            clusters.append(vector)
+        students = [
+            [{clustering.DIM_TYPE: clustering.DIM_TYPE_UNIT,
+              clustering.DIM_ID: dim_id,
+              clustering.DIM_VALUE: rand.randint(0, 100)}
+             for dim_id in range(self.STUDENT_DIMS)]
+            for _ in range(self.STUDENTS)]
+        return clusters, students
+
+    def test_hamming_distance_matches_linear_scan(self):
+        clusters, students = self._make_vectors()
+        expected = [
+            [self._reference_hamming_distance(cluster, student)
+             for cluster in clusters]
+            for student in students]
+        actual = []
+        for student in students:
+            index = clustering.index_student_vector(student)
+            actual.append([
+                clustering.hamming_distance(cluster, index, self.MAX_DISTANCE)
+                for cluster in clusters])
+
+        for expected_row, actual_row in zip(expected, actual):
+            for expected_distance, actual_distance in zip(
+                    expected_row, actual_row):
+                if expected_distance > self.MAX_DISTANCE:
+                    self.assertGreater(actual_distance, self.MAX_DISTANCE)
+                else:
+                    self.assertEqual(expected_distance, actual_distance)
+
 
 class TestClusterStatisticsDataSource(actions.TestBase):
 
@@ -1820,14 +2038,16 @@ class GradebookCsvTests(actions.TestBase):
         namespace_manager.set_namespace(self.old_namespace)
         super(GradebookCsvTests, self).tearDown()
 
-    def _build_job(self, mode, course_name=None):
+    def _build_job(self, mode, course_name=None, order=None):
+        job_args = '--mode=%s --save_as=%s' % (mode, self.temp_file_name)
+        if order:
+            job_args += ' --order=%s' % order
         etl_args = etl.create_args_parser().parse_args(
             ['run',
              'modules.analytics.gradebook.DownloadAsCsv',
              '/%s' % (course_name or self.COURSE_NAME),
              'unused_servername',
-             '--job_args', '--mode=%s --save_as=%s' % (
-                 mode, self.temp_file_name),
+             '--job_args', job_args,
              ])
         return gradebook.DownloadAsCsv(etl_args)
 
@@ -1880,6 +2100,19 @@ class GradebookCsvTests(actions.TestBase):
         response = self.get(questions_url, expect_errors=True)
         self.assertEquals(401, response.status_int)
 
+    def test_bad_url_arguments(self):
+        # Treat as module-protected. pylint: disable=protected-access
+        url = '/%s%s' % (self.COURSE_NAME, gradebook.CsvDownloadHandler.URI)
+        response = self.get(
+            '%s?%s=bogus' % (url, gradebook._MODE_ARG_NAME),
+            expect_errors=True)
+        self.assertEquals(400, response.status_int)
+
+        response = self.get(
+            '%s?%s=bogus' % (url, gradebook._ORDER_ARG_NAME),
+            expect_errors=True)
+        self.assertEquals(400, response.status_int)
+
     def test_one_answer(self):
         a1 = 'xxx\xe7\xb6\x92'
         s1 = 123.0
@@ -2018,6 +2251,37 @@ class GradebookCsvTests(actions.TestBase):
                 'admin@foo.com,"to comma, or not to comma",1.0\r\n',
                 course_name)
 
+    def test_order_by_user_id(self):
+        score_rows = []
+        for email in [self.ADMIN_EMAIL, self.STUDENT_EMAIL, 'other@foo.com']:
+            if email != self.ADMIN_EMAIL:
+                actions.login(email)
+                actions.register(self, email, self.COURSE_NAME)
+            user = users.get_current_user()
+            answers = [[
+                self.unit_two.unit_id, self.u2_l1.lesson_id, 0, self.q_a_id,
+                None, None, 'one', 1, 1, True]]
+            student_answers.QuestionAnswersEntity(
+                key_name=user.user_id(), data=transforms.dumps(answers)).put()
+            score_rows.append((user.user_id(), ','.join(
+                [str(x) for x in
+                 email, 1.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0]) + '\r\n'))
+        actions.login(self.ADMIN_EMAIL)
+        expected_scores = self.expected_score_headers + ''.join(
+            row for unused_user_id, row in sorted(score_rows))
+
+        # Treat as module-protected. pylint: disable=protected-access
+        self._build_job(
+            gradebook._MODE_SCORES, order=gradebook._ORDER_USER_ID).run()
+        self._verify_output(expected_scores)
+
+        scores_url = ('/%s%s?%s=%s&%s=%s' % (
+            self.COURSE_NAME, gradebook.CsvDownloadHandler.URI,
+            gradebook._MODE_ARG_NAME, gradebook._MODE_SCORES,
+            gradebook._ORDER_ARG_NAME, gradebook._ORDER_USER_ID))
+        response = self.get(scores_url)
+        self.assertEquals(expected_scores, response.body)
+
     def test_interactive_downloads_only_for_courses_with_few_students(self):
         gradebook_url = ('/%s/dashboard?action=analytics_gradebook' %
                          self.COURSE_NAME)
@@ -779,7 +779,23 @@ class StudentVectorGenerator(jobs.MapReduceJob):
         return 0
 
 
-def hamming_distance(vector, student_vector):
+def index_student_vector(student_vector):
+    """Maps (dimension id, dimension type) to values of a StudentVector.
+
+    Dimension ids are converted to strings, as in
+    StudentVector.get_dimension_value; if a dimension appears several times,
+    its first value is used.
+
+    Params:
+        student_vector: the vector field of a StudentVector instance.
+    """
+    index = {}
+    for dim in student_vector:
+        index.setdefault((str(dim[DIM_ID]), dim[DIM_TYPE]), dim.get(DIM_VALUE))
+    return index
+
+
+def hamming_distance(vector, student_vector, max_distance=None):
     """Return the hamming distance between a ClusterEntity and a StudentVector.
 
     The hamming distance between an ClusterEntity and a StudentVector is the
@@ -790,27 +806,25 @@ def hamming_distance(vector, student_vector):
 
     Params:
         vector: the vector field of a ClusterEntity instance.
-        student_vector: the vector field of a StudentVector instance.
+        student_vector: the vector field of a StudentVector instance, or its
+            index built by index_student_vector(). Pass the index when
+            comparing the same student against many clusters.
+        max_distance: if given, the calculation stops as soon as the distance
+            exceeds this value, and the partial distance is returned.
     """
-    # TODO(milit): As we are discarding all distances greater than
-    # ClusteringGenerator.MAX_DISTANCE, add it as a parameter so we stop
-    # calculating the distance once this limit is reached.
-    def fits_left_side(dim, value):
-        """_has_left_side(dim) -> dim[DIM_LOW] <= value"""
-        return not _has_left_side(dim) or dim[DIM_LOW] <= value
-
-    def fits_right_side(dim, value):
-        """_has_right_side(dim) -> dim[DIM_HIGH] >= value"""
-        return not _has_right_side(dim) or dim[DIM_HIGH] >= value
+    if not isinstance(student_vector, dict):
+        student_vector = index_student_vector(student_vector)
 
     distance = 0
     for dim in vector:
-        value = StudentVector.get_dimension_value(student_vector,
-                                                  dim[DIM_ID], dim[DIM_TYPE])
+        value = student_vector.get((str(dim[DIM_ID]), dim[DIM_TYPE]))
         if not value:
             value = 0
-        if not fits_left_side(dim, value) or not fits_right_side(dim, value):
+        if ((_has_left_side(dim) and dim[DIM_LOW] > value) or
+            (_has_right_side(dim) and dim[DIM_HIGH] < value)):
             distance += 1
+            if max_distance is not None and distance > max_distance:
+                break
     return distance
 
 
@@ -874,9 +888,11 @@ class ClusteringGenerator(jobs.MapReduceJob):
             mapper_params = context.get().mapreduce_spec.mapper.params
             max_distance = mapper_params['max_distance']
             clusters = {}
-            item_vector = transforms.loads(student.vector)
+            item_vector = index_student_vector(
+                transforms.loads(student.vector))
             for cluster in mapper_params['clusters']:
-                distance = hamming_distance(cluster['vector'], item_vector)
+                distance = hamming_distance(
+                    cluster['vector'], item_vector, max_distance)
                 if distance > max_distance:
                     continue
                 for cluster2_id, distance2 in clusters.items():
@@ -17,6 +17,7 @@
 __author__ = 'Mike Gainer (mgainer@google.com)'
 
 import csv
+import itertools
 import re
 import StringIO
 
@@ -33,35 +34,62 @@ _MODE_ARG_NAME = 'mode'
 _MODE_SCORES = 'scores'
 _MODE_QUESTIONS = 'questions'
 _MODES = [_MODE_SCORES, _MODE_QUESTIONS]
+_ORDER_ARG_NAME = 'order'
+_ORDER_EMAIL = 'email'
+_ORDER_USER_ID = 'user_id'
+_ORDERS = [_ORDER_EMAIL, _ORDER_USER_ID]
 
 # TODO(mgainer): Move RawAnswersDataSource, et. al. here from student_answers.py
 
 
 class AbstractGradebookCsvGenerator(object):
 
-    def __init__(self, app_context, source_context=None):
+    def __init__(self, app_context, source_context=None, order=_ORDER_EMAIL):
+        """Creates a generator.
+
+        Args:
+          app_context: the course to export answers from.
+          source_context: unused.
+          order: _ORDER_EMAIL to sort students by their email address, which
+              requires holding all answers in memory, or _ORDER_USER_ID to
+              emit students in the order in which the RawAnswersGenerator
+              job stored them.  The latter holds only one page of answers in
+              memory at a time, so it is suitable for courses of any size.
+        """
         self._app_context = app_context
         self._source_context = source_context
+        self._order = order
 
     def get_output(self):
-        student_question_answers = self._fetch_all_question_answers()
+        stream = StringIO.StringIO()
+        self.write_output(stream)
+        ret = stream.getvalue()
+        stream.close()
+        return ret
+
+    def write_output(self, stream):
+        """Writes the CSV text row by row to a file-like object.
+
+        Memory use stays bounded only if the stream does not itself hold
+        what is written, as a file does and a webapp2 response does not.
+        """
+        if self._order == _ORDER_USER_ID:
+            student_question_answers = self._iter_question_answers()
+        else:
+            student_question_answers = self._fetch_all_question_answers()
         column_titles, ids_to_index = self._walk_course()
         answer_rows = self._reduce_answers(
             student_question_answers, ids_to_index)
 
-        stream = StringIO.StringIO()
         csv_stream = csv.writer(stream, quoting=csv.QUOTE_MINIMAL)
-        for row in [column_titles] + answer_rows:
+        for row in itertools.chain([column_titles], answer_rows):
             row = [i.encode('utf-8') if isinstance(i, unicode) else str(i)
                    for i in row]
             csv_stream.writerow(row)
-        ret = stream.getvalue()
-        stream.close()
-        return ret
 
-    def _fetch_all_question_answers(self):
+    def _iter_question_answers(self):
+        """Yields answers one page at a time, in order of student user ID."""
         source_class = student_answers.RawAnswersDataSource
-        values = []
         chunk_size = source_class.get_default_chunk_size()
         context_class = source_class.get_context_class()
         source_context = context_class.build_blank_default({}, chunk_size)
@@ -76,10 +104,14 @@ class AbstractGradebookCsvGenerator(object):
                     sought_page_number)
                 if actual_page_number != sought_page_number:
                     break
-                values.extend(data)
+                for value in data:
+                    yield value
                 if len(data) < source_context.chunk_size:
                     break
                 sought_page_number += 1
+
+    def _fetch_all_question_answers(self):
+        values = list(self._iter_question_answers())
         values.sort(key=lambda x: x['user_email'])
         return values
 
@@ -112,12 +144,14 @@ class AbstractGradebookCsvGenerator(object):
               Cartesian product of students X all possible questions; only the
               questions actually answered by the student will be present.  It
               is up to the subclass to correctly place results in the (fixed-
-              width) CSV rows.
+              width) CSV rows.  This may be an iterator that can only be
+              traversed once.
           ids_to_index: As described in return value for _walk_course().
         Returns:
           An iterable of iterables.  Each iterable should provide a list of
               items for a single student, starting with the student's
-              email address.
+              email address.  To keep memory use bounded, rows should be
+              produced as soon as all answers of the student were seen.
         """
         raise NotImplementedError
 
@@ -156,15 +190,17 @@ class GradebookGradedItemsCsvGenerator(AbstractGradebookCsvGenerator):
 
     def _reduce_answers(self, student_question_answers, ids_to_index):
         prev_email = None
-        ret = []
+        answers = None
         for answer in student_question_answers:
             if answer['user_email'] != prev_email:
+                if answers:
+                    yield answers
                 prev_email = answer['user_email']
                 answers = [answer['user_email']] + [0.0] * len(ids_to_index)
-                ret.append(answers)
             index = ids_to_index[(answer['unit_id'], answer['lesson_id'])] + 1
             answers[index] += answer['weighted_score']
-        return ret
+        if answers:
+            yield answers
 
 
 class GradebookAllQuestionsCsvGenerator(AbstractGradebookCsvGenerator):
@@ -173,7 +209,7 @@ class GradebookAllQuestionsCsvGenerator(AbstractGradebookCsvGenerator):
         column_titles, ids_to_index = self._walk_course()
         answer_rows = self._reduce_answers(student_question_answers,
                                            ids_to_index)
-        return [column_titles] + answer_rows
+        return [column_titles] + list(answer_rows)
 
 
     def _walk_course(self):
@@ -203,12 +239,13 @@ class GradebookAllQuestionsCsvGenerator(AbstractGradebookCsvGenerator):
 
     def _reduce_answers(self, student_question_answers, ids_to_index):
         prev_email = None
-        ret = []
+        answers = None
         for answer in student_question_answers:
             if answer['user_email'] != prev_email:
+                if answers:
+                    yield answers
                 prev_email = answer['user_email']
                 answers = [answer['user_email']] + ['', 0.0] * len(ids_to_index)
-                ret.append(answers)
             index = ids_to_index[
                 (answer['unit_id'], answer['lesson_id'], answer['question_id'])]
             response = answer['answers']
@@ -217,19 +254,20 @@ class GradebookAllQuestionsCsvGenerator(AbstractGradebookCsvGenerator):
             else:
                 answers[index] = str(response)
             answers[index + 1] = answer['weighted_score']
-        return ret
+        if answers:
+            yield answers
 
 
-def _generate_csv(app_context, mode):
+def _get_generator(app_context, mode, order=_ORDER_EMAIL):
     if mode == _MODE_SCORES:
         generator_class = GradebookGradedItemsCsvGenerator
     elif mode == _MODE_QUESTIONS:
         generator_class = GradebookAllQuestionsCsvGenerator
     else:
         raise ValueError('Mode "%s" not in %s' % (mode, ','.join(_MODES)))
-    generator = generator_class(app_context)
-    output = generator.get_output()
-    return output
+    if order not in _ORDERS:
+        raise ValueError('Order "%s" not in %s' % (order, ','.join(_ORDERS)))
+    return generator_class(app_context, order=order)
 
 
 class DownloadAsCsv(etl_lib.CourseJob):
@@ -246,20 +284,27 @@ class DownloadAsCsv(etl_lib.CourseJob):
     MODE can be "scores" or "questions".  "Scores" provides total scores for
     assessments and scored lessons for each student.  "Questions" gives
     the student's answer and score for each question.
+
+    Add --order=user_id to the job args to export students in user ID order
+    rather than by email; this needs memory for only a page of answers at a
+    time and so works for courses of any size.
     """
 
     def _configure_parser(self):
         self.parser.add_argument(
             '--%s' % _MODE_ARG_NAME, choices=_MODES)
+        self.parser.add_argument(
+            '--%s' % _ORDER_ARG_NAME, choices=_ORDERS, default=_ORDER_EMAIL)
         self.parser.add_argument(
             '--save_as', type=str, help='Path of the file to save output to')
 
     def main(self):
         app_context = self._get_app_context_or_die(
             self.etl_args.course_url_prefix)
-        output = _generate_csv(app_context, self.args.mode)
+        generator = _get_generator(
+            app_context, self.args.mode, self.args.order)
         with open(self.args.save_as, 'w') as fp:
-            fp.write(output)
+            generator.write_output(fp)
 
 
 class CsvDownloadHandler(utils.BaseHandler):
@@ -269,8 +314,13 @@ class CsvDownloadHandler(utils.BaseHandler):
     def get(self):
         if not roles.Roles.is_course_admin(self.app_context):
             self.error(401)
+            return
         mode = self.request.get(_MODE_ARG_NAME, _MODE_SCORES)
-        output = _generate_csv(self.app_context, mode)
+        order = self.request.get(_ORDER_ARG_NAME, _ORDER_EMAIL)
+        if mode not in _MODES or order not in _ORDERS:
+            self.error(400)
+            return
+        generator = _get_generator(self.app_context, mode, order)
         filename = '%s_%s.csv' % (self.app_context.get_title(), mode)
         safe_filename = re.sub(r'[\"\']', '_', filename.lower())
         self.response.headers.add('Content-Type', 'text/csv')
@@ -278,4 +328,6 @@ class CsvDownloadHandler(utils.BaseHandler):
         self.response.headers.add(
             'Content-Disposition',
             str('attachment; filename="%s"' % str(safe_filename)))
-        self.response.write(output)
+        # The response buffers the whole body, so unlike the ETL job this
+        # download is not bounded in memory by order=user_id.
+        generator.write_output(self.response)
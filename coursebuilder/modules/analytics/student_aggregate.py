@@ -17,6 +17,8 @@
 __author__ = ['Michael Gainer (mgainer@google.com)']
 
 import collections
+import datetime
+import hashlib
 import logging
 import zlib
 
@@ -160,6 +162,23 @@ class StudentAggregateEntity(entities.BaseEntity):
         return db.Key.from_path(cls.kind(), transform_fn(db_key.id_or_name()))
 
 
+class StudentAggregateRunEntity(entities.BaseEntity):
+    """Inputs of the last successful StudentAggregateGenerator run of a course.
+
+    There is at most one such entity per course, with key name KEY_NAME.  It
+    lets the next run decide whether it may be incremental.
+    """
+
+    KEY_NAME = 'last_run'
+
+    # Hash of everything other than events that the aggregates depend on.
+    inputs_fingerprint = db.StringProperty(indexed=False)
+    # Start time of the last successful run.
+    last_run_started_on = db.DateTimeProperty(indexed=False)
+    # Start time of the last successful run that rebuilt all aggregates.
+    last_full_run_started_on = db.DateTimeProperty(indexed=False)
+
+
 class StudentAggregateGenerator(jobs.MapReduceJob):
     """M/R job to aggregate data by student using registered plug-ins.
 
@@ -169,8 +188,39 @@ class StudentAggregateGenerator(jobs.MapReduceJob):
     insulated from one another, and are permitted to fail individually without
     compromising the results contributed for a Student by other plugins.
 
+    Once the job has completed successfully, later runs are incremental: only
+    Students with at least one event recorded since the start of the last
+    successful run have their aggregate rebuilt.  The aggregate is rebuilt
+    from all of that Student's events, so it is the same as the one a full
+    run would produce.  Aggregates of other Students are left as they are.
+
+    A run rebuilds the aggregates of all Students instead when the course,
+    or the registered components or their static parameters, differ from
+    those of the last successful run; when the last full run is more than
+    MAX_DAYS_BETWEEN_FULL_RUNS old, so that events written with an earlier
+    recorded_on (e.g., uploaded with the ETL tool) are eventually counted;
+    or when constructed with incremental=False.
+
+    Incremental runs save the reduce work only.  EventEntity.user_id is not
+    indexed, so the events of one Student can not be queried; the map phase
+    still reads every event of the course and emits values for every
+    Student.
     """
 
+    # Longest time incremental runs may follow one another before a run
+    # rebuilds the aggregates of all Students.
+    MAX_DAYS_BETWEEN_FULL_RUNS = 7
+
+    # Value emitted by map() for a Student who has recent events.
+    RECENT_EVENTS_MARKER = 'recent-events'
+
+    # Courses used by reduce(), keyed by (mapreduce_id, namespace).
+    _courses = {}
+
+    def __init__(self, app_context, incremental=True):
+        super(StudentAggregateGenerator, self).__init__(app_context)
+        self._incremental = incremental
+
     @staticmethod
     def get_description():
         return 'student_aggregate'
@@ -179,7 +229,42 @@ class StudentAggregateGenerator(jobs.MapReduceJob):
     def entity_class():
         return models.EventEntity
 
+    def _get_inputs_fingerprint(self, mapper_params):
+        """Hashes everything other than events that aggregates depend on."""
+        inputs = dict(mapper_params)
+        inputs['course'] = courses.Course(
+            None, app_context=self._app_context).to_json()
+        return hashlib.sha256(
+            transforms.dumps(inputs, sort_keys=True)).hexdigest()
+
+    def _get_events_since(self, inputs_fingerprint):
+        """Returns the start time of the last successful run, if any.
+
+        Args:
+            inputs_fingerprint: The _get_inputs_fingerprint() of this run.
+        Returns:
+            The time since which events need to be looked at, or None if
+            this run has to rebuild the aggregates of all Students.
+        """
+        if not self._incremental:
+            return None
+        job = self.load()
+        if not job or job.status_code != jobs.STATUS_CODE_COMPLETED:
+            return None
+        with common_utils.Namespace(self._namespace):
+            last_run = StudentAggregateRunEntity.get_by_key_name(
+                StudentAggregateRunEntity.KEY_NAME)
+        if (not last_run or
+            last_run.inputs_fingerprint != inputs_fingerprint or
+            not last_run.last_run_started_on or
+            not last_run.last_full_run_started_on or
+            datetime.datetime.utcnow() - last_run.last_full_run_started_on >
+            datetime.timedelta(days=self.MAX_DAYS_BETWEEN_FULL_RUNS)):
+            return None
+        return last_run.last_run_started_on
+
     def build_additional_mapper_params(self, app_context):
+        run_started_on = datetime.datetime.utcnow()
         schemas = {}
         schema_names = {}
         ret = {
@@ -199,14 +284,49 @@ class StudentAggregateGenerator(jobs.MapReduceJob):
                 schema_name = schema.name
             schema_names[component_name] = schema_name
             schemas[component_name] = schema.get_json_schema_dict()
+
+        inputs_fingerprint = self._get_inputs_fingerprint(ret)
+        events_since = self._get_events_since(inputs_fingerprint)
+        ret.update({
+            'inputs_fingerprint': inputs_fingerprint,
+            'run_started_on': run_started_on.strftime(
+                transforms.ISO_8601_DATETIME_FORMAT),
+            'events_since': (
+                events_since.strftime(transforms.ISO_8601_DATETIME_FORMAT)
+                if events_since else None),
+            })
         return ret
 
+    @staticmethod
+    def complete(kwargs, unused_results):
+        """Records the inputs of this run, for the next run to compare."""
+        params = kwargs['mapper_params']
+        with common_utils.Namespace(params['course_namespace']):
+            last_run = StudentAggregateRunEntity.get_by_key_name(
+                StudentAggregateRunEntity.KEY_NAME)
+            if not last_run:
+                last_run = StudentAggregateRunEntity(
+                    key_name=StudentAggregateRunEntity.KEY_NAME)
+            run_started_on = datetime.datetime.strptime(
+                params['run_started_on'], transforms.ISO_8601_DATETIME_FORMAT)
+            last_run.inputs_fingerprint = params['inputs_fingerprint']
+            last_run.last_run_started_on = run_started_on
+            if not params['events_since']:
+                last_run.last_full_run_started_on = run_started_on
+            last_run.put()
+
     @staticmethod
     def map(event):
+        params = context.get().mapreduce_spec.mapper.params
+        events_since = params.get('events_since')
+        if events_since and event.recorded_on >= datetime.datetime.strptime(
+            events_since, transforms.ISO_8601_DATETIME_FORMAT):
+            yield (event.user_id,
+                   StudentAggregateGenerator.RECENT_EVENTS_MARKER)
+
         for component in (StudentAggregateComponentRegistry.
                           get_components_for_event_source(event.source)):
             component_name = component.get_name()
-            params = context.get().mapreduce_spec.mapper.params
             static_data = params.get(component_name)
             value = None
             try:
@@ -221,8 +341,34 @@ class StudentAggregateGenerator(jobs.MapReduceJob):
                 value_str = '%s:%s' % (component_name, transforms.dumps(value))
                 yield event.user_id, value_str
 
+    @staticmethod
+    def _get_course(namespace):
+        """Returns a Course shared by all reduce() calls of one job."""
+        key = (context.get().mapreduce_spec.mapreduce_id, namespace)
+        course = StudentAggregateGenerator._courses.get(key)
+        if not course:
+            app_context = sites.get_course_index(
+                ).get_app_context_for_namespace(namespace)
+            course = courses.Course(None, app_context=app_context)
+            StudentAggregateGenerator._courses.clear()
+            StudentAggregateGenerator._courses[key] = course
+        return course
+
     @staticmethod
     def reduce(user_id, values):
+        params = context.get().mapreduce_spec.mapper.params
+
+        # In an incremental run, skip Students without any recent events.
+        # Like in a full run, also skip Students whose events produced no
+        # values.
+        values = list(values)
+        if params.get('events_since'):
+            if StudentAggregateGenerator.RECENT_EVENTS_MARKER not in values:
+                return
+            values = [value for value in values if value !=
+                      StudentAggregateGenerator.RECENT_EVENTS_MARKER]
+            if not values:
+                return
 
         # Convenience for collections: Pre-load Student and Course objects.
         student = None
@@ -237,10 +383,8 @@ class StudentAggregateGenerator(jobs.MapReduceJob):
                 'was not loaded.  Ignoring records for this student.', user_id)
             return
 
-        params = context.get().mapreduce_spec.mapper.params
-        ns = params['course_namespace']
-        app_context = sites.get_course_index().get_app_context_for_namespace(ns)
-        course = courses.Course(None, app_context=app_context)
+        course = StudentAggregateGenerator._get_course(
+            params['course_namespace'])
 
         # Bundle items together into lists by collection name
         event_items = collections.defaultdict(list)
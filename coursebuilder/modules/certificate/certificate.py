@@ -35,6 +35,7 @@ __author__ = [
     'John Orr (jorr@google.com)']
 
 
+import hashlib
 import os
 import StringIO
 
@@ -44,12 +45,14 @@ from reportlab.lib.units import inch
 from reportlab.pdfgen import canvas
 
 import appengine_config
+from common import caching
 from common import safe_dom
 from common import schema_fields
 from common import tags
 from controllers import sites
 from controllers import utils
 from models import analytics
+from models import counters
 from models import courses
 from models import custom_modules
 from models import data_sources
@@ -67,6 +70,21 @@ MODULE_TITLE = 'Certificates'
 CERTIFICATE_HANDLER_PATH = 'certificate'
 CERTIFICATE_PDF_HANDLER_PATH = 'certificate.pdf'
 RESOURCES_PATH = '/modules/certificate/resources'
+BACKGROUND_IMAGE_PATH = os.path.join(
+    appengine_config.BUNDLE_ROOT,
+    'modules', 'certificate', 'resources', 'images', 'cert.png')
+
+# Bump whenever the layout drawn by ShowCertificatePdfHandler changes, so that
+# PDFs rendered by the previous code are no longer served from the cache.
+CERTIFICATE_PDF_VERSION = 1
+CERTIFICATE_PDF_CACHE_TTL_SECS = 60 * 60
+
+COUNTER_CERTIFICATE_PDF_CACHE_HIT = counters.PerfCounter(
+    'gcb-certificate-pdf-cache-hit',
+    'A number of times a rendered certificate PDF was found in the cache.')
+COUNTER_CERTIFICATE_PDF_CACHE_MISS = counters.PerfCounter(
+    'gcb-certificate-pdf-cache-miss',
+    'A number of times a certificate PDF had to be rendered.')
 
 
 class ShowCertificateHandler(utils.BaseHandler):
@@ -103,13 +121,9 @@ class ShowCertificatePdfHandler(utils.BaseHandler):
         c.setTitle('Course Builder Certificate')
 
         # Draw the background image
-        image_path = os.path.join(
-            appengine_config.BUNDLE_ROOT,
-            'modules', 'certificate', 'resources', 'images', 'cert.png')
-        image_data = open(image_path).read()
-        image = canvas.ImageReader(StringIO.StringIO(image_data))
         c.drawImage(
-            image, 0, -1.5 * inch, width=11 * inch, preserveAspectRatio=True)
+            _BackgroundImage.instance().image, 0, -1.5 * inch,
+            width=11 * inch, preserveAspectRatio=True)
 
         text = c.beginText()
 
@@ -140,6 +154,44 @@ class ShowCertificatePdfHandler(utils.BaseHandler):
         c.showPage()
         c.save()
 
+    def _get_cache_key(self, course, student):
+        """Key of the rendered PDF; changes whenever its content would."""
+        parts = [
+            CERTIFICATE_PDF_VERSION, _BackgroundImage.instance().digest,
+            self.app_context.get_current_locale(), course,
+            student.user_id, student.name]
+        digest = hashlib.sha256(
+            '\n'.join(unicode(part) for part in parts).encode('utf-8'))
+        return 'certificate-pdf:%s' % digest.hexdigest()
+
+    def _get_cert_pdf(self, course, student):
+        """Returns the certificate PDF bytes, rendering them on a cache miss.
+
+        The PDF is cached in memcache under the current course namespace. The
+        cache key covers everything drawn on the certificate, so a change of
+        the student's name, the course title, the locale or the template
+        produces a new entry rather than serving a stale one.
+
+        Args:
+            course: str. The title of the course.
+            student: models.Student. The student the certificate is for.
+        Returns:
+            The bytes of the PDF document.
+        """
+        key = self._get_cache_key(course, student)
+        pdf = models.MemcacheManager.get(key)
+        if pdf is not None:
+            COUNTER_CERTIFICATE_PDF_CACHE_HIT.inc()
+            return pdf
+
+        COUNTER_CERTIFICATE_PDF_CACHE_MISS.inc()
+        out = StringIO.StringIO()
+        self._print_cert(out, course, student)
+        pdf = out.getvalue()
+        models.MemcacheManager.set(
+            key, pdf, ttl=CERTIFICATE_PDF_CACHE_TTL_SECS)
+        return pdf
+
     def get(self):
         """Handles GET requests."""
         student = self.personalize_page_and_get_enrolled()
@@ -155,7 +207,17 @@ class ShowCertificatePdfHandler(utils.BaseHandler):
         self.response.headers['Content-Type'] = 'application/pdf'
         self.response.headers['Content-Disposition'] = (
             'attachment; filename=certificate.pdf')
-        self._print_cert(self.response.out, course, student)
+        self.response.out.write(self._get_cert_pdf(course, student))
+
+
+class _BackgroundImage(caching.ProcessScopedSingleton):
+    """The certificate background, read and decoded once per process."""
+
+    def __init__(self):
+        with open(BACKGROUND_IMAGE_PATH, 'rb') as image_file:
+            image_data = image_file.read()
+        self.digest = hashlib.sha256(image_data).hexdigest()
+        self.image = canvas.ImageReader(StringIO.StringIO(image_data))
 
 
 def _get_score_by_id(score_list, assessment_id):
@@ -105,6 +105,34 @@ class CertificateHandlerTestCase(actions.TestBase):
             response.headers['Content-Disposition'])
         self.assertIn('/Title (Course Builder Certificate)', response.body)
 
+    def test_download_pdf_is_cached_until_student_name_changes(self):
+        user = actions.login('test@example.com')
+        models.Student.add_new_student_for_current_user('Test User', None, self)
+
+        printed_names = []
+        print_cert = certificate.ShowCertificatePdfHandler._print_cert
+
+        def counting_print_cert(handler, out, course, student):
+            printed_names.append(student.name)
+            print_cert(handler, out, course, student)
+
+        self.swap(
+            certificate.ShowCertificatePdfHandler, '_print_cert',
+            counting_print_cert)
+
+        with actions.OverriddenConfig(models.CAN_USE_MEMCACHE.name, True):
+            first = self.get('/certificate.pdf').body
+            second = self.get('/certificate.pdf').body
+            self.assertEquals(first, second)
+            self.assertEquals(['Test User'], printed_names)
+
+            student = models.Student.get_by_user(user)
+            student.name = 'Renamed User'
+            student.put()
+
+            self.get('/certificate.pdf')
+            self.assertEquals(['Test User', 'Renamed User'], printed_names)
+
     def test_certificate_table_entry(self):
         user = actions.login('test@example.com')
         models.Student.add_new_student_for_current_user('Test User', None, self)
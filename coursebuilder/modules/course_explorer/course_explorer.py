@@ -18,6 +18,7 @@ __author__ = 'Rahul Singal (rahulsingal@google.com)'
 
 from common import users
 from controllers import utils
+from models import courses
 from models import custom_modules
 from models.config import ConfigProperty
 from models.models import StudentProfileDAO
@@ -52,6 +53,11 @@ class ExplorerPageInitializer(utils.PageInitializer):
             template_values.update({'has_global_profile': profile is not None})
 
 
+def notify_module_enabled():
+    courses.Course.COURSE_ENV_POST_SAVE_HOOKS.append(
+        student.bump_catalog_version)
+
+
 def register_module():
     """Registers this module in the registry."""
 
@@ -70,7 +76,7 @@ def register_module():
     custom_module = custom_modules.Module(
         'Course Explorer',
         'A set of pages for delivering an online course.',
-        explorer_routes, [])
+        explorer_routes, [], notify_module_enabled=notify_module_enabled)
     return custom_module
 
 
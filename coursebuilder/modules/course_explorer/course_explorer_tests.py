@@ -174,6 +174,115 @@ class CourseExplorerTest(BaseExplorerTest):
         # No registration button present
         self.assertIsNone(item.find('.//a[@href="/register"]'))
 
+    def _count_catalog_entry_loads(self):
+        loads = []
+        catalog_entry = student.CatalogEntry
+
+        def counting_catalog_entry(app_context):
+            loads.append(app_context.get_namespace_name())
+            return catalog_entry(app_context)
+
+        self.swap(student, 'CatalogEntry', counting_catalog_entry)
+        return loads
+
+    def test_catalog_cached_until_course_settings_change(self):
+        actions.simple_add_course(
+            'catalog', 'admin@example.com', 'Catalog Course')
+        actions.login('student@example.com')
+
+        with actions.OverriddenConfig(models.CAN_USE_MEMCACHE.name, True):
+            loads = self._count_catalog_entry_loads()
+            response = self.get('/explorer')
+            actions.assert_contains('Catalog Course', response.body)
+            self.assertIn('ns_catalog', loads)
+            num_courses = len(loads)
+
+            # the catalog is served from the cache
+            response = self.get('/explorer')
+            actions.assert_contains('Catalog Course', response.body)
+            self.assertEqual(num_courses, len(loads))
+
+            # saving settings of any course reloads the whole catalog
+            actions.update_course_config(
+                'catalog', {'course': {'title': 'Renamed Course'}})
+            response = self.get('/explorer')
+            actions.assert_contains('Renamed Course', response.body)
+            actions.assert_does_not_contain('Catalog Course', response.body)
+            self.assertEqual(2 * num_courses, len(loads))
+
+    def test_catalog_reloaded_when_version_changes_elsewhere(self):
+        actions.simple_add_course(
+            'catalog', 'admin@example.com', 'Catalog Course')
+        actions.login('student@example.com')
+
+        with actions.OverriddenConfig(models.CAN_USE_MEMCACHE.name, True):
+            response = self.get('/explorer')
+            actions.assert_contains('Catalog Course', response.body)
+
+            # Another instance renames the course and bumps the catalog
+            # version; nothing cached in this process is cleared.
+            get_environ = courses.Course.get_environ
+
+            def renamed_get_environ(unused_cls, app_context):
+                env = get_environ(app_context)
+                if app_context.get_namespace_name() == 'ns_catalog':
+                    env['course']['title'] = 'Renamed Course'
+                return env
+
+            self.swap(
+                courses.Course, 'get_environ',
+                classmethod(renamed_get_environ))
+            response = self.get('/explorer')
+            actions.assert_contains('Catalog Course', response.body)
+
+            student.bump_catalog_version()
+            response = self.get('/explorer')
+            actions.assert_contains('Renamed Course', response.body)
+            actions.assert_does_not_contain('Catalog Course', response.body)
+
+    def test_catalog_version_read_once_per_request(self):
+        for index in xrange(3):
+            actions.simple_add_course(
+                'catalog%s' % index, 'admin@example.com',
+                'Catalog Course %s' % index)
+        actions.login('student@example.com')
+        version_reads = []
+        memcache_get = models.MemcacheManager.get
+
+        def counting_get(key, namespace=None):
+            if key == student._CATALOG_VERSION_KEY:
+                version_reads.append(key)
+            return memcache_get(key, namespace=namespace)
+
+        with actions.OverriddenConfig(models.CAN_USE_MEMCACHE.name, True):
+            self.get('/explorer')
+            self.swap(
+                models.MemcacheManager, 'get', staticmethod(counting_get))
+            response = self.get('/explorer')
+            for index in xrange(3):
+                actions.assert_contains(
+                    'Catalog Course %s' % index, response.body)
+            self.assertEqual(1, len(version_reads))
+
+    def test_catalog_follows_course_availability(self):
+        actions.simple_add_course(
+            'catalog', 'admin@example.com', 'Catalog Course')
+
+        with actions.OverriddenConfig(models.CAN_USE_MEMCACHE.name, True):
+            actions.login('student@example.com')
+            response = self.get('/explorer')
+            actions.assert_contains('Catalog Course', response.body)
+
+            actions.update_course_config(
+                'catalog', {'course': {'now_available': False}})
+            response = self.get('/explorer')
+            actions.assert_does_not_contain('Catalog Course', response.body)
+
+            # course admins still see the course
+            actions.login('admin@example.com')
+            response = self.get('/explorer')
+            actions.assert_contains('Catalog Course', response.body)
+
 
 class CourseExplorerDisabledTest(actions.TestBase):
     """Tests when course explorer is disabled."""
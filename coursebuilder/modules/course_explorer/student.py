@@ -18,13 +18,16 @@ __author__ = 'Rahul Singal (rahulsingal@google.com)'
 
 import mimetypes
 import os
+import threading
 
 import course_explorer
 import webapp2
 
 import appengine_config
+from common import caching
 from common import jinja_utils
 from common import users
+from common import utils as common_utils
 from controllers import sites
 from controllers import utils
 from models import courses as models_courses
@@ -44,6 +47,120 @@ STUDENT_RENAME_GLOBAL_XSRF_TOKEN_ID = 'rename-student-global'
 # Int. Maximum number of bytes App Engine's db.StringProperty can store.
 _STRING_PROPERTY_MAX_BYTES = 500
 
+# Memcache key, in the default namespace, of a token that changes whenever the
+# settings of any course change. The token expires, so that edits which do not
+# go through Course.save_settings() are eventually picked up too.
+_CATALOG_VERSION_KEY = 'course_explorer:catalog:version'
+_CATALOG_VERSION_TTL_SEC = 60 * 60
+
+
+def bump_catalog_version(unused_course_settings=None):
+    """Invalidates the course catalog cached in all processes."""
+    models.MemcacheManager.set(
+        _CATALOG_VERSION_KEY, common_utils.generate_instance_id(),
+        ttl=_CATALOG_VERSION_TTL_SEC,
+        namespace=appengine_config.DEFAULT_NAMESPACE_NAME)
+    _CatalogVersion.clear_instance()
+
+
+class _CatalogVersion(caching.RequestScopedSingleton):
+    """The catalog version token, read from memcache once per request."""
+
+    def __init__(self):
+        self.value = None
+        if not models.CAN_USE_MEMCACHE.value:
+            return
+        self.value = models.MemcacheManager.get(
+            _CATALOG_VERSION_KEY,
+            namespace=appengine_config.DEFAULT_NAMESPACE_NAME)
+        if self.value is None:
+            bump_catalog_version()
+            self.value = models.MemcacheManager.get(
+                _CATALOG_VERSION_KEY,
+                namespace=appengine_config.DEFAULT_NAMESPACE_NAME)
+
+
+class CatalogEntry(object):
+    """Settings of a course needed to list it in the course explorer."""
+
+    def __init__(self, app_context):
+        # Read fresh settings, not the request-scoped view, so that an entry
+        # built after the version changes never holds older settings.
+        environ = models_courses.Course.get_environ(app_context)
+        course_settings = environ.get(roles.KEY_COURSE, {})
+        reg_form_settings = environ.get('reg_form', {})
+        self.title = course_settings.get('title')
+        self.blurb = course_settings.get('blurb')
+        self.instructor_details = course_settings.get('instructor_details')
+        self.now_available = course_settings.get('now_available', False)
+        # As in models.courses.Course.get_whitelist().
+        self.whitelist = (
+            reg_form_settings.get('whitelist', '') or
+            course_settings.get('whitelist', ''))
+        self.admin_emails = (
+            course_settings.get(roles.KEY_ADMIN_USER_EMAILS) or '')
+        self.can_register = environ['reg_form']['can_register']
+
+
+class CourseCatalog(caching.ProcessScopedSingleton):
+    """Catalog entries of all courses, shared by requests.
+
+    The catalog is tagged with the version token found in memcache when it
+    was first filled. Saving the settings of any course, which is also how
+    course availability changes, replaces the token; the next request in
+    every process then notices the change and drops the whole catalog.
+    """
+
+    def __init__(self):
+        self._version = None
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def _get_version(cls):
+        """Gets the catalog version token, creating it if there is none.
+
+        The token is read once per request, however many courses are listed.
+
+        Returns:
+            The token, or None if memcache is not available to share it.
+        """
+        return _CatalogVersion.instance().value
+
+    def get(self, app_context):
+        """Gets the catalog entry of a course.
+
+        Args:
+            app_context: sites.ApplicationContext of the course.
+        Returns:
+            A CatalogEntry, which may be shared with other requests and must
+            not be modified.
+        """
+        # Settings translated into a locale are not covered by the version
+        # token, so they are never cached.
+        version = None
+        if app_context.get_current_locale() is None:
+            version = self._get_version()
+        if version is None:
+            return CatalogEntry(app_context)
+
+        namespace = app_context.get_namespace_name()
+        with self._lock:
+            if self._version != version:
+                self._version = version
+                self._entries = {}
+            entry = self._entries.get(namespace)
+        if entry is not None:
+            return entry
+
+        # The version was read before loading, so an entry loaded while the
+        # settings change is not kept under the newer version.
+        entry = CatalogEntry(app_context)
+        with self._lock:
+            if self._version == version:
+                self._entries[namespace] = entry
+        return entry
+
 
 class IndexPageHandler(webapp2.RequestHandler, utils.QueryableRouteMixin):
     """Handles routing of root URL '/'."""
@@ -98,9 +215,13 @@ class BaseStudentHandler(webapp2.RequestHandler):
     def get_public_courses(self):
         """Get all the public courses."""
         public_courses = []
+        catalog = CourseCatalog.instance()
         for course in sites.get_all_courses():
-            if ((course.now_available and roles.Roles.is_user_whitelisted(
-                    course)) or roles.Roles.is_course_admin(course)):
+            entry = catalog.get(course)
+            if ((entry.now_available and roles.Roles.is_user_whitelisted(
+                    course, whitelist=entry.whitelist)) or
+                    roles.Roles.is_course_admin(
+                        course, admin_emails=entry.admin_emails)):
                 public_courses.append(course)
         return public_courses
 
@@ -117,22 +238,26 @@ class BaseStudentHandler(webapp2.RequestHandler):
         return False
 
     def can_register(self, course):
-        return course.get_environ()['reg_form']['can_register']
+        return CourseCatalog.instance().get(course).can_register
 
     def get_course_info(self, course):
         """Returns course info required in views."""
-        info = sites.ApplicationContext.get_environ(course)
+        entry = CourseCatalog.instance().get(course)
         slug = course.get_slug()
         course_preview_url = slug
         if slug == '/':
             course_preview_url = '/course'
             slug = ''
-        info['course']['slug'] = slug
-        info['course']['course_preview_url'] = course_preview_url
-        info['course']['is_registered'] = self.is_enrolled(course)
-        info['course']['is_completed'] = self.is_completed(course)
-        info['course']['can_register'] = self.can_register(course)
-        return info
+        return {'course': {
+            'title': entry.title,
+            'blurb': entry.blurb,
+            'instructor_details': entry.instructor_details,
+            'slug': slug,
+            'course_preview_url': course_preview_url,
+            'is_registered': self.is_enrolled(course),
+            'is_completed': self.is_completed(course),
+            'can_register': entry.can_register,
+        }}
 
     def get_enrolled_courses(self, courses):
         """Returns list of courses registered by student."""
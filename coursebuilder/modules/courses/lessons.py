@@ -56,6 +56,9 @@ ACTIVITY_PAGE_TYPE = 'activity'
 ASSESSMENT_PAGE_TYPE = 'assessment'
 ASSESSMENT_CONFIRMATION_PAGE_TYPE = 'test_confirmation'
 
+# The most events a client may send in one request to EventsRESTHandler.
+MAX_EVENTS_PER_REQUEST = 100
+
 TAGS_THAT_TRIGGER_BLOCK_COMPLETION = ['attempt-activity']
 TAGS_THAT_TRIGGER_COMPONENT_COMPLETION = ['tag-assessment']
 TAGS_THAT_TRIGGER_HTML_COMPLETION = ['attempt-lesson']
@@ -958,35 +961,64 @@ class EventsRESTHandler(utils.BaseRESTHandler):
         return payload_json
 
     def post(self):
-        """Receives event and puts it into datastore."""
+        """Receives events and puts them into datastore.
 
-        COURSE_EVENTS_RECEIVED.inc()
+        The request is either a single event, a dict with 'source', 'payload'
+        and 'xsrf_token', or a batch: a dict with an 'events' list of such
+        dicts. Every event in a batch must carry a valid XSRF token; if any
+        does not, none of the events are recorded.
+        """
         if not self.can_record_student_events():
+            COURSE_EVENTS_RECEIVED.inc()
             return
 
         request = transforms.loads(self.request.get('request'))
-        if not self.assert_xsrf_token_or_fail(request, 'event-post', {}):
+        events = None
+        if isinstance(request, dict):
+            events = request.get('events', [request])
+        if (not isinstance(events, list) or
+            len(events) > MAX_EVENTS_PER_REQUEST or
+            not all(isinstance(event, dict) for event in events)):
+            COURSE_EVENTS_RECEIVED.inc()
+            transforms.send_json_response(
+                self, 400, 'Bad events batch.', {})
             return
 
+        COURSE_EVENTS_RECEIVED.inc(increment=len(events))
+        for event in events:
+            if not self.assert_xsrf_token_or_fail(event, 'event-post', {}):
+                return
+
         user = self.get_user()
         if not user:
             return
 
-        source = request.get('source')
-        payload_json = request.get('payload')
-        payload_json = self._add_request_facts(payload_json)
-        models.EventEntity.record(source, user, payload_json)
-        COURSE_EVENTS_RECORDED.inc()
+        source_payload_list = [
+            (event.get('source'), self._add_request_facts(event.get('payload')))
+            for event in events]
+        models.EventEntity.record_all(user, source_payload_list)
+        COURSE_EVENTS_RECORDED.inc(increment=len(events))
 
-        self.process_event(user, source, payload_json)
+        self.process_events(user, source_payload_list)
 
-    def process_event(self, user, source, payload_json):
-        """Processes an event after it has been recorded in the event stream."""
+    def process_events(self, user, source_payload_list):
+        """Processes recorded events of a user, saving progress only once."""
 
         student = models.Student.get_enrolled_student_by_user(user)
         if not student:
             return
 
+        tracker = self.get_course().get_progress_tracker()
+        tracker.begin_batch()
+        try:
+            for source, payload_json in source_payload_list:
+                self._process_student_event(student, source, payload_json)
+        finally:
+            tracker.end_batch()
+
+    def _process_student_event(self, student, source, payload_json):
+        """Processes an event after it has been recorded in the event stream."""
+
         payload = transforms.loads(payload_json)
 
         if 'location' not in payload:
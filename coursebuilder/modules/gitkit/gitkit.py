@@ -118,9 +118,12 @@ __author__ = [
     'johncox@google.com (John Cox)',
 ]
 
+import base64
+import hashlib
 import logging
 import os
 import threading
+import time
 import urllib
 
 import httplib2
@@ -128,6 +131,7 @@ import jinja2
 import webapp2
 import yaml
 
+from common import caching
 from common import jinja_utils
 from common import locales
 from common import users
@@ -184,6 +188,9 @@ _SIGN_OUT_CONTINUE_URL = '%s/continue' % _SIGN_OUT_URL
 
 _TITLE_NAME = 'title'
 
+# Maximum number of verified tokens UsersService remembers per process.
+_VERIFIED_TOKEN_CACHE_MAX_ITEMS = 1000
+
 _WIDGET_URL = '%s/widget' % _BASE_URL
 
 _CONFIG_YAML_ADMINS_NAME = 'admins'
@@ -234,6 +241,61 @@ _TITLE = config.ConfigProperty(
     default_value='Please sign in', label='GITKit module account chooser title')
 
 
+def _get_token_expiry(token):
+    """Returns the expiry of a GITKit JWT in seconds since epoch, or None.
+
+    The token is not verified here; only call this with tokens that have been
+    verified by GitkitService.
+
+    Args:
+        token: string. Raw GITKit response token.
+
+    Returns:
+        Number. The value of the token's exp claim, or None if the token is not
+        a JWT or has no exp claim.
+    """
+    try:
+        payload = str(token).split('.')[1]
+        payload += '=' * (-len(payload) % 4)
+        return float(transforms.loads(base64.urlsafe_b64decode(payload))['exp'])
+    except Exception:  # All errors are the same. pylint: disable=broad-except
+        return None
+
+
+class _VerifiedTokenCache(caching.ProcessScopedSingleton):
+    """In-process cache of users whose GITKit tokens have been verified.
+
+    Entries are keyed by a digest of the client id and the token, so raw tokens
+    are not kept in memory, and are dropped once the token expires.
+    """
+
+    def __init__(self):
+        self._cache = caching.LRUCache(
+            max_item_count=_VERIFIED_TOKEN_CACHE_MAX_ITEMS)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def _make_key(cls, client_id, token):
+        return hashlib.sha256('%s:%s' % (client_id, token)).hexdigest()
+
+    def get(self, client_id, token, now):
+        """Returns the users.User for a verified, unexpired token, or None."""
+        key = self._make_key(client_id, token)
+        with self._lock:
+            found, value = self._cache.get(key)
+            if not found:
+                return None
+            user, expiry = value
+            if expiry <= now:
+                self._cache.delete(key)
+                return None
+            return user
+
+    def put(self, client_id, token, user, expiry):
+        with self._lock:
+            self._cache.put(self._make_key(client_id, token), (user, expiry))
+
+
 def _make_gitkit_service(
         client_id, server_api_key, service_account_email, service_account_key,
         widget_url, http=None):
@@ -1002,6 +1064,15 @@ class UsersService(users.AbstractUsersService):
         if not token:
             return None
 
+        # Verifying a token costs signature checks, and this method runs
+        # several times per request, so remember verified tokens until they
+        # expire.
+        now = time.time()
+        token_cache = _VerifiedTokenCache.instance()
+        user = token_cache.get(runtime_config.client_id, token, now)
+        if user:
+            return user
+
         service = _make_gitkit_service(
             runtime_config.client_id, runtime_config.server_api_key,
             runtime_config.service_account_email,
@@ -1010,7 +1081,12 @@ class UsersService(users.AbstractUsersService):
 
         # Let GITKit errors percolate up -- desired behavior when auth is broken
         # is a 500.
-        return service.get_user(token)
+        user = service.get_user(token)
+        if user:
+            expiry = _get_token_expiry(token)
+            if expiry and expiry > now:
+                token_cache.put(runtime_config.client_id, token, user, expiry)
+        return user
 
     @classmethod
     def get_email_update_policy_class(cls):
@@ -18,8 +18,10 @@ __author__ = [
     'johncox@google.com (John Cox)',
 ]
 
+import base64
 import copy
 import logging
+import time
 
 from common import users
 from models import config
@@ -1112,12 +1114,29 @@ class UsersServiceTest(_TestBase):
         self.old_token = gitkit.Runtime.get_current_token()
         self.runtime_config = gitkit.Runtime.get_runtime_config(
                 self.host, self.scheme)
+        gitkit._VerifiedTokenCache.clear_instance()
 
     def tearDown(self):
+        gitkit._VerifiedTokenCache.clear_instance()
         gitkit.Runtime.set_current_runtime_config(self.old_runtime_config)
         gitkit.Runtime.set_current_token(self.old_token)
         super(UsersServiceTest, self).tearDown()
 
+    def _make_jwt(self, exp):
+        payload = base64.urlsafe_b64encode(transforms.dumps({'exp': exp}))
+        return 'header.%s.signature' % payload.rstrip('=')
+
+    def _count_services_made(self, value):
+        services_made = []
+        service = self._get_gitkit_service(value)
+
+        def make_service(*unused_args, **unused_kwargs):
+            services_made.append(service)
+            return service
+
+        self.swap(gitkit, '_make_gitkit_service', make_service)
+        return services_made
+
     def test_create_login_url_falls_back_to_gae_if_no_runtime_config(self):
         self.assertEquals(
             ('https://www.google.com/accounts/Login?'
@@ -1213,6 +1232,37 @@ class UsersServiceTest(_TestBase):
         self.assertEquals(self.email, user.email())
         self.assertEquals(self.user_id, user.user_id())
 
+    def test_get_current_user_caches_verified_token_until_expiry(self):
+        self.runtime_config.enabled = True
+        gitkit.Runtime.set_current_runtime_config(self.runtime_config)
+        services_made = self._count_services_made(self.gitkit_user)
+        now = time.time()
+        gitkit.Runtime.set_current_token(self._make_jwt(now + 3600))
+
+        self.assertEquals(self.email, users.get_current_user().email())
+        self.assertEquals(self.email, users.get_current_user().email())
+        self.assertEquals(1, len(services_made))
+
+        class _ClockAfterExpiry(object):
+
+            @classmethod
+            def time(cls):
+                return now + 3601
+
+        self.swap(gitkit, 'time', _ClockAfterExpiry)
+        self.assertEquals(self.email, users.get_current_user().email())
+        self.assertEquals(2, len(services_made))
+
+    def test_get_current_user_does_not_cache_unverified_token(self):
+        self.runtime_config.enabled = True
+        gitkit.Runtime.set_current_runtime_config(self.runtime_config)
+        services_made = self._count_services_made(None)
+        gitkit.Runtime.set_current_token(self._make_jwt(time.time() + 3600))
+
+        self.assertIsNone(users.get_current_user())
+        self.assertIsNone(users.get_current_user())
+        self.assertEquals(2, len(services_made))
+
     def test_get_current_user_returns_none_when_enabled_but_no_token(self):
         self.runtime_config.enabled = True
         gitkit.Runtime.set_current_runtime_config(self.runtime_config)
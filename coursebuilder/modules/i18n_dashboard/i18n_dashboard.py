@@ -21,6 +21,7 @@ import cgi
 import collections
 import cStringIO
 import datetime
+import hashlib
 import logging
 import os
 import re
@@ -1450,6 +1451,71 @@ RB_CACHE_SIZE_BYTES.poll_value = (
 ResourceBundleCacheConnection.init_counters()
 
 
+class ProcessScopedTranslatedHtmlCache(caching.ProcessScopedSingleton):
+    """This class holds in-process global cache of translated HTML.
+
+    Entries are keyed by digests of the source HTML and of the translation
+    data, so saving a resource bundle or editing the source content yields a
+    new key; stale entries are never hit again and age out of the LRU.
+    """
+
+    @classmethod
+    def get_cache_len(cls):
+        # pylint: disable=protected-access
+        return len(
+            ProcessScopedTranslatedHtmlCache.instance()._cache.items.keys())
+
+    @classmethod
+    def get_cache_size(cls):
+        # pylint: disable=protected-access
+        return ProcessScopedTranslatedHtmlCache.instance()._cache.total_size
+
+    def __init__(self):
+        self._cache = caching.LRUCache(
+            max_size_bytes=MAX_GLOBAL_CACHE_SIZE_BYTES)
+        self._cache.get_entry_size = self._get_entry_size
+
+    def _get_entry_size(self, key, value):
+        return sys.getsizeof(key) + sum(sys.getsizeof(item) for item in value)
+
+    @property
+    def cache(self):
+        return self._cache
+
+    @classmethod
+    def make_key(cls, app_context, source_value, translation_dict):
+        if isinstance(source_value, unicode):
+            source_value = source_value.encode('utf-8')
+        source_digest = hashlib.sha1(source_value).hexdigest()
+        bundle_digest = hashlib.sha1(transforms.dumps(
+            translation_dict, sort_keys=True)).hexdigest()
+        # The decomposition rules are derived from the registered tags.
+        tags_hash = hash(frozenset(tags.Registry.get_all_tags()))
+        return '%s:%s:%s:%s:%s' % (
+            app_context.get_namespace_name(),
+            app_context.get_current_locale(), tags_hash, source_digest,
+            bundle_digest)
+
+
+TRANSLATED_HTML_CACHE_LEN = PerfCounter(
+    'gcb-i18n-dashboard-translated-html-cache-len',
+    'A total number of items in translated HTML cache.')
+TRANSLATED_HTML_CACHE_SIZE_BYTES = PerfCounter(
+    'gcb-i18n-dashboard-translated-html-cache-bytes',
+    'A total size of items in translated HTML cache in bytes.')
+TRANSLATED_HTML_CACHE_HIT = PerfCounter(
+    'gcb-i18n-dashboard-translated-html-cache-hit',
+    'A number of times translated HTML was found in cache.')
+TRANSLATED_HTML_CACHE_MISS = PerfCounter(
+    'gcb-i18n-dashboard-translated-html-cache-miss',
+    'A number of times translated HTML was not found in cache.')
+
+TRANSLATED_HTML_CACHE_LEN.poll_value = (
+    ProcessScopedTranslatedHtmlCache.get_cache_len)
+TRANSLATED_HTML_CACHE_SIZE_BYTES.poll_value = (
+    ProcessScopedTranslatedHtmlCache.get_cache_size)
+
+
 class I18nResourceBundleManager(caching.RequestScopedSingleton):
     """Class that provides access to in-process ResourceBundle cache.
 
@@ -2512,7 +2578,34 @@ class LazyTranslator(object):
         return self.translation_dict['data'][0]['target_value']
 
     def _translate_html(self):
-        self._status = self.INVALID_TRANSLATION
+        if CAN_USE_RESOURCE_BUNDLE_IN_PROCESS_CACHE.value:
+            cache = ProcessScopedTranslatedHtmlCache.instance().cache
+            key = ProcessScopedTranslatedHtmlCache.make_key(
+                self._app_context, self.source_value, self.translation_dict)
+            found, value = cache.get(key)
+            if found:
+                TRANSLATED_HTML_CACHE_HIT.inc()
+            else:
+                TRANSLATED_HTML_CACHE_MISS.inc()
+                value = self._do_translate_html()
+                cache.put(key, value)
+        else:
+            value = self._do_translate_html()
+
+        self._status, self._errm, body = value
+        if self._status == self.VALID_TRANSLATION:
+            return body
+        return self._detailed_error(self._errm, body)
+
+    def _do_translate_html(self):
+        """Translate the source HTML.
+
+        The result does not depend on the current user, so it can be shared
+        between requests; the error details are added by the caller.
+
+        Returns:
+            A tuple of (status, error message, body).
+        """
         try:
             context = xcontent.Context(xcontent.ContentIO.fromstring(
                 self.source_value))
@@ -2547,22 +2640,21 @@ class LazyTranslator(object):
             transformer.recompose(context, resource_bundle, errors)
             body = xcontent.ContentIO.tostring(context.tree)
             if count_misses == 0 and not errors:
-                self._status = self.VALID_TRANSLATION
-                return body
+                return self.VALID_TRANSLATION, '', body
             else:
                 parts = 'part' if count_misses == 1 else 'parts'
                 are = 'is' if count_misses == 1 else 'are'
-                self._errm = (
+                errm = (
                     'The content has changed and {n} {parts} of the '
                     'translation {are} out of date.'.format(
                     n=count_misses, parts=parts, are=are))
-                return self._detailed_error(self._errm, self._fallback(body))
+                return self.INVALID_TRANSLATION, errm, self._fallback(body)
 
         except Exception as ex:  # pylint: disable=broad-except
             logging.exception('Unable to translate: %s', self.source_value)
-            self._errm = str(ex)
-            return self._detailed_error(
-                str(ex), self._fallback(self.source_value))
+            return (
+                self.INVALID_TRANSLATION, str(ex),
+                self._fallback(self.source_value))
 
     def _fallback(self, default_body):
         """Try to fallback to the last known good translation."""
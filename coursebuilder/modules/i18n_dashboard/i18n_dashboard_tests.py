@@ -1263,6 +1263,42 @@ class LazyTranslatorTests(actions.TestBase):
             'of the translation is out of date.',
             lazy_translator.errm)
 
+    def test_lazy_translator_caches_translated_html(self):
+        source_value = 'good day'
+        translation_dict = {
+            'type': 'html',
+            'source_value': 'good day',
+            'data': [
+                {'source_value': 'good day', 'target_value': 'GOOD DAY'}]}
+        key = ResourceBundleKey(
+            resources_display.ResourceLesson.TYPE, '23', 'el')
+        hits = i18n_dashboard.TRANSLATED_HTML_CACHE_HIT.value
+        misses = i18n_dashboard.TRANSLATED_HTML_CACHE_MISS.value
+
+        def translate(source_value, translation_dict):
+            lazy_translator = LazyTranslator(
+                self.app_context, key, source_value, translation_dict)
+            return unicode(lazy_translator), lazy_translator.status
+
+        self.assertEquals(
+            (u'GOOD DAY', LazyTranslator.VALID_TRANSLATION),
+            translate(source_value, translation_dict))
+        self.assertEquals(
+            (u'GOOD DAY', LazyTranslator.VALID_TRANSLATION),
+            translate(source_value, translation_dict))
+        self.assertEquals(
+            misses + 1, i18n_dashboard.TRANSLATED_HTML_CACHE_MISS.value)
+        self.assertEquals(
+            hits + 1, i18n_dashboard.TRANSLATED_HTML_CACHE_HIT.value)
+
+        # A saved change to the bundle must not be served from the cache.
+        translation_dict['data'][0]['target_value'] = 'BONJOUR'
+        self.assertEquals(
+            (u'BONJOUR', LazyTranslator.VALID_TRANSLATION),
+            translate(source_value, translation_dict))
+        self.assertEquals(
+            misses + 2, i18n_dashboard.TRANSLATED_HTML_CACHE_MISS.value)
+
 
 class CourseContentTranslationTests(actions.TestBase):
     ADMIN_EMAIL = 'admin@foo.com'
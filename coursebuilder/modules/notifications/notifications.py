@@ -92,6 +92,11 @@ logging.basicConfig()
 _APP_ENGINE_MAIL_FATAL_ERRORS = frozenset([
     mail_errors.BadRequestError, mail_errors.InvalidSenderError,
 ])
+# Number of recipients whose Notification and Payload are written by each
+# db.put() in send_bulk_async(). Two entities each; datastore limit is 500.
+_BULK_PUT_RECIPIENTS = 250
+# Number of send mail tasks added to the queue per RPC in send_bulk_async().
+_BULK_TASKS_PER_ADD = taskqueue.MAX_TASKS_PER_ADD
 _ENQUEUED_BUFFER_MULTIPLIER = 1.5
 _KEY_DELIMITER = ':'
 _MAX_ENQUEUED_HOURS = 3
@@ -120,6 +125,14 @@ COUNTER_SEND_ASYNC_START = counters.PerfCounter(
     'gcb-notifications-send-async-called',
     'number of times send_async has been called'
 )
+COUNTER_SEND_BULK_ASYNC_START = counters.PerfCounter(
+    'gcb-notifications-send-bulk-async-called',
+    'number of times send_bulk_async has been called'
+)
+COUNTER_SEND_BULK_ASYNC_SUCCESS = counters.PerfCounter(
+    'gcb-notifications-send-bulk-async-success',
+    'number of times send_bulk_async succeeded'
+)
 COUNTER_SEND_ASYNC_SUCCESS = counters.PerfCounter(
     'gcb-notifications-send-async-success',
     'number of times send_async succeeded'
@@ -439,6 +452,121 @@ class Manager(object):
 
         return notification_key, payload_key
 
+    @classmethod
+    def send_bulk_async(
+            cls, to, sender, intent, body, subject, audit_trail=None,
+            html=None, retention_policy=None):
+        """Asyncronously sends the same notification to many recipients.
+
+        Behaves like calling send_async() once per recipient: every recipient
+        gets their own Notification, Payload and send mail task, so auditing,
+        retries and retention policies are unchanged. But entities are written
+        _BULK_PUT_RECIPIENTS recipients per datastore call and tasks are added
+        _BULK_TASKS_PER_ADD per task queue call, rather than one call each.
+
+        Unlike send_async(), entities are not written in a single transaction.
+        If a datastore call fails, recipients written by earlier calls have no
+        task yet; the pending notifications cron enqueues them later.
+
+        Args:
+            to: list of string. Recipient email addresses. Each must have a
+                    valid form; duplicates are only sent one notification.
+            sender: string. Email address of the sender; see send_async().
+            intent: string. Intent of the notification; see send_async().
+            body: string. The plain text payload; see send_async().
+            subject: string. Subject line for the notification.
+            audit_trail: JSON-serializable object. Optional audit trail stored
+                    in each recipient's Notification; see send_async().
+            html: optional string. The html payload; see send_async().
+            retention_policy: RetentionPolicy. See send_async().
+
+        Returns:
+            List of (notification_key, payload_key) 2-tuples, one per distinct
+            recipient, in the order given by to.
+
+        Raises:
+            Exception: if values delegated to model initializers are invalid.
+            ValueError: if any of to or sender are malformed according to App
+                    Engine (note that well-formed values do not guarantee
+                    success).
+        """
+        COUNTER_SEND_BULK_ASYNC_START.inc()
+        enqueue_date = datetime.datetime.utcnow()
+        retention_policy = (
+            retention_policy if retention_policy else RetainAuditTrail)
+
+        recipients = []
+        seen = set()
+        for email in to:
+            if email not in seen:
+                seen.add(email)
+                recipients.append(email)
+
+        for email in recipients + [sender]:
+            if not mail.is_email_valid(email):
+                COUNTER_SEND_ASYNC_FAILED_BAD_ARGUMENTS.inc()
+                raise ValueError('Malformed email address: "%s"' % email)
+
+        if retention_policy.NAME not in _RETENTION_POLICIES:
+            COUNTER_SEND_ASYNC_FAILED_BAD_ARGUMENTS.inc()
+            raise ValueError('Invalid retention policy: ' +
+                             str(retention_policy))
+
+        unsaved_models = []
+        try:
+            for email in recipients:
+                unsaved_models.extend(cls._make_unsaved_models(
+                    audit_trail, body, enqueue_date, intent,
+                    retention_policy.NAME, sender, subject, email, html=html,
+                    ))
+        except Exception, e:
+            COUNTER_SEND_ASYNC_FAILED_BAD_ARGUMENTS.inc()
+            raise e
+
+        for notification in unsaved_models[::2]:
+            cls._mark_enqueued(notification, enqueue_date)
+
+        keys = []
+        try:
+            for i in xrange(0, len(unsaved_models), 2 * _BULK_PUT_RECIPIENTS):
+                keys.extend(
+                    db.put(unsaved_models[i:i + 2 * _BULK_PUT_RECIPIENTS]))
+        except Exception, e:
+            COUNTER_SEND_ASYNC_FAILED_DATASTORE_ERROR.inc()
+            raise e
+
+        key_pairs = zip(keys[::2], keys[1::2])
+        cls._enqueue_send_mail_tasks(key_pairs)
+        COUNTER_SEND_BULK_ASYNC_SUCCESS.inc()
+
+        return key_pairs
+
+    @classmethod
+    def _enqueue_send_mail_tasks(cls, key_pairs):
+        """Adds the deferred send mail tasks for many notifications at once.
+
+        The tasks are the same as those send_async() adds with deferred.defer,
+        but they are added _BULK_TASKS_PER_ADD at a time. deferred.defer adds
+        one task per call, so its URL and headers are reused here instead.
+        """
+        # pylint: disable=protected-access
+        url = deferred._DEFAULT_URL
+        headers = deferred._TASKQUEUE_HEADERS
+        # pylint: enable=protected-access
+        retry_options = cls._get_retry_options()
+        queue = taskqueue.Queue()
+        for i in xrange(0, len(key_pairs), _BULK_TASKS_PER_ADD):
+            queue.add([
+                taskqueue.Task(
+                    payload=deferred.serialize(
+                        cls._transactional_send_mail_task, notification_key,
+                        payload_key),
+                    url=url,
+                    headers=dict(headers),
+                    retry_options=retry_options)
+                for notification_key, payload_key in
+                key_pairs[i:i + _BULK_TASKS_PER_ADD]])
+
     @classmethod
     def _make_unsaved_models(
         cls, audit_trail, body, enqueue_date, intent, retention_policy, sender,
@@ -1001,5 +1129,12 @@ def register_module():
                 to, sender, intent, body, subject, audit_trail=audit_trail,
                 html=html, retention_policy=retention_policy)
 
+        def send_bulk_async(
+            self, to, sender, intent, body, subject, audit_trail=None,
+            html=None, retention_policy=None):
+            return Manager.send_bulk_async(
+                to, sender, intent, body, subject, audit_trail=audit_trail,
+                html=html, retention_policy=retention_policy)
+
     services.notifications = Service()
     return custom_module
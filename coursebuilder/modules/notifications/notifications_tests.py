@@ -692,6 +692,57 @@ class ManagerTest(actions.TestBase):
                 invalid_to, self.sender, self.intent, self.body, self.subject,
                 )
 
+    def test_send_bulk_async_sends_one_notification_per_recipient(self):
+        to = [
+            'a@example.com', 'b@example.com', 'a@example.com', 'c@example.com']
+        self.swap(notifications, '_BULK_PUT_RECIPIENTS', 2)
+        self.swap(notifications, '_BULK_TASKS_PER_ADD', 2)
+
+        key_pairs = notifications.Manager.send_bulk_async(
+            to, self.sender, self.intent, self.body, self.subject,
+            audit_trail=self.audit_trail, html=self.html)
+
+        self.assertEqual(3, len(key_pairs))
+        recipients = []
+        for notification_key, payload_key in key_pairs:
+            notification, payload = db.get([notification_key, payload_key])
+            recipients.append(notification.to)
+            self.assertEqual(self.audit_trail, notification.audit_trail)
+            self.assertEqual(notification.enqueue_date,
+                             notification._last_enqueue_date)
+            self.assertEqual(
+                notifications.RetainAuditTrail.NAME,
+                notification._retention_policy)
+            self.assertEqual(notification.to, payload.to)
+            self.assertEqual(self.body, payload.body)
+        self.assertEqual(
+            ['a@example.com', 'b@example.com', 'c@example.com'], recipients)
+
+        self.assertEqual(3, len(self.taskq.GetTasks('default')))
+        self.execute_all_deferred_tasks()
+        messages = self.get_mail_stub().get_sent_messages()
+        self.assertEqual(
+            sorted(recipients), sorted(message.to for message in messages))
+        for notification_key, payload_key in key_pairs:
+            self.assertIsNone(db.get(payload_key).body)  # Ran default policy.
+            self.assertEqual(
+                self.audit_trail, db.get(notification_key).audit_trail)
+
+        self.assertEqual(3, notifications.COUNTER_RETENTION_POLICY_RUN.value)
+        self.assertEqual(3, notifications.COUNTER_SEND_MAIL_TASK_SENT.value)
+        self.assertEqual(
+            1, notifications.COUNTER_SEND_BULK_ASYNC_SUCCESS.value)
+
+    def test_send_bulk_async_raises_value_error_if_any_to_invalid(self):
+        with self.assertRaisesRegexp(ValueError, 'Malformed email address: ""'):
+            notifications.Manager.send_bulk_async(
+                [self.to, ''], self.sender, self.intent, self.body,
+                self.subject,
+                )
+
+        self.assertEqual(0, notifications.Notification.all().count())
+        self.assertEqual(0, len(self.taskq.GetTasks('default')))
+
     def test_send_mail_task_fails_permanent_and_marks_entities_if_cap_hit(self):
         over_cap = notifications._RECOVERABLE_FAILURE_CAP + 1
         notification_key, payload_key = db.put(
@@ -17,9 +17,13 @@
 
 __author__ = 'Sean Lip'
 
+import random
+
 from controllers import sites
 from models import courses
 from models import transforms
+from models import review as models_review
+from modules.review import review
 from tests.functional import actions
 
 
@@ -585,6 +589,75 @@ class PeerReviewControllerTest(actions.TestBase):
         # Student 1 logs out.
         actions.logout()
 
+    def test_new_review_assigned_from_pool(self):
+        """Test the review request handler assigns from a candidate pool."""
+
+        class RecordingRandom(object):
+
+            def __init__(self):
+                self.calls = []
+
+            def choice(self, items):
+                self.calls.append('choice')
+                return random.choice(items)
+
+            def shuffle(self, items):
+                self.calls.append('shuffle')
+                random.shuffle(items)
+
+        recording_random = RecordingRandom()
+        self.swap(review, 'random', recording_random)
+
+        # Students 1 and 2 submit the assignment.
+        for index in (1, 2):
+            actions.login('student%s@google.com' % index)
+            actions.register(self, 'Student %s' % index)
+            submission = transforms.dumps([
+                {'index': 0, 'type': 'regex', 'value': 'S%s-1' % index,
+                 'correct': True},
+                {'index': 1, 'type': 'choices', 'value': 3, 'correct': False},
+                {'index': 2, 'type': 'regex', 'value': 'not-S3',
+                 'correct': True},
+            ])
+            actions.submit_assessment(
+                self, LEGACY_REVIEW_UNIT_ID, {
+                    'answers': submission,
+                    'assessment_type': LEGACY_REVIEW_UNIT_ID})
+            actions.logout()
+
+        # Student 3 submits the assignment and requests a review. With the
+        # pool enabled, it is assigned from the candidate pool.
+        actions.login('student3@google.com')
+        actions.register(self, 'Student 3')
+        submission = transforms.dumps([
+            {'index': 0, 'type': 'regex', 'value': 'S3-1', 'correct': True},
+            {'index': 1, 'type': 'choices', 'value': 3, 'correct': False},
+            {'index': 2, 'type': 'regex', 'value': 'is-S3', 'correct': True},
+        ])
+        actions.submit_assessment(
+            self, LEGACY_REVIEW_UNIT_ID, {
+                'answers': submission,
+                'assessment_type': LEGACY_REVIEW_UNIT_ID})
+
+        with actions.OverriddenConfig(
+                models_review.CAN_ASSIGN_REVIEWS_FROM_POOL.name, True):
+            response = actions.request_new_review(self, LEGACY_REVIEW_UNIT_ID)
+        actions.assert_contains('Assignment to review', response.body)
+        actions.assert_contains('not-S3', response.body)
+        self.assertIn('shuffle', recording_random.calls)
+        self.assertNotIn('choice', recording_random.calls)
+
+        # By default, the second review comes from the head of the candidates
+        # query instead.
+        del recording_random.calls[:]
+        response = actions.request_new_review(self, LEGACY_REVIEW_UNIT_ID)
+        actions.assert_contains('Assignment to review', response.body)
+        actions.assert_contains('not-S3', response.body)
+        self.assertIn('choice', recording_random.calls)
+        self.assertNotIn('shuffle', recording_random.calls)
+
+        actions.logout()
+
 
 class PeerReviewDashboardAdminTest(actions.TestBase):
     """Test peer review dashboard from the Admin perspective."""
@@ -19,6 +19,7 @@ __author__ = [
 ]
 
 import datetime
+import itertools
 import random
 
 from models import counters
@@ -681,6 +682,98 @@ class Manager(object):
             COUNTER_GET_NEW_REVIEW_FAILED.inc()
             raise e
 
+    @classmethod
+    def get_new_review_from_pool(
+        cls, unit_id, reviewer_key, pool_size=100, max_retries=5):
+        """Attempts to assign a review to a reviewer under high contention.
+
+        A more scalable alternative to get_new_review(). That method picks
+        randomly from the same small head of the candidates query, so when
+        many reviewers ask for work at once they race for the same few review
+        summaries and most of their transactions fail.
+
+        Here we nontransactionally fetch a larger pool of pool_size candidates
+        and split it into tiers of candidates with the same completed and
+        assigned review counts. Tiers are tried in query order, so a candidate
+        is never attempted before one with fewer completed or assigned
+        reviews. Within a tier the candidates are equally good and are tried
+        in random order, which spreads concurrent reviewers over the whole
+        tier instead of the first few entries of the query.
+
+        Args:
+            unit_id: string. The unit to assign work from.
+            reviewer_key: db.Key of models.models.Student. The reviewer to
+                attempt to assign the review to.
+            pool_size: int. The number of candidates to fetch. Larger pools
+                make write contention less likely, at the cost of 1 +
+                num_results datastore reads.
+            max_retries: int. Number of times to retry failed assignment
+                attempts; see get_new_review().
+
+        Raises:
+            domain.NotAssignableError: if no review can currently be assigned
+                for the given unit_id.
+
+        Returns:
+            db.Key of peer.ReviewStep. The newly created assigned review step.
+        """
+        try:
+            COUNTER_GET_NEW_REVIEW_START.inc()
+            raw_candidates = cls.get_assignment_candidates_query(unit_id).fetch(
+                pool_size)
+            COUNTER_ASSIGNMENT_CANDIDATES_QUERY_RESULTS_RETURNED.inc(
+                increment=len(raw_candidates))
+            candidates = []
+            for tier in cls._get_candidate_tiers(raw_candidates, reviewer_key):
+                cls._shuffle_assignment_candidates(tier)
+                candidates.extend(tier)
+
+            retries = 0
+            for candidate in candidates:
+                if retries >= max_retries:
+                    break
+                assigned_key = cls._attempt_review_assignment(
+                    candidate.key(), reviewer_key, candidate.change_date)
+                if assigned_key:
+                    COUNTER_GET_NEW_REVIEW_SUCCESS.inc()
+                    return assigned_key
+                retries += 1
+
+            COUNTER_GET_NEW_REVIEW_NOT_ASSIGNABLE.inc()
+            raise domain.NotAssignableError(
+                'No reviews assignable for unit %s and reviewer %s' % (
+                    unit_id, repr(reviewer_key)))
+
+        except Exception, e:
+            COUNTER_GET_NEW_REVIEW_FAILED.inc()
+            raise e
+
+    @classmethod
+    def _get_candidate_tiers(cls, candidates, reviewer_key):
+        """Groups candidates with equal completed and assigned counts.
+
+        Args:
+            candidates: [peer.ReviewSummary]. Ordered as returned by
+                cls.get_assignment_candidates_query.
+            reviewer_key: db.Key of models.models.Student. Candidates for this
+                reviewer's own work are dropped.
+
+        Returns:
+            List of lists of peer.ReviewSummary, in query order.
+        """
+        candidates = [
+            candidate for candidate in candidates
+            if candidate.reviewee_key != reviewer_key]
+        return [
+            list(tier) for _, tier in itertools.groupby(
+                candidates, lambda candidate: (
+                    candidate.completed_count, candidate.assigned_count))]
+
+    @classmethod
+    def _shuffle_assignment_candidates(cls, candidates):
+        """Seam that allows different orderings of a candidate tier in tests."""
+        random.shuffle(candidates)
+
     @classmethod
     def _choose_assignment_candidate(cls, candidates):
         """Seam that allows different choice functions in tests."""
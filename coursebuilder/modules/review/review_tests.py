@@ -18,6 +18,7 @@ __author__ = [
     'johncox@google.com (John Cox)',
 ]
 
+import random
 import types
 
 from models import models
@@ -821,6 +822,52 @@ class ManagerTest(actions.TestBase):
 
         self.assertEqual(lower_priority_summary_key, step.review_summary_key)
 
+    def _add_summary(self, reviewee_email, completed_count=0):
+        reviewee_key = models.Student(key_name=reviewee_email).put()
+        submission_key = db.Key.from_path(
+            student_work.Submission.kind(),
+            student_work.Submission.key_name(
+                reviewee_key=reviewee_key, unit_id=self.unit_id))
+        return peer.ReviewSummary(
+            completed_count=completed_count, reviewee_key=reviewee_key,
+            submission_key=submission_key, unit_id=self.unit_id
+        ).put()
+
+    def test_get_new_review_from_pool_keeps_fairness_order(self):
+        unused_completed_summary_key = self._add_summary(
+            'completed@example.com', completed_count=1)
+        first_summary_key = self._add_summary('first@example.com')
+        second_summary_key = self._add_summary('second@example.com')
+
+        # Reverse each tier instead of shuffling it, so the last created
+        # summary among the least reviewed ones is picked first.
+        def reverse(unused_cls, candidates):
+            candidates.reverse()
+
+        fn = types.MethodType(
+            reverse, review_module.Manager(), review_module.Manager)
+        self.swap(
+            review_module.Manager, '_shuffle_assignment_candidates', fn)
+
+        step = db.get(review_module.Manager.get_new_review_from_pool(
+            self.unit_id, self.reviewer_key))
+        self.assertEqual(second_summary_key, step.review_summary_key)
+
+        step = db.get(review_module.Manager.get_new_review_from_pool(
+            self.unit_id, self.reviewer_key))
+        self.assertEqual(first_summary_key, step.review_summary_key)
+
+    def test_get_new_review_from_pool_raises_not_assignable(self):
+        peer.ReviewSummary(
+            reviewee_key=self.reviewer_key, submission_key=self.submission_key,
+            unit_id=self.unit_id
+        ).put()
+
+        self.assertRaises(
+            domain.NotAssignableError,
+            review_module.Manager.get_new_review_from_pool, self.unit_id,
+            self.reviewer_key)
+
     def test_get_review_step_keys_by_returns_list_of_keys(self):
         summary_key = peer.ReviewSummary(
             reviewee_key=self.reviewee_key, submission_key=self.submission_key,
@@ -1353,3 +1400,77 @@ class ManagerTest(actions.TestBase):
         self.assertEqual(domain.REVIEW_STATE_ASSIGNED, step2.state)
         self.assertEqual(step2.review_key, updated_review.key())
         self.assertEqual('contents2', updated_review.contents)
+
+
+class AssignmentContentionTest(actions.TestBase):
+    """Compares review assignment strategies when many reviewers collide.
+
+    All reviewers in a burst see the candidates as they were before any of
+    them was assigned, as happens when many students ask for a review at the
+    same time before a deadline.
+    """
+
+    # More reviewers than get_new_review's default candidate_count of 20.
+    SUBMISSIONS = 60
+    REVIEWERS = 30
+
+    def setUp(self):
+        super(AssignmentContentionTest, self).setUp()
+        reviewee_keys = [
+            models.Student(key_name='reviewee%s@example.com' % index).put()
+            for index in xrange(self.SUBMISSIONS)]
+        # Each strategy assigns reviews for its own unit.
+        for unit_id in ('head', 'pool'):
+            db.put([
+                peer.ReviewSummary(
+                    reviewee_key=reviewee_key, unit_id=unit_id,
+                    submission_key=db.Key.from_path(
+                        student_work.Submission.kind(),
+                        student_work.Submission.key_name(
+                            reviewee_key=reviewee_key, unit_id=unit_id)))
+                for reviewee_key in reviewee_keys])
+        self.reviewer_keys = [
+            models.Student(key_name='reviewer%s@example.com' % index).put()
+            for index in xrange(self.REVIEWERS)]
+
+    def _run_burst(self, unit_id, assign_fn):
+        stale_candidates = (
+            review_module.Manager.get_assignment_candidates_query(
+                unit_id).fetch(self.SUBMISSIONS))
+
+        class StaleQuery(object):
+
+            def fetch(self, limit):
+                return stale_candidates[:limit]
+
+        def get_stale_query(unused_cls, unused_unit_id):
+            return StaleQuery()
+
+        fn = types.MethodType(
+            get_stale_query, review_module.Manager(), review_module.Manager)
+        self.swap(
+            review_module.Manager, 'get_assignment_candidates_query', fn)
+
+        conflicts_before = (
+            review_module.COUNTER_GET_NEW_REVIEW_SUMMARY_CHANGED.value)
+        assigned = 0
+        for reviewer_key in self.reviewer_keys:
+            try:
+                assign_fn(unit_id, reviewer_key)
+                assigned += 1
+            except domain.NotAssignableError:
+                pass
+        conflicts = (
+            review_module.COUNTER_GET_NEW_REVIEW_SUMMARY_CHANGED.value -
+            conflicts_before)
+        return assigned, conflicts
+
+    def test_candidate_pool_reduces_contention(self):
+        random.seed(0)
+        head_assigned, head_conflicts = self._run_burst(
+            'head', review_module.Manager.get_new_review)
+        pool_assigned, pool_conflicts = self._run_burst(
+            'pool', review_module.Manager.get_new_review_from_pool)
+
+        self.assertGreater(pool_assigned, head_assigned)
+        self.assertLess(pool_conflicts, head_conflicts)
@@ -74,6 +74,9 @@ GCB_SEARCH_FOLDER_NAME = os.path.normpath('/modules/search/')
 
 MAX_RETRIES = 5
 
+# Number of documents sent to the index in each put() call.
+MAX_DOCS_PER_PUT = search.MAXIMUM_DOCUMENTS_PER_PUT_REQUEST
+
 # Name of a per-course setting determining whether automatic indexing is enabled
 AUTO_INDEX_SETTING = 'auto_index'
 
@@ -91,17 +94,60 @@ def get_index(namespace, locale):
     return search.Index(name=INDEX_NAME % locale, namespace=namespace)
 
 
+def _put_docs(index, docs, timestamps, doc_types):
+    """Add a batch of documents to the index, retrying transient failures.
+
+    Args:
+        index: search.Index. the index to add the documents to.
+        docs: list of search.Document. at most MAX_DOCS_PER_PUT documents.
+        timestamps: dict. updated with the date of each indexed document.
+        doc_types: dict. updated with the type of each indexed document.
+    Returns:
+        The number of documents that could not be added to the index.
+    """
+    num_failed_docs = 0
+    retry_count = 0
+    while docs:
+        try:
+            results = index.put(docs)
+        except search.PutError, e:
+            results = e.results
+        retry_docs = []
+        for doc, result in zip(docs, results):
+            if result.code == search.OperationResult.OK:
+                timestamps[doc.doc_id] = doc['date'][0].value
+                doc_types[doc.doc_id] = doc['type'][0].value
+            elif result.code == search.OperationResult.TRANSIENT_ERROR:
+                retry_docs.append(doc)
+            else:
+                logging.error('Failed to index doc_id: %s', doc.doc_id)
+                num_failed_docs += 1
+        retry_count += 1
+        if retry_docs and retry_count >= MAX_RETRIES:
+            for doc in retry_docs:
+                logging.error(
+                    'Multiple transient errors indexing doc_id: %s', doc.doc_id)
+            num_failed_docs += len(retry_docs)
+            break
+        docs = retry_docs
+    return num_failed_docs
+
+
 def index_all_docs(course, incremental):
     """Index all of the docs for a given models.Course object.
 
+    Documents are sent to the index in batches of MAX_DOCS_PER_PUT.
+
     Args:
         course: models.courses.Course. the course to index.
         incremental: boolean. whether or not to index only new or out-of-date
             items.
     Returns:
-        A dict with three keys.
+        A dict with four keys.
         'num_indexed_docs' maps to an int, the number of documents added to the
             index.
+        'num_failed_docs' maps to an int, the number of documents that could
+            not be added to the index.
         'doc_type' maps to a counter with resource types as keys mapping to the
             number of that resource added to the index.
         'indexing_time_secs' maps to a float representing the number of seconds
@@ -119,29 +165,21 @@ def index_all_docs(course, incremental):
         course.app_context.get_current_locale())
     timestamps, doc_types = (_get_index_metadata(index) if incremental
                              else ({}, {}))
+    num_failed_docs = 0
+    batch = []
     for doc in resources.generate_all_documents(course, timestamps):
-        retry_count = 0
-        while retry_count < MAX_RETRIES:
-            try:
-                index.put(doc)
-                timestamps[doc.doc_id] = doc['date'][0].value
-                doc_types[doc.doc_id] = doc['type'][0].value
-                break
-            except search.Error, e:
-                if e.results[0].code == search.OperationResult.TRANSIENT_ERROR:
-                    retry_count += 1
-                    if retry_count >= MAX_RETRIES:
-                        logging.error(
-                            'Multiple transient errors indexing doc_id: %s',
-                            doc.doc_id)
-                else:
-                    logging.error('Failed to index doc_id: %s', doc.doc_id)
-                    break
+        batch.append(doc)
+        if len(batch) >= MAX_DOCS_PER_PUT:
+            num_failed_docs += _put_docs(index, batch, timestamps, doc_types)
+            batch = []
+    if batch:
+        num_failed_docs += _put_docs(index, batch, timestamps, doc_types)
 
     indexed_doc_types = collections.Counter()
     for type_name in doc_types.values():
         indexed_doc_types[type_name] += 1
     return {'num_indexed_docs': len(timestamps),
+            'num_failed_docs': num_failed_docs,
             'doc_types': indexed_doc_types,
             'indexing_time_secs': time.time() - start_time}
 
@@ -474,6 +512,7 @@ class IndexCourse(jobs.DurableJob):
         indexing_stats = {
             'deleted_docs': 0,
             'num_indexed_docs': 0,
+            'num_failed_docs': 0,
             'doc_types': collections.Counter(),
             'indexing_time_secs': 0,
             'locales': []
@@ -486,6 +525,7 @@ class IndexCourse(jobs.DurableJob):
             course = courses.Course(None, app_context=app_context)
             stats = index_all_docs(course, self.incremental)
             indexing_stats['num_indexed_docs'] += stats['num_indexed_docs']
+            indexing_stats['num_failed_docs'] += stats['num_failed_docs']
             indexing_stats['doc_types'] += stats['doc_types']
             indexing_stats['indexing_time_secs'] += stats['indexing_time_secs']
             indexing_stats['locales'].append(locale)
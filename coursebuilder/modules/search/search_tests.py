@@ -432,6 +432,48 @@ class SearchTest(search_unit_tests.SearchTestBase):
             self.assertIn('page about French dogs', _text(snippets[0]))
             self.assertIn('lesson about French dogs', _text(snippets[1]))
 
+    def test_index_all_docs_in_batches(self):
+        context = actions.simple_add_course('test', 'admin@google.com',
+                                            'Test Course')
+        course = courses.Course(None, context)
+        unit = course.add_unit()
+        unit.availability = courses.AVAILABILITY_AVAILABLE
+        for index in range(5):
+            lesson = course.add_lesson(unit)
+            lesson.objectives = 'Lesson number %s' % index
+            lesson.availability = courses.AVAILABILITY_AVAILABLE
+        course.update_unit(unit)
+        course.save()
+
+        batch_sizes = []
+        failed_doc_ids = []
+        real_put = search.search.Index.put
+
+        def put(index, docs):
+            # Reject the first document of the first batch.
+            batch_sizes.append(len(docs))
+            if failed_doc_ids:
+                return real_put(index, docs)
+            failed_doc_ids.append(docs[0].doc_id)
+            results = [search.search.PutResult(
+                code=search.search.OperationResult.INVALID_REQUEST,
+                id=docs[0].doc_id)]
+            results.extend(real_put(index, docs[1:]))
+            raise search.search.PutError('Invalid document', results)
+
+        self.swap(search, 'MAX_DOCS_PER_PUT', 2)
+        self.swap(search.search.Index, 'put', put)
+        self.swap(logging, 'error', self.error_report)
+        with common_utils.Namespace('ns_test'):
+            stats = search.index_all_docs(
+                courses.Course(None, context), False)
+
+        self.assertGreater(len(batch_sizes), 2)
+        self.assertTrue(all(size <= 2 for size in batch_sizes))
+        self.assertEqual(1, stats['num_failed_docs'])
+        self.assertEqual(sum(batch_sizes) - 1, stats['num_indexed_docs'])
+        self.assertIn(failed_doc_ids[0], self.logged_error)
+
     def test_cron(self):
         app_context = sites.get_all_courses()[0]
         app_context.set_current_locale('en_US')
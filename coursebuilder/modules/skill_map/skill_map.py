@@ -16,11 +16,13 @@
 
 __author__ = 'John Orr (jorr@google.com)'
 
+import copy
 import json
 import jinja2
 import logging
 import os
 import random
+import threading
 import time
 
 from collections import defaultdict
@@ -32,6 +34,7 @@ from common import resource
 from common import safe_dom
 from common import schema_fields
 from common import tags
+from common import utils as common_utils
 from controllers import sites
 from controllers import utils
 from mapreduce import context
@@ -79,6 +82,15 @@ MODULE_TITLE = 'Skills'
 # Flag turning faker on
 _USE_FAKE_DATA_IN_SKILL_COMPETENCY_ANALYTICS = False
 
+# Memcache key, in the course namespace, of a token that changes whenever the
+# skills or questions of the course change. The token expires, so that writes
+# bypassing the DAOs are eventually picked up too.
+_SKILL_MAP_VERSION_KEY = 'skill_map:version'
+_SKILL_MAP_VERSION_TTL_SEC = 60 * 60
+
+# Number of courses whose skills and questions are kept in process.
+_SKILL_MAP_CACHE_MAX_COURSES = 100
+
 def _assert(condition, message, errors, target_field):
     """Assert a condition and either log exceptions or raise AssertionError."""
     if not condition:
@@ -178,6 +190,13 @@ def _translate_skill(skills_generator):
     i18n_dashboard.translate_dto_list(course, skills, key_list)
 
 
+def _bump_skill_map_version(unused_dtos=None):
+    """Invalidates skills and questions of this course cached in processes."""
+    models.MemcacheManager.set(
+        _SKILL_MAP_VERSION_KEY, common_utils.generate_instance_id(),
+        ttl=_SKILL_MAP_VERSION_TTL_SEC)
+
+
 class _SkillDao(models.LastModfiedJsonDao):
     DTO = Skill
     ENTITY = _SkillEntity
@@ -186,7 +205,81 @@ class _SkillDao(models.LastModfiedJsonDao):
     # than overriding all the load/store methods, and is also proof against
     # future changes that extend the DAO API.
     POST_LOAD_HOOKS = [_translate_skill]
-    POST_SAVE_HOOKS = [_on_skills_changed]
+    POST_SAVE_HOOKS = [_on_skills_changed, _bump_skill_map_version]
+    POST_DELETE_HOOKS = [_bump_skill_map_version]
+
+
+class _SkillMapDataCache(caching.ProcessScopedSingleton):
+    """Skills and questions of recently used courses, shared by requests.
+
+    Entries are keyed by course namespace and are tagged with the version
+    token the course had in memcache when they were loaded. Any process that
+    saves or deletes a skill or a question replaces the token, so other
+    processes notice the change with a single memcache read and reload.
+    Lessons are not cached here; they are read from the course each time.
+    """
+
+    def __init__(self):
+        self._entries = caching.LRUCache(
+            max_item_count=_SKILL_MAP_CACHE_MAX_COURSES)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def _get_version(cls):
+        """Gets the version token of the current course, creating it if none.
+
+        Returns:
+            The token, or None if memcache is not available to share it.
+        """
+        if not models.CAN_USE_MEMCACHE.value:
+            return None
+        version = models.MemcacheManager.get(_SKILL_MAP_VERSION_KEY)
+        if version is None:
+            _bump_skill_map_version()
+            version = models.MemcacheManager.get(_SKILL_MAP_VERSION_KEY)
+        return version
+
+    @classmethod
+    def _load(cls):
+        skills = _SkillDao.get_all_mapped()
+        questions_by_skill = {}
+        for question in models.QuestionDAO.get_all():
+            skill_ids = question.dict.get(constants.SKILLS_KEY, [])
+            for skill_id in skill_ids:
+                questions_by_skill.setdefault(skill_id, []).append(question)
+        return skills, questions_by_skill
+
+    def get(self):
+        """Gets skills and questions of the current course.
+
+        Returns:
+            A pair of a dict mapping skill id to Skill and a dict mapping
+            skill id to a list of QuestionDTO. Both may be shared with other
+            requests and must not be modified.
+        """
+        # Translated skills and questions depend on translations, which are
+        # not covered by the version token, so they are never cached.
+        version = None
+        if not i18n_dashboard.is_translation_required():
+            version = self._get_version()
+        if version is None:
+            return self._load()
+
+        # LRUCache rejects empty keys, and the default course has an empty
+        # namespace name.
+        key = ('skill_map', namespace_manager.get_namespace())
+        with self._lock:
+            found, entry = self._entries.get(key)
+        if found and entry[0] == version:
+            return entry[1], entry[2]
+
+        # The version was read before loading, so a change made while loading
+        # leaves the entry tagged with an old version rather than newer data
+        # tagged with the current one.
+        skills, questions_by_skill = self._load()
+        with self._lock:
+            self._entries.put(key, (version, skills, questions_by_skill))
+        return skills, questions_by_skill
 
 
 class ResourceSkill(resource.AbstractResourceHandler):
@@ -273,8 +366,11 @@ class SkillGraph(caching.RequestScopedSingleton):
     """Facade to handle the CRUD lifecycle of the skill dependency graph."""
 
     def __init__(self):
-        # dict mapping skill id to skill
-        self._skills = _SkillDao.get_all_mapped()
+        # dict mapping skill id to skill; copied as the graph modifies them
+        skills, _ = _SkillMapDataCache.instance().get()
+        self._skills = dict(
+            (skill_id, Skill(skill_id, copy.deepcopy(skill.dict)))
+            for skill_id, skill in skills.iteritems())
         # dict mapping skill id to list of successor SkillDTO's
         self._successors = None
         self._rebuild()
@@ -716,6 +812,43 @@ class SkillMapError(Exception):
     pass
 
 
+def _topo_sort_successors(successors):
+    """Sorts a graph of skills into topological co-sets.
+
+    The first co-set holds the skills with no prerequisites; each following
+    co-set holds the skills whose prerequisites are all in earlier co-sets.
+    Prerequisite counts are decremented as co-sets are emitted, so every skill
+    and every edge is visited once.
+
+    Args:
+        successors: dict mapping every skill id to the set of ids of the
+            skills which have it as a prerequisite.
+
+    Returns:
+        A list of sets of skill ids, or None if the graph has a cycle.
+    """
+    in_degree = dict.fromkeys(successors, 0)
+    for dst in successors.itervalues():
+        for x in dst:
+            in_degree[x] += 1
+    ret = []
+    visited = 0
+    co_set = set(x for x, degree in in_degree.iteritems() if not degree)
+    while co_set:
+        ret.append(co_set)
+        visited += len(co_set)
+        next_co_set = set()
+        for src in co_set:
+            for dst in successors[src]:
+                in_degree[dst] -= 1
+                if not in_degree[dst]:
+                    next_co_set.add(dst)
+        co_set = next_co_set
+    if visited < len(successors):  # Unvisited nodes -> there is a cycle.
+        return None
+    return ret
+
+
 class SkillMap(caching.RequestScopedSingleton):
     """Provides API to access the course skill map."""
 
@@ -735,12 +868,10 @@ class SkillMap(caching.RequestScopedSingleton):
             for skill_id in skill_ids:
                 self._lessons_by_skill.setdefault(skill_id, []).append(lesson)
 
-        self._questions_by_skill = {}
-        for question in models.QuestionDAO.get_all():
-            skill_ids = question.dict.get(constants.SKILLS_KEY, [])
-            for skill_id in skill_ids:
-                self._questions_by_skill.setdefault(skill_id, []).append(
-                    question)
+        _, questions_by_skill = _SkillMapDataCache.instance().get()
+        self._questions_by_skill = dict(
+            (skill_id, list(questions))
+            for skill_id, questions in questions_by_skill.iteritems())
 
         self._skill_infos = {}
 
@@ -782,35 +913,16 @@ class SkillMap(caching.RequestScopedSingleton):
 
     def _topo_sort(self):
         """Returns topologically sorted co-sets."""
-        successors = self.build_successors()
-        ret = []
-        if not successors:
-            return ret
-        co_set = set(
-            successors.keys()) - reduce(
-            set.union, successors.values())  # Skills with no prerequisites.
-        while True:
-            if not co_set:
-                break
-            ret.append(co_set)
-            for x in co_set:
-                del successors[x]
-            for src, dst in successors.items():
-                successors[src] = dst - co_set
-            co_set = set(successors.keys()) - reduce(
-                set.union, successors.values(), set())
-        if successors:  # There is unvisited nodes -> there is a cycle.
-            return None
-        else:
-            return ret
+        return _topo_sort_successors(self.build_successors())
 
     def _set_topological_sort_index(self):
-        chain = []
-        for x in self._topo_sort():
-            chain.extend(list(x))
+        topo_sort_index = {}
+        for co_set in self._topo_sort():
+            for x in co_set:
+                topo_sort_index[x] = len(topo_sort_index)
         for skill in self._skill_graph.skills:
             self._skill_infos[skill.id].set_topo_sort_index(
-                chain.index(skill.id))
+                topo_sort_index[skill.id])
 
     def personalized(self):
         return self._user_id is not None
@@ -1034,9 +1146,18 @@ class SkillMap(caching.RequestScopedSingleton):
         # pylint: disable=protected-access
         if not self._questions_by_skill.get(skill.id):
             return
-        for question in self._questions_by_skill[skill.id]:
+        # Reload the questions, as the ones held here may be shared with
+        # other requests.
+        questions = models.QuestionDAO.bulk_load(
+            [question.id for question in self._questions_by_skill[skill.id]])
+        questions = [
+            question for question in questions
+            if question and skill.id in question.dict.get(
+                constants.SKILLS_KEY, [])]
+        for question in questions:
             question.dict[constants.SKILLS_KEY].remove(skill.id)
-        assert models.QuestionDAO.save_all(self._questions_by_skill[skill.id])
+        if questions:
+            assert models.QuestionDAO.save_all(questions)
         del self._questions_by_skill[skill.id]
         skill._questions = []
         # pylint: enable=protected-access
@@ -2071,6 +2192,9 @@ def notify_module_enabled():
     progress.UnitLessonCompletionTracker.POST_UPDATE_PROGRESS_HOOK.append(
         post_update_progress)
 
+    models.QuestionDAO.POST_SAVE_HOOKS.append(_bump_skill_map_version)
+    models.QuestionDAO.POST_DELETE_HOOKS.append(_bump_skill_map_version)
+
     data_sources.Registry.register(SkillMapDataSource)
 
     data_sources.Registry.register(SkillCompetencyDataSource)
@@ -17,10 +17,13 @@
 __author__ = 'John Orr (jorr@google.com)'
 
 import cgi
+import copy
 import json
 import cStringIO
+import random
 import StringIO
 import time
+import unittest
 import urllib
 import zipfile
 
@@ -28,6 +31,8 @@ from babel.messages import pofile
 from networkx import DiGraph
 from xml.etree import cElementTree
 
+import appengine_config
+from common import caching
 from common import crypto
 from common import resource
 from common import users
@@ -39,6 +44,7 @@ from models import transforms
 from models.progress import UnitLessonCompletionTracker
 from modules.i18n_dashboard import i18n_dashboard
 from modules.skill_map import competency
+from modules.skill_map import skill_map as skill_map_module
 from modules.skill_map.constants import SKILLS_KEY
 from modules.skill_map.skill_map import CountSkillCompletion
 from modules.skill_map.skill_map import ResourceSkill
@@ -49,6 +55,7 @@ from modules.skill_map.skill_map import SkillMap
 from modules.skill_map.skill_map import SkillRestHandler
 from modules.skill_map.skill_map import SkillCompletionAggregate
 from modules.skill_map.skill_map import _SkillDao
+from modules.skill_map.skill_map import _SkillMapDataCache
 from modules.skill_map.skill_map import SkillCompletionTracker
 from modules.skill_map.skill_map import SkillMapDataSource
 from modules.skill_map.skill_map_metrics import SkillMapMetrics
@@ -455,6 +462,84 @@ class SkillMapTests(BaseSkillMapTests):
         skill_map_3 = SkillMap.load(self.course)
         self.assertEqual(skill_map_2, skill_map_3)
 
+    def _count_skill_map_data_loads(self):
+        cache = _SkillMapDataCache.instance()
+        loads = []
+        original_load = cache._load  # pylint: disable=protected-access
+
+        def counting_load():
+            loads.append(namespace_manager.get_namespace())
+            return original_load()
+
+        self.swap(cache, '_load', counting_load)
+        return loads
+
+    def _new_request(self):
+        caching.RequestScopedSingleton.clear_all()
+
+    def test_skill_map_data_cached_across_requests(self):
+        self._build_sample_graph()
+        self._create_mc_question('question')
+        with actions.OverriddenConfig(models.CAN_USE_MEMCACHE.name, True):
+            loads = self._count_skill_map_data_loads()
+            self._new_request()
+            self.assertEqual(6, len(SkillMap.load(self.course).skills()))
+            self.assertEqual(1, len(loads))
+
+            self._new_request()
+            self.assertEqual(6, len(SkillMap.load(self.course).skills()))
+            self.assertEqual(1, len(loads))
+
+    def test_skill_map_data_cached_in_default_namespace(self):
+        # The stock 'course:/:/' course lives in the default namespace,
+        # whose name is empty.
+        namespace_manager.set_namespace(
+            appengine_config.DEFAULT_NAMESPACE_NAME)
+        try:
+            SkillGraph.load().add(Skill.build(SKILL_NAME, SKILL_DESC))
+            with actions.OverriddenConfig(models.CAN_USE_MEMCACHE.name, True):
+                loads = self._count_skill_map_data_loads()
+                self._new_request()
+                self.assertEqual(1, len(SkillGraph.load().skills))
+                self._new_request()
+                self.assertEqual(1, len(SkillGraph.load().skills))
+                self.assertEqual(1, len(loads))
+        finally:
+            namespace_manager.set_namespace('ns_%s' % COURSE_NAME)
+
+    def test_skill_map_data_reloaded_after_skill_or_question_change(self):
+        self._build_sample_graph()
+        with actions.OverriddenConfig(models.CAN_USE_MEMCACHE.name, True):
+            loads = self._count_skill_map_data_loads()
+            self._new_request()
+            SkillMap.load(self.course)
+            self.assertEqual(1, len(loads))
+
+            # saving a skill invalidates the cached data
+            self._new_request()
+            SkillGraph.load().add(Skill.build(SKILL_NAME, SKILL_DESC))
+            self._new_request()
+            self.assertEqual(7, len(SkillMap.load(self.course).skills()))
+            self.assertEqual(2, len(loads))
+
+            # so does saving a question tagged with a skill
+            question = self._create_mc_question('question')
+            question.dict[SKILLS_KEY] = [self.sa.id]
+            models.QuestionDAO.save(question)
+            self._new_request()
+            skill_map = SkillMap.load(self.course)
+            self.assertEqual(3, len(loads))
+            self.assertEqual(
+                [question.id],
+                [q.id for q in skill_map.get_questions_for_skill(self.sa)])
+
+            # and deleting it
+            models.QuestionDAO.delete(question)
+            self._new_request()
+            skill_map = SkillMap.load(self.course)
+            self.assertEqual(4, len(loads))
+            self.assertEqual([], skill_map.get_questions_for_skill(self.sa))
+
     def test_personalized_skill_map_w_measures(self):
         """Test that measures are loaded for personalized skill maps."""
 
@@ -2546,3 +2631,78 @@ class EventListenerTests(BaseSkillMapTests):
         measure = competency.SuccessRateCompetencyMeasure.load(
             self.user.user_id(), self.sb.id)
         self.assertEqual(0.0, measure.score)
+
+
+def _reference_topo_sort(successors):
+    """The original quadratic implementation of SkillMap._topo_sort."""
+    ret = []
+    if not successors:
+        return ret
+    co_set = set(
+        successors.keys()) - reduce(
+        set.union, successors.values())  # Skills with no prerequisites.
+    while True:
+        if not co_set:
+            break
+        ret.append(co_set)
+        for x in co_set:
+            del successors[x]
+        for src, dst in successors.items():
+            successors[src] = dst - co_set
+        co_set = set(successors.keys()) - reduce(
+            set.union, successors.values(), set())
+    if successors:  # There is unvisited nodes -> there is a cycle.
+        return None
+    else:
+        return ret
+
+
+def _make_random_successors(rng, num_skills, window):
+    """Builds a random DAG in the format of SkillMap.build_successors().
+
+    Skill ids are random large integers, as assigned by the datastore. Each
+    skill gets up to three prerequisites among the preceding skills, which
+    are picked from the last 'window' ones so that the graph gets deeper as
+    the window shrinks.
+    """
+    ids = rng.sample(xrange(1, 2 ** 52), num_skills)
+    successors = dict((skill_id, set()) for skill_id in ids)
+    for index in xrange(1, num_skills):
+        for _ in xrange(rng.randint(0, 3)):
+            prerequisite = rng.randint(max(0, index - window), index - 1)
+            successors[ids[prerequisite]].add(ids[index])
+    return successors
+
+
+class TopoSortTests(unittest.TestCase):
+    """Checks the topological sort against the original implementation."""
+
+    NUM_GRAPHS = 200
+
+    def _assert_same_as_reference(self, successors):
+        # pylint: disable=protected-access
+        expected = _reference_topo_sort(copy.deepcopy(successors))
+        self.assertEqual(
+            expected, skill_map_module._topo_sort_successors(successors))
+
+    def test_random_dags(self):
+        rng = random.Random(4)
+        for _ in xrange(self.NUM_GRAPHS):
+            successors = _make_random_successors(
+                rng, rng.randint(0, 40), rng.randint(1, 40))
+            self._assert_same_as_reference(successors)
+
+    def test_random_graphs_with_cycles(self):
+        rng = random.Random(5)
+        for _ in xrange(self.NUM_GRAPHS):
+            successors = _make_random_successors(
+                rng, rng.randint(1, 40), rng.randint(1, 40))
+            src = rng.choice(successors.keys())
+            dst = rng.choice(successors.keys())
+            successors[src].add(dst)
+            successors[dst].add(src)
+            self._assert_same_as_reference(successors)
+            self.assertIsNone(
+                # pylint: disable=protected-access
+                skill_map_module._topo_sort_successors(successors))
+
@@ -51,12 +51,13 @@ ALL_TEST_CLASSES = {
     'tests.functional.admin_settings.HtmlHookTest': 17,
     'tests.functional.admin_settings.JinjaContextTest': 2,
     'tests.functional.admin_settings.WelcomePageTests': 2,
-    'tests.functional.assets_rest.AssetsRestTest': 13,
+    'tests.functional.assets_rest.AssetsRestTest': 14,
     'tests.functional.common_crypto.EncryptionManagerTests': 5,
     'tests.functional.common_crypto.XsrfTokenManagerTests': 3,
     'tests.functional.common_crypto.PiiObfuscationHmac': 2,
     'tests.functional.common_crypto.GenCryptoKeyFromHmac': 2,
     'tests.functional.common_crypto.GetExternalUserIdTests': 4,
+    'tests.functional.common_jinja_utils.GcbTagsFilterTimerTest': 1,
     'tests.functional.common_users.AppEnginePassthroughUsersServiceTest': 10,
     'tests.functional.common_users.AuthInterceptorAndRequestHooksTest': 2,
     'tests.functional.common_users.PublicExceptionsAndClassesIdentityTests': 2,
@@ -70,6 +71,7 @@ ALL_TEST_CLASSES = {
     'tests.functional.model_analytics.QuestionAnalyticsTest': 3,
     'tests.functional.model_config.ValueLoadingTests': 2,
     'tests.functional.model_courses.CourseCachingTest': 5,
+    'tests.functional.model_courses.CourseEnvironTest': 4,
     'tests.functional.model_courses.PermissionsTest': 4,
     'tests.functional.model_data_sources.PaginatedTableTest': 17,
     'tests.functional.model_data_sources.PiiExportTest': 4,
@@ -80,7 +82,7 @@ ALL_TEST_CLASSES = {
     'tests.functional.model_models.BaseJsonDaoTestCase': 1,
     'tests.functional.model_models.ContentChunkTestCase': 16,
     'tests.functional.model_models.EventEntityTestCase': 1,
-    'tests.functional.model_models.MemcacheManagerTestCase': 4,
+    'tests.functional.model_models.MemcacheManagerTestCase': 7,
     'tests.functional.model_models.PersonalProfileTestCase': 1,
     'tests.functional.model_models.QuestionDAOTestCase': 3,
     'tests.functional.model_models.StudentAnswersEntityTestCase': 1,
@@ -95,19 +97,22 @@ ALL_TEST_CLASSES = {
     'tests.functional.model_student_work.SubmissionTest': 3,
     'tests.functional.model_utils.QueryMapperTest': 4,
     'tests.functional.model_vfs.VfsLargeFileSupportTest': 6,
+    'tests.functional.model_vfs.VfsJinjaEnvironmentPoolTest': 3,
+    'tests.functional.model_vfs.VfsListingTest': 3,
     'tests.functional.module_config_test.ManipulateAppYamlFileTest': 8,
     'tests.functional.module_config_test.ModuleIncorporationTest': 12,
     'tests.functional.module_config_test.ModuleManifestTest': 7,
     'tests.functional.modules_data_source_providers.CourseElementsTest': 11,
     'tests.functional.modules_data_source_providers.StudentScoresTest': 6,
     'tests.functional.modules_data_source_providers.StudentsTest': 5,
-    'tests.functional.progress_percent.ProgressPercent': 4,
+    'tests.functional.progress_percent.ProgressPercent': 8,
+    'tests.functional.progress_percent.ProgressRecordingTest': 2,
     'tests.functional.student_answers.StudentAnswersAnalyticsTest': 1,
     'tests.functional.student_labels.StudentLabelsTest': 32,
     'tests.functional.student_last_location.NonRootCourse': 9,
     'tests.functional.student_last_location.RootCourse': 3,
     'tests.functional.student_tracks.StudentTracksTest': 10,
-    'tests.functional.roles.RolesTest': 24,
+    'tests.functional.roles.RolesTest': 26,
     'tests.functional.test_classes.ActivityTest': 1,
     'tests.functional.test_classes.AdminAspectTest': 10,
     'tests.functional.test_classes.AssessmentPolicyTests': 6,
@@ -118,13 +123,13 @@ ALL_TEST_CLASSES = {
     'tests.functional.test_classes.CourseUrlRewritingTest': 47,
     'tests.functional.test_classes.DatastoreBackedCustomCourseTest': 6,
     'tests.functional.test_classes.DatastoreBackedSampleCourseTest': 47,
-    'tests.functional.test_classes.EtlMainTestCase': 46,
+    'tests.functional.test_classes.EtlMainTestCase': 47,
     'tests.functional.test_classes.EtlTranslationRoundTripTest': 1,
     'tests.functional.test_classes.ExtensionSwitcherTests': 2,
     'tests.functional.test_classes.InfrastructureTest': 21,
     'tests.functional.test_classes.I18NTest': 2,
     'tests.functional.test_classes.LegacyEMailAsKeyNameTest': 47,
-    'tests.functional.test_classes.LessonComponentsTest': 3,
+    'tests.functional.test_classes.LessonComponentsTest': 4,
     'tests.functional.test_classes.MemcacheTest': 68,
     'tests.functional.test_classes.MultipleCoursesTest': 1,
     'tests.functional.test_classes.NamespaceTest': 2,
@@ -133,7 +138,7 @@ ALL_TEST_CLASSES = {
     'tests.functional.test_classes.StudentKeyNameTest': 8,
     'tests.functional.test_classes.StudentUnifiedProfileTest': 19,
     'tests.functional.test_classes.TransformsEntitySchema': 1,
-    'tests.functional.test_classes.TransformsJsonFileTestCase': 3,
+    'tests.functional.test_classes.TransformsJsonFileTestCase': 4,
     'tests.functional.test_classes.VirtualFileSystemTest': 47,
     'tests.functional.test_classes.ImportActivityTests': 7,
     'tests.functional.test_classes.ImportAssessmentTests': 3,
@@ -168,14 +173,18 @@ ALL_TEST_CLASSES = {
     'tests.unit.common_tags.CustomTagTests': 13,
     'tests.unit.common_utils.CommonUnitTests': 11,
     'tests.unit.common_utils.ParseTimedeltaTests': 8,
+    'tests.unit.common_utils.ReadOnlyTests': 4,
     'tests.unit.common_utils.ValidateTimedeltaTests': 6,
     'tests.unit.common_utils.ZipAwareOpenTests': 2,
     'tests.unit.javascript_tests.AllJavaScriptTests': 2,
     'tests.unit.models_analytics.AnalyticsTests': 6,
     'tests.unit.models_config.ValidateIntegerRangeTests': 3,
+    'tests.unit.models_counters.PerfTimerTests': 6,
+    'tests.unit.models_courses.CourseModel13LookupTests': 2,
     'tests.unit.models_courses.WorkflowValidationTests': 13,
-    'tests.unit.models_transforms.JsonToDictTests': 13,
+    'tests.unit.models_transforms.JsonDumpsTests': 3,
     'tests.unit.models_transforms.JsonParsingTests': 3,
+    'tests.unit.models_transforms.JsonToDictTests': 13,
     'tests.unit.models_transforms.SchemaValidationTests': 21,
     'tests.unit.models_transforms.StringValueConversionTests': 2,
     'tests.unit.test_classes.DeepDictionaryMergeTest': 5,
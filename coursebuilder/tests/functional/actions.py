@@ -28,6 +28,7 @@ import bs4
 import html5lib
 
 import appengine_config
+from common import caching
 from common import users
 from controllers import sites
 from controllers import utils
@@ -75,6 +76,9 @@ class MockAppContext(object):
     def get_environ(self):
         return self.environ
 
+    def get_environ_readonly(self):
+        return self.environ
+
     def get_namespace_name(self):
         return self.namespace
 
@@ -118,10 +122,12 @@ class OverriddenEnvironment(object):
 
     def __enter__(self):
         courses.Course.get_environ = self._get_environ
+        caching.RequestScopedSingleton.clear_all()
         return self
 
     def __exit__(self, *unused_exception_info):
         courses.Course.get_environ = self._old_get_environ
+        caching.RequestScopedSingleton.clear_all()
         return False
 
 
@@ -244,6 +250,7 @@ class TestBase(suite.AppEngineTestBase):
 
         memcache.flush_all()
         sites.ApplicationContext.clear_per_process_cache()
+        caching.RequestScopedSingleton.clear_all()
 
         self.auto_deploy = sites.ApplicationContext.AUTO_DEPLOY_DEFAULT_COURSE
         sites.ApplicationContext.AUTO_DEPLOY_DEFAULT_COURSE = (
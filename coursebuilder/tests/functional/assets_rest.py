@@ -223,3 +223,40 @@ class AssetsRestTest(actions.TestBase):
         asset_url = '/%s/%s/%s' % (COURSE_NAME, base, name)
         response = self.get(asset_url, expect_errors=True)
         self.assertEquals(404, response.status_int)
+
+    def test_conditional_get(self):
+        base = 'assets/img'
+        name = 'foo.jpg'
+        _post_asset(self, base, name, name, 'xyzzy')
+        asset_url = '/%s/%s/%s' % (COURSE_NAME, base, name)
+
+        response = self.get(asset_url)
+        self.assertEquals(200, response.status_int)
+        self.assertEquals('xyzzy', response.body)
+        etag = response.headers['ETag']
+        last_modified = response.headers['Last-Modified']
+        self.assertTrue(etag)
+        self.assertTrue(last_modified)
+
+        # Validators match; no body is sent.
+        response = self.get(asset_url, headers={'If-None-Match': etag})
+        self.assertEquals(304, response.status_int)
+        self.assertEquals('', response.body)
+        self.assertEquals(etag, response.headers['ETag'])
+        response = self.get(
+            asset_url, headers={'If-Modified-Since': last_modified})
+        self.assertEquals(304, response.status_int)
+        self.assertEquals('', response.body)
+
+        # If-None-Match takes precedence over If-Modified-Since.
+        response = self.get(asset_url, headers={
+            'If-None-Match': '"other"', 'If-Modified-Since': last_modified})
+        self.assertEquals(200, response.status_int)
+        self.assertEquals('xyzzy', response.body)
+
+        # Changed content gets a new ETag.
+        _post_asset(self, base, name, name, 'plugh')
+        response = self.get(asset_url, headers={'If-None-Match': etag})
+        self.assertEquals(200, response.status_int)
+        self.assertEquals('plugh', response.body)
+        self.assertNotEquals(etag, response.headers['ETag'])
@@ -0,0 +1,38 @@
+# Copyright 2026 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS-IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Functional tests for common/jinja_utils.py."""
+
+from common import jinja_utils
+from models import counters
+from tests.functional import actions
+
+
+class GcbTagsFilterTimerTest(actions.TestBase):
+
+    TIMER_NAME = 'gcb-timeandlog-get_gcb_tags_filter'
+
+    def test_timer_is_shared_and_accumulates_across_calls(self):
+        timer = counters.Registry.registered[self.TIMER_NAME]
+        count = timer.count
+
+        self.assertEquals(
+            'one', jinja_utils.get_gcb_tags_filter(None)('one'))
+        self.assertIs(timer, counters.Registry.registered[self.TIMER_NAME])
+        self.assertEquals(count + 1, timer.count)
+
+        self.assertEquals(
+            'two', jinja_utils.get_gcb_tags_filter(None)('two'))
+        self.assertIs(timer, counters.Registry.registered[self.TIMER_NAME])
+        self.assertEquals(count + 2, timer.count)
@@ -187,6 +187,80 @@ class CourseCachingTest(actions.TestBase):
             'Only shard zero should be present in memcache.')
 
 
+class CourseEnvironTest(actions.TestBase):
+
+    COURSE_NAME = 'environ_course'
+    ADMIN_EMAIL = 'admin@foo.com'
+
+    def setUp(self):
+        super(CourseEnvironTest, self).setUp()
+        self.app_context = actions.simple_add_course(
+            self.COURSE_NAME, self.ADMIN_EMAIL, 'Environ Course')
+        self.course = courses.Course(handler=None, app_context=self.app_context)
+
+    def test_readonly_environ_is_shared_and_can_not_be_modified(self):
+        env = courses.Course.get_environ_readonly(self.app_context)
+        self.assertIs(
+            env, courses.Course.get_environ_readonly(self.app_context))
+        self.assertIs(env, self.app_context.get_environ_readonly())
+        self.assertEquals('Environ Course', env['course']['title'])
+
+        with self.assertRaises(TypeError):
+            env['course']['title'] = 'Changed'
+        with self.assertRaises(TypeError):
+            env['course'].update({'title': 'Changed'})
+        with self.assertRaises(TypeError):
+            del env['course']
+        with self.assertRaises(TypeError):
+            env.setdefault('extra_locales', []).append({'locale': 'ru'})
+        self.assertEquals('Environ Course', env['course']['title'])
+        self.assertNotIn('extra_locales', env)
+
+    def test_get_environ_still_returns_a_private_mutable_copy(self):
+        env = courses.Course.get_environ_readonly(self.app_context)
+        mutable = self.app_context.get_environ()
+        self.assertEquals(env, mutable)
+        self.assertIs(dict, type(mutable))
+        self.assertIs(dict, type(mutable['course']))
+
+        mutable['course']['title'] = 'Changed'
+        self.assertEquals('Environ Course', env['course']['title'])
+        self.assertEquals(
+            'Environ Course', self.app_context.get_environ()['course']['title'])
+
+    def test_readonly_environ_is_refreshed_when_settings_are_saved(self):
+        env = courses.Course.get_environ_readonly(self.app_context)
+        settings = self.app_context.get_environ()
+        settings['course']['title'] = 'Renamed Course'
+        self.course.save_settings(settings)
+
+        new_env = courses.Course.get_environ_readonly(self.app_context)
+        self.assertIsNot(env, new_env)
+        self.assertEquals('Renamed Course', new_env['course']['title'])
+        self.assertEquals('Renamed Course', self.app_context.get_title())
+
+    def test_global_handler_sees_settings_changed_elsewhere(self):
+        # An earlier request on this thread leaves the read-only view behind.
+        self.assertEquals('Environ Course', self.app_context.get_title())
+
+        # Another instance renames the course; this process is not told.
+        get_environ = courses.Course.get_environ
+
+        def renamed_get_environ(unused_cls, app_context):
+            env = get_environ(app_context)
+            if app_context.get_namespace_name() == 'ns_%s' % self.COURSE_NAME:
+                env['course']['title'] = 'Renamed Course'
+            return env
+
+        self.swap(
+            courses.Course, 'get_environ', classmethod(renamed_get_environ))
+
+        actions.login(self.ADMIN_EMAIL, is_admin=True)
+        response = self.get('/modules/admin?action=courses')
+        actions.assert_contains('Renamed Course', response.body)
+        actions.assert_does_not_contain('Environ Course', response.body)
+
+
 class PermissionsTest(actions.TestBase):
 
     def setUp(self):
@@ -21,9 +21,11 @@ __author__ = [
 import datetime
 import logging
 
+import appengine_config
 from common import users
 from common import utils as common_utils
 from models import config
+from models import counters
 from models import entities
 from models import models
 from models import services
@@ -31,6 +33,7 @@ from models import transforms
 from modules.notifications import notifications
 from tests.functional import actions
 
+from google.appengine.api import memcache
 from google.appengine.ext import db
 
 
@@ -336,11 +339,15 @@ class PersonalProfileTestCase(actions.ExportTestBase):
 
 class MemcacheManagerTestCase(actions.TestBase):
 
+    GLOBAL_COUNTER_NAME = 'test-global-counter'
+
     def setUp(self):
         super(MemcacheManagerTestCase, self).setUp()
         config.Registry.test_overrides = {models.CAN_USE_MEMCACHE.name: True}
 
     def tearDown(self):
+        counters.Registry.registered.pop(self.GLOBAL_COUNTER_NAME, None)
+        models.GlobalCounterBuffer._clear()
         config.Registry.test_overrides = {}
         super(MemcacheManagerTestCase, self).tearDown()
 
@@ -376,6 +383,51 @@ class MemcacheManagerTestCase(actions.TestBase):
         data = models.MemcacheManager.get_multi(['a', 'b', 'c'])
         self.assertEquals(0, len(data.keys()))
 
+    def _make_global_counter(self):
+        config.Registry.test_overrides[
+            models.CAN_AGGREGATE_COUNTERS.name] = True
+        models.GlobalCounterBuffer._clear()
+        return counters.PerfCounter(
+            self.GLOBAL_COUNTER_NAME, 'A counter for tests.')
+
+    def _get_global_counter_from_memcache(self, counter):
+        return memcache.get(
+            'counter:' + counter.name,
+            namespace=appengine_config.DEFAULT_NAMESPACE_NAME)
+
+    def test_global_counter_increments_are_buffered_until_flush(self):
+        self.swap(models, 'GLOBAL_COUNTER_FLUSH_INTERVAL_SEC', 3600)
+        counter = self._make_global_counter()
+
+        counter.inc()
+        counter.inc(increment=2)
+        self.assertIsNone(self._get_global_counter_from_memcache(counter))
+
+        models.flush_counter_global_values()
+        self.assertEquals(3, self._get_global_counter_from_memcache(counter))
+
+        # Reading the global value includes increments not yet flushed.
+        counter.inc()
+        self.assertEquals(4, counter.global_value)
+
+    def test_global_counter_increments_are_flushed_after_global_route(self):
+        self.swap(models, 'GLOBAL_COUNTER_FLUSH_INTERVAL_SEC', 3600)
+        counter = self._make_global_counter()
+
+        counter.inc(increment=2)
+        self.assertIsNone(self._get_global_counter_from_memcache(counter))
+
+        # A global route, which ApplicationRequestHandler never sees.
+        self.testapp.get('/admin/welcome', expect_errors=True)
+        self.assertEquals(2, self._get_global_counter_from_memcache(counter))
+
+    def test_global_counter_increments_are_flushed_after_interval(self):
+        self.swap(models, 'GLOBAL_COUNTER_FLUSH_INTERVAL_SEC', 0)
+        counter = self._make_global_counter()
+
+        counter.inc(increment=5)
+        self.assertEquals(5, self._get_global_counter_from_memcache(counter))
+
 
 class TestEntity(entities.BaseEntity):
     data = db.TextProperty(indexed=False)
@@ -23,12 +23,15 @@ import random
 import StringIO
 import tempfile
 
+from common import jinja_utils
 from common import utils as common_utils
 from models import vfs
 from models import courses
 from tests.functional import actions
 from tools.etl import etl
 
+from google.appengine.ext import db
+
 LOREM_IPSUM = """
 Lorem ipsum dolor sit amet, consectetur adipiscing elit. Pellentesque nisl
 libero, interdum vel lectus eget, lacinia vestibulum eros. Maecenas posuere
@@ -199,3 +202,92 @@ class VfsLargeFileSupportTest(actions.TestBase):
         # from AppEngine about cross-group transaction having too many
         # entities involved.
         self.course.save()
+
+
+class VfsListingTest(actions.TestBase):
+    """Checks directory listings in a course with many files."""
+
+    NAMESPACE = 'ns_listing'
+    # Just over the 1000 keys a single fetch used to return.
+    NUM_DIRS = 11
+    NUM_FILES_PER_DIR = 100
+
+    def setUp(self):
+        super(VfsListingTest, self).setUp()
+        self.fs = vfs.DatastoreBackedFileSystem(self.NAMESPACE, '/')
+        with common_utils.Namespace(self.NAMESPACE):
+            for dir_index in xrange(self.NUM_DIRS):
+                db.put([
+                    vfs.FileMetadataEntity(
+                        key_name=self._filename(dir_index, file_index),
+                        size=0)
+                    for file_index in xrange(self.NUM_FILES_PER_DIR)])
+
+    def _filename(self, dir_index, file_index):
+        return '/assets/dir%03d/file%03d.png' % (dir_index, file_index)
+
+    def test_list_directory(self):
+        files = self.fs.list('/assets/dir007/')
+        self.assertEquals(
+            [self._filename(7, index)
+             for index in xrange(self.NUM_FILES_PER_DIR)], files)
+
+    def test_list_is_prefix_match(self):
+        self.fs.put('/assets/dir007.txt', StringIO.StringIO('text'))
+        self.fs.put('/assets/dir007/extra.txt', StringIO.StringIO('text'))
+        files = self.fs.list('/assets/dir007')
+        self.assertEquals(self.NUM_FILES_PER_DIR + 2, len(files))
+        self.assertIn('/assets/dir007.txt', files)
+        self.assertIn('/assets/dir007/extra.txt', files)
+        self.assertNotIn('/assets/dir008/file000.png', files)
+
+        self.fs.delete('/assets/dir007/extra.txt')
+        self.assertNotIn(
+            '/assets/dir007/extra.txt', self.fs.list('/assets/dir007/'))
+
+    def test_list_is_not_truncated(self):
+        files = self.fs.list('/')
+        self.assertEquals(self.NUM_DIRS * self.NUM_FILES_PER_DIR, len(files))
+        self.assertEquals(sorted(files), files)
+
+
+class VfsJinjaEnvironmentPoolTest(actions.TestBase):
+    """Checks reuse of pooled Jinja environments for VFS templates."""
+
+    NAMESPACE = 'ns_templates'
+
+    def setUp(self):
+        super(VfsJinjaEnvironmentPoolTest, self).setUp()
+        jinja_utils.ProcessScopedJinjaEnvironmentPool.clear_all()
+        self.fs = vfs.AbstractFileSystem(
+            vfs.DatastoreBackedFileSystem(self.NAMESPACE, '/'))
+        self.fs.put('/views/page.html', vfs.string_to_stream(u'one'))
+
+    def test_environment_is_reused(self):
+        env = self.fs.get_jinja_environ(['/views'])
+        self.assertIs(env, self.fs.get_jinja_environ(['/views']))
+        self.assertIsNot(
+            env, self.fs.get_jinja_environ(['/views'], autoescape=False))
+        self.assertIsNot(env, self.fs.get_jinja_environ(['/other', '/views']))
+
+        other_fs = vfs.AbstractFileSystem(
+            vfs.DatastoreBackedFileSystem('ns_other', '/'))
+        self.assertIsNot(env, other_fs.get_jinja_environ(['/views']))
+
+    def test_changed_template_is_reloaded(self):
+        env = self.fs.get_jinja_environ(['/views'])
+        template = env.get_template('page.html')
+        self.assertEquals('one', template.render())
+        self.assertIs(template, env.get_template('page.html'))
+
+        self.fs.put('/views/page.html', vfs.string_to_stream(u'two'))
+        env = self.fs.get_jinja_environ(['/views'])
+        self.assertEquals('two', env.get_template('page.html').render())
+
+    def test_shadowing_template_is_loaded(self):
+        env = self.fs.get_jinja_environ(['/custom', '/views'])
+        self.assertEquals('one', env.get_template('page.html').render())
+
+        self.fs.put('/custom/page.html', vfs.string_to_stream(u'custom'))
+        env = self.fs.get_jinja_environ(['/custom', '/views'])
+        self.assertEquals('custom', env.get_template('page.html').render())
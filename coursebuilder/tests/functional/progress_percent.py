@@ -23,7 +23,10 @@ from common import users
 from common.utils import Namespace
 from models import courses
 from models import models
+from models import progress
+from models import transforms
 from modules.analytics import analytics
+from modules.courses import lessons
 from tests.functional import actions
 
 COURSE_NAME = 'percent_completion'
@@ -106,6 +109,18 @@ class ProgressPercent(actions.TestBase):
             'assessment_type': assessment_id,
             'score': score})
 
+    def _post_events(self, events):
+        return self.post(BASE_URL + '/rest/events', {
+            'request': transforms.dumps({'events': events})})
+
+    def _make_lesson_event(self, lesson, xsrf_token):
+        location = 'http://localhost/%s/unit?unit=%s&lesson=%s' % (
+            COURSE_NAME, self.unit.unit_id, lesson.lesson_id)
+        return {
+            'source': 'attempt-lesson',
+            'payload': transforms.dumps({'location': location}),
+            'xsrf_token': xsrf_token}
+
     def test_progress_no_pre_assessment(self):
 
         # Zero progress when no unit actions taken.
@@ -222,3 +237,157 @@ class ProgressPercent(actions.TestBase):
         with Namespace(NAMESPACE):
             self.assertEquals(1.000, self.tracker.get_unit_percent_complete(
                 self.student)[self.unit.unit_id])
+
+    def test_progress_from_events_batch(self):
+        with Namespace(NAMESPACE):
+            self.tracker.get_or_create_progress(self.student)
+            num_events = models.EventEntity.all().count()
+        num_puts = [0]
+        put = models.StudentPropertyEntity.put
+
+        def counting_put(entity):
+            num_puts[0] += 1
+            return put(entity)
+
+        self.swap(models.StudentPropertyEntity, 'put', counting_put)
+        xsrf_token = crypto.XsrfTokenManager.create_xsrf_token('event-post')
+        response = self._post_events([
+            self._make_lesson_event(lesson, xsrf_token) for lesson in [
+                self.lesson_one, self.lesson_two, self.lesson_three]])
+        self.assertEquals(200, response.status_int)
+
+        with Namespace(NAMESPACE):
+            self.assertEquals(
+                num_events + 3, models.EventEntity.all().count())
+            self.assertEquals(1.000, self.tracker.get_unit_percent_complete(
+                self.student)[self.unit.unit_id])
+        self.assertEquals(1, num_puts[0])
+
+    def test_events_batch_requires_xsrf_token_for_each_event(self):
+        with Namespace(NAMESPACE):
+            num_events = models.EventEntity.all().count()
+        xsrf_token = crypto.XsrfTokenManager.create_xsrf_token('event-post')
+        response = self._post_events([
+            self._make_lesson_event(self.lesson_one, xsrf_token),
+            self._make_lesson_event(self.lesson_two, 'bad token')])
+        self.assertIn('"status": 403', response.body)
+
+        with Namespace(NAMESPACE):
+            self.assertEquals(num_events, models.EventEntity.all().count())
+            self.assertEquals(0.0, self.tracker.get_unit_percent_complete(
+                self.student)[self.unit.unit_id])
+
+    def test_bad_events_batch_rejected(self):
+        with Namespace(NAMESPACE):
+            num_events = models.EventEntity.all().count()
+        xsrf_token = crypto.XsrfTokenManager.create_xsrf_token('event-post')
+        event = self._make_lesson_event(self.lesson_one, xsrf_token)
+        for request in [
+            [event],
+            'not an event',
+            {'events': event},
+            {'events': [event, 'not an event']},
+            {'events': [event] * (lessons.MAX_EVENTS_PER_REQUEST + 1)}]:
+            response = self.post(BASE_URL + '/rest/events', {
+                'request': transforms.dumps(request)})
+            self.assertEquals(200, response.status_int)
+            self.assertIn('"status": 400', response.body)
+            self.assertIn('Bad events batch.', response.body)
+
+        with Namespace(NAMESPACE):
+            self.assertEquals(num_events, models.EventEntity.all().count())
+
+    def test_events_ignored_when_recording_disabled(self):
+        self.overridden_environment.__exit__()
+        self.overridden_environment = actions.OverriddenEnvironment(
+            {'course': {analytics.CAN_RECORD_STUDENT_EVENTS: False}})
+        self.overridden_environment.__enter__()
+        with Namespace(NAMESPACE):
+            num_events = models.EventEntity.all().count()
+
+        # Not even a malformed request is looked at.
+        response = self.post(BASE_URL + '/rest/events', {
+            'request': transforms.dumps('not an event')})
+        self.assertEquals(200, response.status_int)
+        self.assertNotIn('Bad events batch.', response.body)
+
+        with Namespace(NAMESPACE):
+            self.assertEquals(num_events, models.EventEntity.all().count())
+
+
+class ProgressRecordingTest(actions.TestBase):
+    """Records progress events against the progress of a 5-unit course."""
+
+    NUM_UNITS = 5
+    NUM_LESSONS_PER_UNIT = 4
+
+    def setUp(self):
+        super(ProgressRecordingTest, self).setUp()
+        context = actions.simple_add_course(
+            COURSE_NAME, ADMIN_EMAIL, COURSE_TITLE)
+        self.course = courses.Course(None, context)
+        for _ in xrange(self.NUM_UNITS):
+            unit = self.course.add_unit()
+            unit.availability = courses.AVAILABILITY_AVAILABLE
+            for _ in xrange(self.NUM_LESSONS_PER_UNIT):
+                lesson = self.course.add_lesson(unit)
+                lesson.objectives = 'body of lesson'
+                lesson.availability = courses.AVAILABILITY_AVAILABLE
+        self.course.save()
+
+        actions.login(STUDENT_EMAIL)
+        actions.register(self, STUDENT_EMAIL, COURSE_NAME)
+        self.course = courses.Course(None, context)
+        self.tracker = self.course.get_progress_tracker()
+        with Namespace(NAMESPACE):
+            self.student = models.Student.get_by_user(users.get_current_user())
+
+        self.num_dumps = 0
+        dumps = transforms.dumps
+
+        def counting_dumps(*args, **kwargs):
+            self.num_dumps += 1
+            return dumps(*args, **kwargs)
+
+        self.swap(progress.transforms, 'dumps', counting_dumps)
+
+    def test_record_events(self):
+        num_events = 0
+        with Namespace(NAMESPACE):
+            for unit in self.course.get_units():
+                for lesson in self.course.get_lessons(unit.unit_id):
+                    self.tracker.put_html_completed(
+                        self.student, unit.unit_id, lesson.lesson_id)
+                    num_events += 1
+
+            # Every event encodes the progress once, however many entities
+            # its update cascade touches.
+            self.assertEquals(num_events, self.num_dumps)
+
+            self.assertEquals(
+                self.tracker.COMPLETED_STATE,
+                self.tracker.get_course_progress(self.student))
+            unit_progress = self.tracker.get_unit_progress(self.student)
+            self.assertEquals(self.NUM_UNITS, len(unit_progress))
+            self.assertEquals(
+                set([self.tracker.COMPLETED_STATE]),
+                set(unit_progress.values()))
+
+    def test_hooks_see_pending_changes(self):
+        statuses = []
+
+        def hook(unused_course, unused_student, lprogress, event_entity,
+                 unused_event_key):
+            if event_entity == 'html':
+                statuses.append(self.tracker.get_html_status(
+                    lprogress, unit.unit_id, lesson.lesson_id))
+
+        self.swap(
+            progress.UnitLessonCompletionTracker, 'POST_UPDATE_PROGRESS_HOOK',
+            [hook])
+        unit = self.course.get_units()[0]
+        lesson = self.course.get_lessons(unit.unit_id)[0]
+        with Namespace(NAMESPACE):
+            self.tracker.put_html_completed(
+                self.student, unit.unit_id, lesson.lesson_id)
+        self.assertEquals([self.tracker.COMPLETED_STATE], statuses)
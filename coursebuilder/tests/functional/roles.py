@@ -232,6 +232,48 @@ class RolesTest(actions.TestBase):
         self.assertIn(
             PERMISSION, mem_map[STUDENT_EMAIL][PERMISSION_MODULE.name])
 
+    def test_checks_read_environ_and_permissions_once_per_request(self):
+        self._create_role()
+        actions.login(STUDENT_EMAIL)
+        course = self._get_course()
+
+        environ_reads = []
+        get_environ = sites.ApplicationContext.get_environ
+
+        def counting_get_environ(app_context):
+            environ_reads.append(app_context.get_namespace_name())
+            return get_environ(app_context)
+
+        self.swap(sites.ApplicationContext, 'get_environ', counting_get_environ)
+
+        self.assertFalse(roles.Roles.is_course_admin(course))
+        self.assertTrue(roles.Roles.in_any_role(course))
+
+        # Later checks in this request use the permissions map already read.
+        MemcacheManager.set(roles.Roles.memcache_key, {})
+        for _ in xrange(3):
+            self.assertFalse(roles.Roles.is_course_admin(course))
+            self.assertTrue(roles.Roles.in_any_role(course))
+            self.assertTrue(roles.Roles.is_user_allowed(
+                course, PERMISSION_MODULE, PERMISSION))
+        self.assertEquals(['ns_' + COURSE_NAME], environ_reads)
+
+        # Other users are answered from the same request-scoped values.
+        actions.login(COURSE_ADMIN_EMAIL)
+        self.assertTrue(roles.Roles.is_course_admin(course))
+        self.assertFalse(roles.Roles.in_any_role(course))
+        self.assertEquals(['ns_' + COURSE_NAME], environ_reads)
+
+    def test_update_permissions_map_refreshes_request_cache(self):
+        actions.login(STUDENT_EMAIL)
+        course = self._get_course()
+        self.assertFalse(roles.Roles.in_any_role(course))
+
+        self._create_role()
+        self.assertFalse(roles.Roles.in_any_role(course))
+        roles.Roles.update_permissions_map()
+        self.assertTrue(roles.Roles.in_any_role(course))
+
     # --------------------------- Whitelisting tests:
     # See tests/functional/whitelist.py, which covers both the actual
     # role behavior as well as more-abstract can-you-see-the-resource
@@ -4651,6 +4651,40 @@ class LessonComponentsTest(DatastoreBackedCourseTest):
             self.unit.unit_id, self.lesson.lesson_id, use_lxml=False)
         self._assert_components(cpt_list)
 
+    def test_component_discovery_is_cached(self):
+        """Test that lesson body is parsed once per version of its content."""
+        parsed = []
+        get_components_from_html = tags.get_components_from_html
+
+        def counting_get_components_from_html(html, use_lxml):
+            parsed.append(html)
+            return get_components_from_html(html, use_lxml)
+
+        self.swap(
+            tags, 'get_components_from_html',
+            counting_get_components_from_html)
+        courses.ProcessScopedComponentsCache.clear_all()
+
+        cpt_list = self.course.get_components(
+            self.unit.unit_id, self.lesson.lesson_id)
+        self._assert_components(cpt_list)
+        cpt_list[0]['instanceid'] = 'changed by caller'
+        cpt_list = self.course.get_components(
+            self.unit.unit_id, self.lesson.lesson_id)
+        self._assert_components(cpt_list)
+        self.assertEquals(1, len(parsed))
+
+        self.lesson.objectives = (
+            '<question quid="7" weight="1" instanceid="QX"></question>')
+        self.course.update_lesson(self.lesson)
+        self.course.save()
+        cpt_list = self.course.get_components(
+            self.unit.unit_id, self.lesson.lesson_id)
+        self.assertEquals(
+            [{'instanceid': 'QX', 'quid': '7', 'weight': '1',
+              'cpt_name': 'question'}], cpt_list)
+        self.assertEquals(2, len(parsed))
+
     def test_component_progress(self):
         """Test that progress tracking for components is done correctly."""
         unit_id = self.unit.unit_id
@@ -5023,6 +5057,46 @@ class EtlMainTestCase(testing.EtlTestBase, DatastoreBackedCourseTest):
             [model.key().name() for model in [first_entity, second_entity]],
             [entity['key.name'] for entity in entitiez])
 
+    def test_download_datastore_in_parallel_matches_sequential(self):
+        """Parallel download builds the same archive as sequential one."""
+        with Namespace(self.namespace):
+            db.put(
+                [models.Student(key_name='student%s' % i) for i in range(40)] +
+                [models.StudentPropertyEntity(key_name='student%s-prop' % i)
+                 for i in range(40)])
+
+        def download(archive_path, extra_args):
+            args = etl.create_args_parser().parse_args(
+                [etl._MODE_DOWNLOAD, etl._TYPE_DATASTORE, self.url_prefix,
+                 'localhost', '--archive_path', archive_path,
+                 '--batch_size', '7',
+                 '--datastore_types', 'Student,StudentPropertyEntity'] +
+                extra_args)
+            etl.main(args, testing=True)
+            archive = zipfile.ZipFile(archive_path)
+            try:
+                return [(name, archive.read(name))
+                        for name in archive.namelist()]
+            finally:
+                archive.close()
+
+        sequential = download(self.archive_path, [])
+        parallel = download(
+            os.path.join(self.test_tempdir, 'parallel.zip'),
+            ['--download_workers', '3', '--download_shards', '4'])
+
+        self.assertEqual(
+            ['manifest.json', 'models/Student.json',
+             'models/StudentPropertyEntity.json'],
+            [name for name, _ in sequential])
+        self.assertEqual(sequential, parallel)
+        self.assertEqual(
+            40, len(transforms.loads(sequential[1][1])['rows']))
+        # Temporary per-type and per-key-range files are cleaned up.
+        self.assertEqual(
+            [], [name for name in os.listdir(self.test_tempdir)
+                 if name.startswith('Student')])
+
     def _test_resume_download(self, what, archive_type):
         with Namespace(self.namespace):
             models.QuestionEntity().put()
@@ -5866,6 +5940,29 @@ class TransformsJsonFileTestCase(actions.TestBase):
         self.assertEqual(
             {'rows': [self.first, self.second]}, self.reader.read())
 
+    def test_concatenate_matches_single_file(self):
+        rows = [self.first, self.second, {'e': [1, 2]}, [], 'f']
+        paths = []
+        for i, part_rows in enumerate([rows[:2], [], rows[2:]]):
+            path = os.path.join(self.test_tempdir, 'part%s.json' % i)
+            part = transforms.JsonFile(path)
+            part.open('w')
+            for row in part_rows:
+                part.write(row)
+            part.close()
+            paths.append(path)
+        self.writer.open('w')
+        for row in rows:
+            self.writer.write(row)
+        self.writer.close()
+
+        concatenated_path = os.path.join(self.test_tempdir, 'all.json')
+        transforms.JsonFile.concatenate(paths, concatenated_path)
+        with open(self.path) as single, open(concatenated_path) as merged:
+            self.assertEqual(single.read(), merged.read())
+        self.reader.open('r')
+        self.assertEqual(rows, [entity for entity in self.reader])
+
 
 class ImportAssessmentTests(DatastoreBackedCourseTest):
     """Functional tests for assessments."""
@@ -16,6 +16,7 @@
 
 __author__ = 'Mike Gainer (mgainer@google.com)'
 
+import copy
 import datetime
 import os
 import unittest
@@ -318,3 +319,53 @@ class ValidateTimedeltaTests(unittest.TestCase):
         errors = []
         utils.ValidateTimedelta.validate('3 months', errors)
         self.assertEquals(1, len(errors))
+
+
+class ReadOnlyTests(unittest.TestCase):
+
+    def setUp(self):
+        super(ReadOnlyTests, self).setUp()
+        self.original = {'a': [1, {'b': 2}], 'c': {'d': 'e'}}
+        self.read_only = utils.make_read_only(self.original)
+
+    def test_reads_like_the_original(self):
+        self.assertEquals(self.original, self.read_only)
+        self.assertIsInstance(self.read_only, dict)
+        self.assertIsInstance(self.read_only['a'], list)
+        self.assertEquals(2, self.read_only['a'][1]['b'])
+
+    def test_can_not_be_modified(self):
+        mutations = [
+            lambda: self.read_only.__setitem__('x', 1),
+            lambda: self.read_only.__delitem__('a'),
+            lambda: self.read_only.update({'x': 1}),
+            lambda: self.read_only.setdefault('x', 1),
+            lambda: self.read_only.pop('a'),
+            lambda: self.read_only.clear(),
+            lambda: self.read_only['c'].__setitem__('d', 'f'),
+            lambda: self.read_only['a'].append(3),
+            lambda: self.read_only['a'].__setitem__(0, 3),
+            lambda: self.read_only['a'].sort(),
+            lambda: self.read_only['a'][1].__setitem__('b', 3),
+        ]
+        for mutation in mutations:
+            with self.assertRaises(TypeError):
+                mutation()
+        self.assertEquals(self.original, self.read_only)
+
+    def test_original_is_not_shared(self):
+        self.original['c']['d'] = 'f'
+        self.assertEquals('e', self.read_only['c']['d'])
+
+    def test_copies_are_mutable(self):
+        deep = copy.deepcopy(self.read_only)
+        self.assertIs(dict, type(deep))
+        self.assertIs(list, type(deep['a']))
+        self.assertIs(dict, type(deep['a'][1]))
+        deep['a'][1]['b'] = 3
+        self.assertEquals(2, self.read_only['a'][1]['b'])
+
+        shallow = copy.copy(self.read_only)
+        self.assertIs(dict, type(shallow))
+        shallow['x'] = 1
+        self.assertNotIn('x', self.read_only)
@@ -0,0 +1,80 @@
+# Copyright 2026 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS-IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Unit tests for models/counters.py."""
+
+import unittest
+
+from models import counters
+
+
+class PerfTimerTests(unittest.TestCase):
+
+    def setUp(self):
+        super(PerfTimerTests, self).setUp()
+        self.timer = counters.PerfTimer(
+            'test-perf-timer', 'A timer for tests.',
+            bucket_bounds_millis=[10, 100, 1000])
+
+    def tearDown(self):
+        del counters.Registry.registered[self.timer.name]
+        super(PerfTimerTests, self).tearDown()
+
+    def test_registered_like_perf_counter(self):
+        self.assertIs(
+            self.timer, counters.Registry.registered['test-perf-timer'])
+        self.assertEquals(0, self.timer.value)
+        self.assertIsNone(self.timer.percentile(99))
+        self.assertEquals('count=0', self.timer.summary)
+
+    def test_record_fills_buckets(self):
+        for millis in [1, 10, 11, 500, 5000]:
+            self.timer.record(millis)
+        self.assertEquals(5, self.timer.value)
+        self.assertEquals(5, self.timer.count)
+        self.assertEquals(5522, self.timer.sum_millis)
+        self.assertEquals(5000, self.timer.max_millis)
+        self.assertEquals(
+            [(10, 2), (100, 1), (1000, 1), (None, 1)], self.timer.buckets)
+
+    def test_percentile(self):
+        for _ in xrange(90):
+            self.timer.record(5)
+        for _ in xrange(9):
+            self.timer.record(50)
+        self.timer.record(3000)
+        self.assertEquals(10, self.timer.percentile(0))
+        self.assertEquals(10, self.timer.percentile(50))
+        self.assertEquals(10, self.timer.percentile(90))
+        self.assertEquals(100, self.timer.percentile(99))
+        self.assertEquals(3000, self.timer.percentile(100))
+
+    def test_percentile_is_capped_by_max(self):
+        self.timer.record(3)
+        self.assertEquals(3, self.timer.percentile(99))
+
+    def test_timed_records_even_on_exception(self):
+        with self.timer.timed():
+            pass
+        with self.assertRaises(ValueError):
+            with self.timer.timed():
+                raise ValueError()
+        self.assertEquals(2, self.timer.count)
+
+    def test_clear(self):
+        self.timer.record(50)
+        counters.Registry._clear_all()  # pylint: disable=protected-access
+        self.assertEquals(0, self.timer.count)
+        self.assertEquals(0, self.timer.sum_millis)
+        self.assertEquals(0, self.timer.value)
@@ -21,8 +21,10 @@ import unittest
 
 import yaml
 
+from models.courses import CourseModel13
 from models.courses import LEGACY_HUMAN_GRADER_WORKFLOW
 from models.courses import Workflow
+from tools import verify
 
 DATE_FORMAT_ERROR = (
     'dates should be formatted as YYYY-MM-DD hh:mm (e.g. 1997-07-16 19:20) and '
@@ -234,3 +236,80 @@ class WorkflowValidationTests(unittest.TestCase):
         workflow = Workflow(self.to_yaml(workflow_dict))
         workflow.validate(self.errors)
         self.assertFalse(self.errors)
+
+
+class CourseModel13LookupTests(unittest.TestCase):
+    """Checks unit and lesson lookups against a linear search."""
+
+    NUM_UNITS = 10
+    NUM_LESSONS_PER_UNIT = 5
+
+    def setUp(self):
+        self.model = CourseModel13(None)
+        for unit_index in xrange(self.NUM_UNITS):
+            unit = self.model.add_unit(verify.UNIT_TYPE_UNIT, 'Unit')
+            for unused in xrange(self.NUM_LESSONS_PER_UNIT):
+                self.model.add_lesson(unit, 'Lesson')
+            if unit_index % 5 == 0:
+                pre = self.model.add_unit(verify.UNIT_TYPE_ASSESSMENT, 'Pre')
+                unit.pre_assessment = pre.unit_id
+                self.model.update_unit(unit)
+
+    def _linear_find_unit_by_id(self, unit_id):
+        for unit in self.model.get_units():
+            if str(unit.unit_id) == str(unit_id):
+                return unit
+        return None
+
+    def _linear_find_lesson_by_id(self, lesson_id):
+        for lesson in self.model.lessons:
+            if str(lesson.lesson_id) == str(lesson_id):
+                return lesson
+        return None
+
+    def _linear_get_parent_unit(self, unit_id):
+        for unit in self.model.get_units():
+            if (str(unit.pre_assessment) == str(unit_id) or
+                str(unit.post_assessment) == str(unit_id)):
+                return unit
+        return None
+
+    def _assert_lookups_match_linear_search(self):
+        max_id = self.model.next_id + 1
+        for any_id in range(max_id) + [str(i) for i in range(max_id)]:
+            self.assertIs(
+                self._linear_find_unit_by_id(any_id),
+                self.model.find_unit_by_id(any_id))
+            self.assertIs(
+                self._linear_find_lesson_by_id(any_id),
+                self.model.find_lesson_by_id(None, any_id))
+            self.assertIs(
+                self._linear_get_parent_unit(any_id),
+                self.model.get_parent_unit(any_id))
+
+    def test_lookups_match_linear_search(self):
+        self._assert_lookups_match_linear_search()
+
+    def test_lookups_follow_mutations(self):
+        units = self.model.get_units()
+        lesson = self.model.get_lessons(units[0].unit_id)[0]
+        self.model.move_lesson_to(lesson, units[-2])
+        self.model.delete_lesson(self.model.get_lessons(units[1].unit_id)[0])
+        self.model.delete_unit(units[2])
+        self.model.delete_unit(units[1])  # An assessment used as pre-test.
+        self._assert_lookups_match_linear_search()
+        self.assertIsNone(self.model.find_unit_by_id(units[1].unit_id))
+
+        unit = self.model.get_units()[-1]
+        unit.post_assessment = units[-2].unit_id
+        self.model.update_unit(unit)
+        self._assert_lookups_match_linear_search()
+        self.assertIs(unit, self.model.get_parent_unit(units[-2].unit_id))
+
+        self.model.reorder_units([
+            {'id': unit.unit_id,
+             'lessons': [
+                 {'id': lesson.lesson_id}
+                 for lesson in self.model.get_lessons(unit.unit_id)]}
+            for unit in reversed(self.model.get_units())])
+        self._assert_lookups_match_linear_search()
@@ -18,6 +18,7 @@
 __author__ = 'John Orr (jorr@google.com)'
 
 import datetime
+import json
 import unittest
 
 from common import schema_fields
@@ -494,3 +495,114 @@ class SchemaValidationTests(unittest.TestCase):
             source, json_schema), [])
 
         self.assertEqual(transforms.json_to_dict(source, json_schema), source)
+
+
+def _reference_dumps(*args, **kwargs):
+    """The original, unoptimized implementation of transforms.dumps()."""
+
+    def string_escape(in_str):
+        out = []
+        for c in in_str.decode('utf8'):
+            char_val = ord(c)
+            if char_val > 0x7f or c == '<' or c == '>':
+                out.append(u'\\u%04X' % char_val)
+            else:
+                out.append(c)
+        return u''.join(out)
+
+    class ReferenceJSONEncoder(json.JSONEncoder):
+
+        def default(self, obj):
+            if isinstance(obj, set):
+                return list(obj)
+            return super(ReferenceJSONEncoder, self).default(obj)
+
+    if 'cls' not in kwargs:
+        kwargs['cls'] = ReferenceJSONEncoder
+    return string_escape(json.dumps(*args, **kwargs))
+
+
+def _make_progress_blob(num_units=50, num_lessons_per_unit=20):
+    progress = {}
+    for unit_id in xrange(num_units):
+        progress['u.%s' % unit_id] = 1
+        for lesson_id in xrange(num_lessons_per_unit):
+            lesson_key = 'u.%s.l.%s' % (unit_id, lesson_id)
+            progress[lesson_key] = 2
+            progress['%s.h.0' % lesson_key] = 2
+            progress['%s.c.%s' % (lesson_key, lesson_id)] = 2
+    return progress
+
+
+def _make_course_json(num_units=30, num_lessons_per_unit=10):
+    units = []
+    lessons = []
+    for unit_id in xrange(num_units):
+        units.append({
+            'unit_id': unit_id, 'type': 'U', 'title': u'Unit %s \u2014 <b>' % (
+                unit_id), 'release_date': '', 'now_available': True,
+            'labels': '', 'pre_assessment': None, 'post_assessment': None,
+            'show_contents_on_one_page': False, 'manual_progress': False,
+            'description': 'A unit & its description'})
+        for lesson_id in xrange(num_lessons_per_unit):
+            lessons.append({
+                'lesson_id': lesson_id, 'unit_id': unit_id,
+                'title': u'Le\xe7on %s' % lesson_id,
+                'objectives': (
+                    '<p>Watch the video</p><gcb-youtube videoid="Kdg2drcUjYI"'
+                    ' instanceid="%s"></gcb-youtube>' % lesson_id),
+                'video': '', 'notes': '', 'duration': '',
+                'activity_listed': True, 'scored': False,
+                'has_activity': False, 'now_available': True})
+    return {
+        'version': '1.3', 'next_id': num_units * (num_lessons_per_unit + 1),
+        'units': units, 'lessons': lessons}
+
+
+def _make_question_dto():
+    return {
+        'version': '1.5', 'type': 0, 'question': (
+            '<p>Which of the following is <b>not</b> a prime number?</p>'),
+        'description': u'Primes \u2264 10', 'multiple_selections': False,
+        'choices': [{
+            'score': 1.0 if i == 3 else 0.0, 'text': '<i>%s</i>' % (i + 1),
+            'feedback': u'Try again \u263a'} for i in xrange(4)]}
+
+
+class JsonDumpsTests(unittest.TestCase):
+    """Compares transforms.dumps() to the original implementation."""
+
+    PAYLOADS = [
+        _make_progress_blob(), _make_course_json(), _make_question_dto(),
+        set([1, 2]), u'<script>\xe9\U0001F600</script>', 'caf\xc3\xa9', None]
+
+    def test_output_is_identical_to_reference(self):
+        for payload in self.PAYLOADS:
+            for kwargs in [{}, {'sort_keys': True}, {'indent': 4}]:
+                expected = _reference_dumps(payload, **kwargs)
+                actual = transforms.dumps(payload, **kwargs)
+                self.assertEqual(expected, actual)
+                self.assertEqual(type(expected), type(actual))
+
+    def test_output_is_identical_to_reference_without_ensure_ascii(self):
+        payload = {'k': 'caf\xc3\xa9 <b>'}
+        self.assertEqual(
+            _reference_dumps(payload, ensure_ascii=False),
+            transforms.dumps(payload, ensure_ascii=False))
+
+    def test_custom_encoders_are_honored(self):
+        def date_encoder(obj):
+            if isinstance(obj, datetime.date):
+                return obj.isoformat()
+            return None
+
+        payload = {'when': datetime.date(2015, 1, 31)}
+        with self.assertRaises(TypeError):
+            transforms.dumps(payload)
+        transforms.CUSTOM_JSON_ENCODERS.append(date_encoder)
+        try:
+            self.assertEqual(
+                u'{"when": "2015-01-31"}', transforms.dumps(payload))
+        finally:
+            transforms.CUSTOM_JSON_ENCODERS.remove(date_encoder)
+
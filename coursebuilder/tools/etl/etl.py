@@ -160,6 +160,7 @@ __author__ = [
 import argparse
 import functools
 import logging
+import multiprocessing.pool
 import os
 import random
 import re
@@ -178,12 +179,14 @@ common_utils = None
 config = None
 courses = None
 crypto = None
+datastore = None
 datastore_types = None
 db = None
 entity_transforms = None
 etl_lib = None
 memcache = None
 metadata = None
+namespace_manager = None
 remote = None
 sites = None
 transforms = None
@@ -251,6 +254,10 @@ _MODES = [_MODE_DELETE, _MODE_DOWNLOAD, _MODE_RUN, _MODE_UPLOAD]
 _FORCE_OVERWRITE_MODES = [_MODE_DOWNLOAD, _MODE_UPLOAD]
 # Int. The number of times to retry remote_api calls.
 _RETRIES = 3
+
+# Number of __scatter__ keys sampled per requested shard when splitting a kind
+# into key ranges for download.
+_SCATTER_OVERSAMPLING = 32
 # String. Identifier for type corresponding to course definition data.
 _TYPE_COURSE = 'course'
 # String. Identifier for type corresponding to datastore entities.
@@ -311,6 +318,19 @@ def create_args_parser():
             'to process; all models are processed by default' %
             _TYPE_DATASTORE),
         type=lambda s: s.split(','))
+    parser.add_argument(
+        '--download_shards', default=1,
+        help=(
+            'If mode is %s, number of key ranges each entity type is split '
+            'into so that large types are fetched through several cursors in '
+            'parallel. The archive contents do not depend on this value') %
+        _MODE_DOWNLOAD, type=int)
+    parser.add_argument(
+        '--download_workers', default=1,
+        help=(
+            'If mode is %s, number of threads fetching entity types (or key '
+            'ranges of entity types, see --download_shards) at the same '
+            'time') % _MODE_DOWNLOAD, type=int)
     parser.add_argument(
         '--exclude_types', default=[],
         help=(
@@ -877,7 +897,9 @@ def _download_course(context, course, params, archive, already_done_names,
         courses.ADDITIONAL_ENTITIES_FOR_COURSE_IMPORT)
     type_names = set([entity.__name__ for entity in all_entities])
     _download_types(archive, manifest, type_names, already_done_names,
-                    params.batch_size, _IDENTITY_TRANSFORM)
+                    params.batch_size, _IDENTITY_TRANSFORM,
+                    workers=vars(params).get('download_workers', 1),
+                    shards=vars(params).get('download_shards', 1))
 
 def _download_datastore(context, course, params, archive, already_done_types,
                         manifest):
@@ -900,20 +922,146 @@ def _download_datastore(context, course, params, archive, already_done_types,
         params.privacy, privacy_secret)
     found_types = (requested_types & available_types)
     _download_types(archive, manifest, found_types, already_done_types,
-                    params.batch_size, privacy_transform_fn)
+                    params.batch_size, privacy_transform_fn,
+                    workers=vars(params).get('download_workers', 1),
+                    shards=vars(params).get('download_shards', 1))
 
 
 def _download_types(archive, manifest, type_names, already_done_names,
-                    batch_size, transform):
+                    batch_size, transform, workers=1, shards=1):
     for type_name in type_names & already_done_names:
         _LOG.info('Skipping already-downloaded type %s', type_name)
     type_names -= already_done_names
     _verify_downloadability(type_names)
     _finalize_manifest(type_names, manifest, archive)
+    if workers > 1 or shards > 1:
+        _download_types_in_parallel(
+            archive, sorted(type_names), batch_size, transform, workers,
+            shards)
+        return
     for type_name in sorted(type_names):
         _download_type(archive, manifest, type_name, batch_size, transform)
 
 
+def _download_types_in_parallel(
+    archive, type_names, batch_size, privacy_transform_fn, workers, shards):
+    """Downloads several types at once and adds them to the archive.
+
+    Each type is split into up to shards key ranges, and each key range is
+    fetched by one of workers threads into its own temporary file. Types are
+    added to the archive in the order given, as soon as all their key ranges
+    are done, so the archive is the same as the one _download_type() builds
+    one type at a time, and a partial download can still be resumed.
+
+    Args:
+        archive: _AbstractArchive. The archive to add the types to.
+        type_names: list of string. Entity kinds to download, in order.
+        batch_size: int. Number of entities to fetch per datastore query.
+        privacy_transform_fn: function. Transform applied to entities.
+        workers: int. Number of threads fetching key ranges.
+        shards: int. Maximum number of key ranges per type.
+    """
+    namespace = namespace_manager.get_namespace()
+    pool = multiprocessing.pool.ThreadPool(workers)
+    pending = []
+    try:
+        for type_name in type_names:
+            model_class = db.class_for_kind(type_name)
+            json_path = _get_download_json_path(archive, type_name)
+            key_ranges = _get_key_ranges(model_class, shards)
+            if len(key_ranges) == 1:
+                part_paths = [json_path]
+            else:
+                part_paths = [
+                    '%s.%s' % (json_path, i) for i in xrange(len(key_ranges))]
+            _LOG.info(
+                'Adding entities of type %s in %s key ranges to temporary '
+                'file %s', type_name, len(key_ranges), json_path)
+            results = [
+                pool.apply_async(
+                    _download_key_range,
+                    (model_class, namespace, key_range, part_path,
+                     batch_size, privacy_transform_fn))
+                for key_range, part_path in zip(key_ranges, part_paths)]
+            pending.append((json_path, part_paths, results))
+
+        for json_path, part_paths, results in pending:
+            for result in results:
+                result.get()
+            if part_paths != [json_path]:
+                transforms.JsonFile.concatenate(part_paths, json_path)
+                for part_path in part_paths:
+                    os.remove(part_path)
+            _add_json_file_to_archive(archive, json_path)
+    finally:
+        pool.terminate()
+        pool.join()
+        for json_path, part_paths, _ in pending:
+            for path in set([json_path] + part_paths):
+                if os.path.exists(path):
+                    os.remove(path)
+
+
+def _get_key_ranges(model_class, shards):
+    """Splits the keys of a kind into contiguous ranges.
+
+    Split points are taken from the __scatter__ property, which the datastore
+    sets on a random sample of entities; kinds with too few scattered entities
+    get fewer ranges than requested.
+
+    Args:
+        model_class: db.Model subclass. The kind to split.
+        shards: int. Maximum number of ranges to return.
+
+    Returns:
+        List of (start_key, end_key) pairs, in key order. The first start_key
+        and last end_key are None, meaning unbounded; end keys are exclusive.
+    """
+    if shards <= 1:
+        return [(None, None)]
+    query = datastore.Query(model_class.kind(), keys_only=True)
+    query.Order('__scatter__')
+    scatter_keys = sorted(query.Get(shards * _SCATTER_OVERSAMPLING))
+    stride = max(1, len(scatter_keys) / shards)
+    split_keys = []
+    for key in scatter_keys[stride - 1::stride][:shards - 1]:
+        if not split_keys or split_keys[-1] != key:
+            split_keys.append(key)
+    bounds = [None] + split_keys + [None]
+    return zip(bounds[:-1], bounds[1:])
+
+
+def _download_key_range(
+    model_class, namespace, key_range, json_path, batch_size,
+    privacy_transform_fn):
+    """Writes the entities of a kind within a key range to a json file."""
+    json_file = transforms.JsonFile(json_path)
+    json_file.open('w')
+    model_map_fn = functools.partial(
+        _write_model_to_json_file, json_file, privacy_transform_fn)
+    try:
+        _process_models(
+            model_class, batch_size, model_map_fn=model_map_fn,
+            namespace=namespace, key_range=key_range)
+    finally:
+        json_file.close()
+
+
+def _get_download_json_path(archive, type_name):
+    return os.path.join(os.path.dirname(archive.path), '%s.json' % type_name)
+
+
+def _add_json_file_to_archive(archive, json_path):
+    internal_path = _AbstractArchive.get_internal_path(
+        os.path.basename(json_path), prefix=_ARCHIVE_PATH_PREFIX_MODELS)
+
+    _LOG.info('Adding %s to archive', internal_path)
+    archive.add_local_file(json_path, internal_path)
+
+    _LOG.info('Removing temporary file ' + json_path)
+    os.remove(json_path)
+
+
 def _verify_downloadability(type_names):
     problems = []
     for type_name in type_names:
@@ -952,8 +1100,7 @@ def _download_type(
     archive, manifest, model_class, batch_size, privacy_transform_fn):
     """Downloads a set of files and adds them to the archive."""
 
-    json_path = os.path.join(
-        os.path.dirname(archive.path), '%s.json' % model_class)
+    json_path = _get_download_json_path(archive, model_class)
 
     _LOG.info(
         'Adding entities of type %s to temporary file %s',
@@ -966,14 +1113,7 @@ def _download_type(
         db.class_for_kind(model_class), batch_size,
         model_map_fn=model_map_fn)
     json_file.close()
-    internal_path = _AbstractArchive.get_internal_path(
-        os.path.basename(json_file.name), prefix=_ARCHIVE_PATH_PREFIX_MODELS)
-
-    _LOG.info('Adding %s to archive', internal_path)
-    archive.add_local_file(json_file.name, internal_path)
-
-    _LOG.info('Removing temporary file ' + json_file.name)
-    os.remove(json_file.name)
+    _add_json_file_to_archive(archive, json_file.name)
 
 
 def _filter_filesystem_files(files):
@@ -1075,11 +1215,13 @@ def _import_modules_into_global_scope():
     # pylint: disable=redefined-outer-name,unused-variable
     global appengine_config
     global memcache
+    global datastore
     global datastore_types
     global db
     global entities
     global entity_transforms
     global metadata
+    global namespace_manager
     global common_utils
     global config
     global courses
@@ -1093,7 +1235,9 @@ def _import_modules_into_global_scope():
     try:
         import appengine_config
         from google.appengine.api import memcache
+        from google.appengine.api import datastore
         from google.appengine.api import datastore_types
+        from google.appengine.api import namespace_manager
         from google.appengine.ext import db
         from google.appengine.ext.db import metadata
         from common import crypto
@@ -1187,15 +1331,28 @@ def _list_all(context, include_inherited=False):
         appengine_config.BUNDLE_ROOT, include_inherited=include_inherited)
 
 
-def _process_models(model_class, batch_size, delete=False, model_map_fn=None):
-    """Fetch all rows in batches."""
+def _process_models(model_class, batch_size, delete=False, model_map_fn=None,
+                    namespace=None, key_range=None):
+    """Fetch all rows in batches.
+
+    Args:
+        model_class: db.Model subclass. The kind to process.
+        batch_size: int. Number of entities to fetch per query.
+        delete: boolean. Whether to delete rather than map entities.
+        model_map_fn: function. Called with each entity unless deleting.
+        namespace: string or None. Namespace to query; None for the current.
+        key_range: (start_key, end_key) or None. If given, only entities with
+            start_key <= key < end_key are processed; either may be None for an
+            unbounded end.
+    """
     assert (delete or model_map_fn) or (not delete and model_map_fn)
     reportable_chunk = batch_size * 10
     total_count = 0
     cursor = None
     while True:
         batch_count, cursor = _process_models_batch(
-            model_class, cursor, batch_size, delete, model_map_fn)
+            model_class, cursor, batch_size, delete, model_map_fn,
+            namespace=namespace, key_range=key_range)
         if not batch_count:
             break
         if not cursor:
@@ -1207,9 +1364,16 @@ def _process_models(model_class, batch_size, delete=False, model_map_fn=None):
 
 @_retry(message='Processing datastore entity batch failed; retrying')
 def _process_models_batch(
-    model_class, cursor, batch_size, delete, model_map_fn):
+    model_class, cursor, batch_size, delete, model_map_fn, namespace=None,
+    key_range=None):
     """Processes or deletes models in batches."""
-    query = model_class.all(keys_only=delete)
+    query = model_class.all(keys_only=delete, namespace=namespace)
+    if key_range:
+        start_key, end_key = key_range
+        if start_key:
+            query.filter('__key__ >=', start_key)
+        if end_key:
+            query.filter('__key__ <', end_key)
     if cursor:
         query.with_cursor(start_cursor=cursor)
 
@@ -1624,6 +1788,10 @@ def _validate_arguments(parsed_args):
         _die('--archive_path missing')
     if parsed_args.batch_size < 1:
         _die('--batch_size must be a positive value')
+    if parsed_args.download_shards < 1:
+        _die('--download_shards must be a positive value')
+    if parsed_args.download_workers < 1:
+        _die('--download_workers must be a positive value')
     if (parsed_args.mode == _MODE_DOWNLOAD and
         os.path.exists(parsed_args.archive_path) and
         not parsed_args.force_overwrite and